@@ -1,5 +1,6 @@
 from types import MappingProxyType
 from config.presets import PRESET_CONFIGS, DEFAULT_PRESET, REQUIRED_KEYS, PARTICLE_MAPPING, KEY_LABELS
+from config.Parameters import Parameters
 import logging
 
 # Config.py
@@ -16,16 +17,36 @@ class Config:
             cls._instance = super().__new__(cls)
             cls._instance._config = DEFAULT_PRESET.copy()
             cls._instance._finalized = False
+            cls._instance._parameters = None
         return cls._instance
 
     def get(self):
         """
-        Get a copy of the current configuration.
+        Get a read-only view of the current configuration.
+
+        The view is not a copy: after `finalize()` every caller shares the same immutable mapping. Use
+        `dict(view)` or `view.copy()` to get a mutable copy.
+
+        Returns:
+            MappingProxyType: A read-only view of the configuration.
+        """
+        if isinstance(self._config, MappingProxyType):
+            return self._config
+        return MappingProxyType(self._config)
+
+    def get_parameters(self):
+        """
+        Get the compiled numeric parameters of the configuration.
+
+        The parameters are compiled once at `finalize()`. Before that they are compiled on first use and
+        recompiled after every update.
 
         Returns:
-            dict: A copy of the configuration.
+            Parameters: The read-only compiled parameters.
         """
-        return dict(self._config)
+        if self._parameters is None:
+            self._parameters = Parameters(self._config)
+        return self._parameters
 
     def update(self, preset_name=None, custom_config=None):
         """
@@ -51,6 +72,7 @@ class Config:
             self._config.update(custom_config)
         else:
             raise ValueError("Either preset_name or custom_config must be provided.")
+        self._parameters = None  # Recompiled on next use
 
     def finalize(self):
         """
@@ -59,6 +81,21 @@ class Config:
         if self._finalized:
             raise RuntimeError("Configuration is already finalized.")
         self._config = MappingProxyType(self._config)  # Make immutable
+        self._parameters = Parameters(self._config)  # Compile the numeric parameters once
+        self._finalized = True
+
+    def adopt(self, config):
+        """
+        Replace the whole configuration and finalize it, e.g. in a worker process started by another run.
+
+        Unlike `update`, this also works on a finalized configuration, so a worker gets the exact
+        configuration of its parent whether it was forked from it or started fresh.
+
+        Args:
+            config (Mapping): The configuration to use, usually the parent's `get()`.
+        """
+        self._config = MappingProxyType(dict(config))
+        self._parameters = Parameters(self._config)
         self._finalized = True
 
     def validate(self):
@@ -0,0 +1,78 @@
+import numpy as np
+from config.Parameters import Parameters
+
+
+class TypeTable:
+    """
+    Per-cell-type table of a batch of worlds: `table[cell_type]` looks up each cell's type in the row of the
+    world the cell belongs to.
+    """
+
+    def __init__(self, rows, member):
+        """
+        Initialize the TypeTable.
+
+        Args:
+            rows (np.ndarray): One row of 9 values per world, shape (B, 9).
+            member (np.ndarray): Index of the world of each cell, broadcastable against the looked-up types.
+        """
+        self.rows = rows
+        self.member = member
+
+    def __getitem__(self, cell_type):
+        return self.rows[self.member, cell_type]
+
+
+class ParameterBatch:
+    """
+    Compiled parameters of a batch of worlds, stacked along a leading member axis.
+
+    Exposes the same numeric attributes as Parameters, but values that differ between the worlds are resolved
+    per cell through `member`, the index of the world each cell belongs to: such scalars are arrays that
+    broadcast against the cell arrays and such per-type tables are TypeTables. By default `member` has shape
+    (B, 1, 1, 1), which fits whole-grid arrays of shape (B, x, y, z) and their (6, B, x, y, z) neighbor arrays;
+    `select` gives a view for flat cells. Values shared by all the worlds (e.g. in an ensemble that only
+    varies the seed) are kept as in Parameters, so they cost nothing extra.
+    """
+
+    def __init__(self, members, member=None, _stacked=None):
+        """
+        Initialize the ParameterBatch.
+
+        Args:
+            members (list): The Parameters of each world.
+            member (np.ndarray, optional): Index of the world of each cell. Defaults to shape (B, 1, 1, 1).
+        """
+        self.members = tuple(members)
+        if _stacked is None:
+            _stacked = (
+                {name: np.array([getattr(parameters, name) for parameters in self.members])
+                 for name in Parameters.SCALARS},
+                {name: np.stack([getattr(parameters, name) for parameters in self.members])
+                 for name in Parameters.TYPE_TABLES},
+            )
+        self._stacked = _stacked
+        self.member = member if member is not None else np.arange(len(self.members)).reshape(-1, 1, 1, 1)
+
+        scalars, tables = _stacked
+        for name, values in scalars.items():
+            shared = (values == values[0]).all()
+            setattr(self, name, float(values[0]) if shared else values[self.member])
+        for name, rows in tables.items():
+            shared = (rows == rows[0]).all()
+            setattr(self, name, rows[0] if shared else TypeTable(rows, self.member))
+
+    def __len__(self):
+        return len(self.members)
+
+    def select(self, member):
+        """
+        Get the parameters of a set of cells.
+
+        Args:
+            member (np.ndarray): Index of the world of each cell.
+
+        Returns:
+            ParameterBatch: A view of the same parameters resolved for those cells.
+        """
+        return ParameterBatch(self.members, member, self._stacked)
@@ -0,0 +1,117 @@
+from collections import namedtuple
+import numpy as np
+
+
+class Parameters:
+    """
+    Compiled, read-only numeric view of a configuration.
+
+    Per-cell-type values are stored as NumPy arrays indexed by cell type (0-8), so both the per-cell code and
+    the vectorized engines can look them up without going through nested dicts and lists. Scalar properties
+    are plain typed attributes; `per_cell` holds the same tables as tuples, which index faster from scalar code.
+    Instances are produced by `Config.finalize()` and cannot be modified.
+    """
+
+    # Attribute name -> configuration key holding one value per cell type
+    TYPE_TABLES = {
+        "baseline_temperature": "baseline_temperature",
+        "baseline_pollution_level": "baseline_pollution_level",
+        "pollution_transfer_weights": "cell_type_pollution_transfer_weights",
+        "temperature_transfer_weights": "cell_type_temperature_transfer_weights",
+        "water_transfer_weights": "cell_type_water_transfer_weights",
+        "collision_weights": "cell_type_collision_weights",
+    }
+
+    # Scalar configuration keys and their defaults (None if required)
+    SCALARS = {
+        "forest_pollution_absorption_rate": None,
+        "forest_cooling_effect": None,
+        "forest_pollution_extinction_point": None,
+        "forest_temperature_extinction_point": None,
+        "city_pollution_generation_rate": None,
+        "city_warming_effect": None,
+        "city_temperature_extinction_point": None,
+        "city_pollution_extinction_point": None,
+        "freezing_point": None,
+        "melting_point": None,
+        "evaporation_point": None,
+        "water_transfer_threshold": None,
+        "water_transfer_rate": None,
+        "ocean_conversion_threshold": None,
+        "pollution_damage_threshold": None,
+        "pollution_level_tipping_point": None,
+        "natural_pollution_decay_rate": None,
+        "natural_temperature_decay_rate": None,
+        "cloud_saturation_threshold": None,
+        "melting_rate": None,
+        "evaporation_rate": None,
+        "pollution_diffusion_rate": 0.1,
+        "temperature_diffusion_rate": 0.1,
+    }
+
+    NUM_CELL_TYPES = 9
+
+    # Same per-cell-type tables as tuples of Python floats, for the per-cell (Particle) code
+    PerCell = namedtuple("PerCell", list(TYPE_TABLES))
+    PerCell.__qualname__ = "Parameters.PerCell"  # Found by pickle, so Parameters can be sent to worker processes
+
+    def __init__(self, config):
+        """
+        Compile the parameters from a configuration.
+
+        Args:
+            config (Mapping): The simulation configuration.
+
+        Raises:
+            KeyError: If a required key or a cell type entry is missing.
+        """
+        for name, key in self.TYPE_TABLES.items():
+            self._set(name, self._type_table(config, key))
+        self._set("per_cell", self.PerCell(*(tuple(getattr(self, name).tolist()) for name in self.TYPE_TABLES)))
+
+        colors = config["base_colors"]
+        self._set("base_colors", self._freeze(np.array(
+            [colors.get(cell_type, (1.0, 1.0, 1.0, 0.0)) for cell_type in range(self.NUM_CELL_TYPES)],
+            dtype=np.float64)))
+
+        for key, default in self.SCALARS.items():
+            value = config[key] if default is None else config.get(key, default)
+            self._set(key, float(value))
+
+        self._set("grid_size", tuple(int(size) for size in config["grid_size"]))
+        self._set("days", int(config["days"]))
+
+    def select(self, member):
+        """
+        Get the parameters of a set of cells. All the cells of a single world share the same parameters; a
+        ParameterBatch resolves them per world.
+
+        Args:
+            member (np.ndarray): Index of the world of each cell (always 0 here).
+
+        Returns:
+            Parameters: These parameters.
+        """
+        return self
+
+    @classmethod
+    def _type_table(cls, config, key):
+        """
+        Build a read-only per-cell-type array from a configuration entry (dict or list indexed by cell type).
+        """
+        values = config[key]
+        return cls._freeze(np.array([values[cell_type] for cell_type in range(cls.NUM_CELL_TYPES)], dtype=np.float64))
+
+    @staticmethod
+    def _freeze(array):
+        array.setflags(write=False)
+        return array
+
+    def _set(self, name, value):
+        object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Parameters are read-only.")
+
+    def __delattr__(self, name):
+        raise AttributeError("Parameters are read-only.")
@@ -17,6 +17,9 @@ KEY_LABELS = {
     # General Simulation Parameters
     "days": "Simulation Duration (Days)",
     "grid_size": "Grid Dimensions (X, Y, Z)",
+    "engine": "Simulation Engine",
+    "threads": "Engine Threads",
+    "processes": "Engine Processes",
     "initial_ratios": "Initial Ratios (Proportions)",
 
     # Baseline Environmental Properties
@@ -85,6 +88,13 @@ PRESET_CONFIGS = {
         "days": 365,  # Total number of simulation days.
         # Dimensions of the simulation grid (X, Y, Z).
         "grid_size": (10, 10, 10),
+        # Engine computing the daily updates: "auto", "reference", "numpy", "threads", "processes" or "numba"
+        # (see core/Engine.py).
+        "engine": "auto",
+        # Threads of the "threads" engine (0: one per CPU core).
+        "threads": 0,
+        # Worker processes of the "processes" engine (0: one per CPU core).
+        "processes": 0,
         "initial_ratios": {
             "forest": 0.3,  # 30% of the grid is forest.
             "city": 0.3,  # 30% of the grid is urban areas.
@@ -249,6 +259,13 @@ PRESET_CONFIGS = {
         "days": 365,  # Total number of simulation days.
         # Dimensions of the simulation grid (X, Y, Z).
         "grid_size": (10, 10, 10),
+        # Engine computing the daily updates: "auto", "reference", "numpy", "threads", "processes" or "numba"
+        # (see core/Engine.py).
+        "engine": "auto",
+        # Threads of the "threads" engine (0: one per CPU core).
+        "threads": 0,
+        # Worker processes of the "processes" engine (0: one per CPU core).
+        "processes": 0,
         "initial_ratios": {
             "forest": 0.3,  # 30% of the grid is forest.
             "city": 0.3,  # 30% of the grid is urban areas.
@@ -413,6 +430,13 @@ PRESET_CONFIGS = {
         "days": 365,  # Total number of simulation days.
         # Dimensions of the simulation grid (X, Y, Z).
         "grid_size": (10, 10, 10),
+        # Engine computing the daily updates: "auto", "reference", "numpy", "threads", "processes" or "numba"
+        # (see core/Engine.py).
+        "engine": "auto",
+        # Threads of the "threads" engine (0: one per CPU core).
+        "threads": 0,
+        # Worker processes of the "processes" engine (0: one per CPU core).
+        "processes": 0,
         "initial_ratios": {
             "forest": 0.3,  # 30% of the grid is forest.
             "city": 0.3,  # 30% of the grid is urban areas.
@@ -577,6 +601,13 @@ PRESET_CONFIGS = {
         "days": 365,  # Total number of simulation days.
         # Dimensions of the simulation grid (X, Y, Z).
         "grid_size": (10, 10, 10),
+        # Engine computing the daily updates: "auto", "reference", "numpy", "threads", "processes" or "numba"
+        # (see core/Engine.py).
+        "engine": "auto",
+        # Threads of the "threads" engine (0: one per CPU core).
+        "threads": 0,
+        # Worker processes of the "processes" engine (0: one per CPU core).
+        "processes": 0,
         "initial_ratios": {
             "forest": 0.3,  # 30% of the grid is forest.
             "city": 0.3,  # 30% of the grid is urban areas.
@@ -741,6 +772,13 @@ PRESET_CONFIGS = {
         "days": 365,  # Total number of simulation days.
         # Dimensions of the simulation grid (X, Y, Z).
         "grid_size": (10, 10, 10),
+        # Engine computing the daily updates: "auto", "reference", "numpy", "threads", "processes" or "numba"
+        # (see core/Engine.py).
+        "engine": "auto",
+        # Threads of the "threads" engine (0: one per CPU core).
+        "threads": 0,
+        # Worker processes of the "processes" engine (0: one per CPU core).
+        "processes": 0,
         "initial_ratios": {
             "forest": 0.3,  # 30% of the grid is forest.
             "city": 0.3,  # 30% of the grid is urban areas.
@@ -906,6 +944,9 @@ DEFAULT_PRESET = PRESET_CONFIGS["Generic"]
 REQUIRED_KEYS = {
     "days": int,
     "grid_size": tuple,
+    "engine": str,
+    "threads": int,
+    "processes": int,
     "initial_ratios": {
         "forest": float,
         "city": float,
@@ -0,0 +1,266 @@
+import numpy as np
+from functools import cmp_to_key
+from config.ParameterBatch import ParameterBatch
+
+
+class Advection:
+    """
+    Batched movement and collision resolution (Phases 4-5 of the daily update).
+
+    Static cells (ocean, desert, ice, forest, city, vacuum) stay in place; cloud, air and rain cells move
+    one step along their direction, wrapping around in x and y and clamped in z (as in
+    `Particle.get_next_position`). When several cells land on the same target, the sequential
+    `World._resolve_collision` fold over the cells in loop order is reproduced with a single grouped
+    reduction: every candidate gets a sortable priority key and the largest key per target wins.
+
+    All arrays may carry leading batch axes; the grid axes are always the last three. With a ParameterBatch,
+    the cells of each world of the batch collide with the collision weights of that world.
+    """
+
+    STATIC_TYPES = (0, 1, 3, 4, 5, 8)
+    MOVING_TYPES = (2, 6, 7)
+
+    def __init__(self, grid_size, parameters):
+        """
+        Initialize the Advection pass.
+
+        Args:
+            grid_size (tuple): Dimensions of the grid (x, y, z).
+            parameters (Parameters or ParameterBatch): The compiled simulation parameters.
+        """
+        self.grid_size = tuple(grid_size)
+        self.cells_per_world = self.grid_size[0] * self.grid_size[1] * self.grid_size[2]
+        members = parameters.members if isinstance(parameters, ParameterBatch) else (parameters,)
+        self.collision_weights = np.stack([member.collision_weights for member in members])  # One row per world
+        ranks = {}  # Worlds with the same weights share their ranks
+        for world, weights in enumerate(self.collision_weights):
+            if weights.tobytes() not in ranks:
+                ranks[weights.tobytes()] = self._collision_ranks(world)
+        ranks = [ranks[weights.tobytes()] for weights in self.collision_weights]
+        self.rank = None if any(rank is None for rank in ranks) else np.stack(ranks)
+
+    ####################################################################################################################
+    ###################################### COLLISION PRECEDENCE ########################################################
+    ####################################################################################################################
+
+    def _existing_wins(self, existing_type, incoming_type, world=0):
+        """
+        Outcome of `World._resolve_collision` for two cells of different types.
+
+        Args:
+            existing_type (int): Type of the cell already at the target.
+            incoming_type (int): Type of the cell moving in.
+            world (int): Index of the world of the cells in the batch.
+
+        Returns:
+            bool: True if the existing cell is kept.
+        """
+        if existing_type == 8 and incoming_type in {2, 6}:
+            return False
+        if incoming_type == 8 and existing_type in {2, 6}:
+            return True
+        if existing_type == 7 and incoming_type in {6, 8}:
+            return True
+        if incoming_type == 7 and existing_type in {6, 8}:
+            return False
+        if existing_type == 6 and incoming_type == 2:
+            return False
+        if existing_type == 2 and incoming_type == 6:
+            return True
+        weights = self.collision_weights[world]
+        return weights[existing_type] >= weights[incoming_type]
+
+    def _collision_ranks(self, world=0):
+        """
+        Encode the collision precedence between cell types of a world as integer ranks.
+
+        Moving cells are ranked among themselves; a static cell is always the first candidate at its own
+        position, so it only needs to fit between the moving types it beats and the ones it loses to.
+
+        Returns:
+            np.ndarray or None: Rank per cell type, or None if the configured precedence cannot be expressed
+            as a ranking (ties or cycles between moving types).
+        """
+        movers = list(self.MOVING_TYPES)
+        for a in movers:
+            for b in movers:
+                if a != b and self._existing_wins(a, b, world) == self._existing_wins(b, a, world):
+                    return None  # The outcome depends on arrival order
+
+        movers.sort(key=cmp_to_key(lambda a, b: -1 if self._existing_wins(b, a, world) else 1))
+        for low, a in enumerate(movers):
+            for b in movers[low + 1:]:
+                if self._existing_wins(a, b, world):
+                    return None  # Not transitive
+
+        rank = np.zeros(9, dtype=np.int64)
+        for position, mover in enumerate(movers):
+            rank[mover] = 2 * position
+        for static in self.STATIC_TYPES:
+            beaten = [self._existing_wins(static, mover, world) for mover in movers]
+            count = sum(beaten)
+            if beaten != [True] * count + [False] * (len(movers) - count):
+                return None
+            rank[static] = 2 * count - 1
+        return rank
+
+    def _resolve_pair(self, existing, incoming, cell_type, water_mass):
+        """
+        Scalar `World._resolve_collision` on flat cell indices, used when no ranking exists.
+
+        Returns:
+            int: The flat index of the cell that is kept.
+        """
+        existing_type, incoming_type = int(cell_type[existing]), int(cell_type[incoming])
+        if existing_type == incoming_type == 6:
+            return existing if water_mass[existing] >= water_mass[incoming] else incoming
+        if existing_type == incoming_type == 7:
+            return existing if water_mass[existing] > water_mass[incoming] else incoming
+        return existing if self._existing_wins(existing_type, incoming_type, existing // self.cells_per_world) else incoming
+
+    def candidates(self, sources, targets, cell_type):
+        """
+        Select the cells that may end up at their target.
+
+        A static cell is placed when the loop reaches it, replacing anything that moved there earlier, so a
+        moving cell only takes part if it comes after the static cell (if any) at its target.
+
+        Args:
+            sources (np.ndarray): Flat indices of the cells.
+            targets (np.ndarray): Flat target index of each of these cells.
+            cell_type (np.ndarray): Flat cell types of the whole grid.
+
+        Returns:
+            np.ndarray: The candidate sources, in the given order.
+        """
+        moving = np.isin(cell_type[sources], self.MOVING_TYPES)
+        placed_at = np.where(np.isin(cell_type[targets], self.MOVING_TYPES), -1, targets)
+        return sources[~moving | (sources > placed_at)]
+
+    def winners(self, candidates, candidate_targets, cell_type, water_mass):
+        """
+        Pick the cell kept at every target, as the sequential `World._resolve_collision` fold would.
+
+        Args:
+            candidates (np.ndarray): Flat indices of the cells that may end up at their target, in loop order.
+            candidate_targets (np.ndarray): Flat target index of each candidate.
+            cell_type (np.ndarray): Flat cell types.
+            water_mass (np.ndarray): Flat water mass.
+
+        Returns:
+            np.ndarray: Flat index of the winning cell of every target.
+        """
+        if candidates.size == 0:
+            return candidates
+
+        if self.rank is not None:
+            # Same-type ties: air keeps the earlier cell, rain keeps the later one, others keep the earlier one
+            candidate_types = cell_type[candidates]
+            by_water = np.isin(candidate_types, (6, 7))
+            water_key = np.where(by_water, water_mass[candidates], 0.0)
+            tie_key = np.where(candidate_types == 7, candidates, -candidates)
+            rank = self.rank[candidates // self.cells_per_world, candidate_types]
+            order = np.lexsort((tie_key, water_key, rank, candidate_targets))
+            sorted_targets = candidate_targets[order]
+            last = np.append(sorted_targets[1:] != sorted_targets[:-1], True)
+            return candidates[order[last]]
+
+        # Sequential fold for the contested targets only
+        order = np.lexsort((candidates, candidate_targets))
+        sorted_targets = candidate_targets[order]
+        first = np.append(True, sorted_targets[1:] != sorted_targets[:-1])
+        winners = []
+        for group in np.split(candidates[order], np.nonzero(first)[0][1:]):
+            winner = group[0]
+            for incoming in group[1:]:
+                winner = self._resolve_pair(winner, incoming, cell_type, water_mass)
+            winners.append(winner)
+        return np.array(winners, dtype=np.int64)
+
+    ####################################################################################################################
+    ###################################### MOVEMENT ####################################################################
+    ####################################################################################################################
+
+    def targets(self, cell_type, direction, elevation, x_start=0):
+        """
+        Compute the flat index of the cell every cell moves to.
+
+        Args:
+            cell_type (np.ndarray): Cell types after the update.
+            direction (np.ndarray): Directions of shape (..., 3, x, y, z).
+            elevation (np.ndarray): z position of each cell (rain that keeps falling is one cell lower).
+            x_start (int): x of the first plane of the arrays, when they hold a block of x-planes of the grid.
+
+        Returns:
+            np.ndarray: Flat target indices in the whole grid, same shape as cell_type.
+        """
+        x, y, z = self.grid_size
+        coords = np.indices(cell_type.shape)
+        i, j, k = coords[-3] + x_start, coords[-2], coords[-1]
+        dx, dy, dz = direction[..., 0, :, :, :], direction[..., 1, :, :, :], direction[..., 2, :, :, :]
+
+        still = (dx == 0) & (dy == 0) & (dz == 0)
+        target_i = np.where(still, i, (i + dx) % x)
+        target_j = np.where(still, j, (j + dy) % y)
+        target_k = np.where(still, elevation, np.clip(elevation + dz, 0, z - 1))
+
+        source = np.arange(cell_type.size).reshape(cell_type.shape) + x_start * y * z
+        moved = source + ((target_i - i) * y + (target_j - j)) * z + (target_k - k)
+        return np.where(np.isin(cell_type, self.MOVING_TYPES), moved, source)
+
+    def resolve(self, cell_type, temperature, water_mass, pollution_level, direction, elevation, slabs=None):
+        """
+        Move every cell and resolve collisions.
+
+        Args:
+            cell_type (np.ndarray): Cell types after the update.
+            temperature (np.ndarray): Temperatures after the update.
+            water_mass (np.ndarray): Water mass after the update.
+            pollution_level (np.ndarray): Pollution levels after the update.
+            direction (np.ndarray): Directions of shape (..., 3, x, y, z).
+            elevation (np.ndarray): z position of each cell (rain that keeps falling is one cell lower).
+            slabs (SlabExecutor, optional): Resolve the targets of each x-slab as a separate task. A target only
+                depends on the cells that move to it, so the result is the same for any number of slabs.
+
+        Returns:
+            tuple: (cell_type, temperature, water_mass, pollution_level, direction) of the new grid.
+            Targets nobody moved to become empty vacuum cells.
+        """
+        shape = cell_type.shape
+        size = cell_type.size
+        flat_type = cell_type.ravel()
+        flat_water = water_mass.ravel()
+        target = self.targets(cell_type, direction, elevation).ravel()
+        source = np.arange(size)
+        candidates = self.candidates(source, target, flat_type)
+
+        if slabs is None or len(slabs) == 1:
+            winners = self.winners(candidates, target[candidates], flat_type, flat_water)
+        else:
+            # Deterministic merge: group the candidates by the slab of their target (keeping their order)
+            plane = self.grid_size[1] * self.grid_size[2]
+            target_slab = slabs.slab_of_x[(target[candidates] % self.cells_per_world) // plane]
+            grouped = candidates[np.argsort(target_slab, kind="stable")]
+            bounds = np.cumsum(np.bincount(target_slab, minlength=len(slabs)))[:-1]
+            winners = np.concatenate(slabs.map(
+                lambda group: self.winners(group, target[group], flat_type, flat_water), np.split(grouped, bounds)))
+
+        winner_targets = target[winners]
+
+        # Targets nobody moved to become empty vacuum cells
+        new_cell_type = np.full(size, 8, dtype=cell_type.dtype)
+        new_temperature = np.zeros(size, dtype=np.float64)
+        new_water_mass = np.zeros(size, dtype=np.float64)
+        new_pollution_level = np.zeros(size, dtype=np.float64)
+        new_cell_type[winner_targets] = flat_type[winners]
+        new_temperature[winner_targets] = temperature.ravel()[winners]
+        new_water_mass[winner_targets] = flat_water[winners]
+        new_pollution_level[winner_targets] = pollution_level.ravel()[winners]
+
+        components = np.moveaxis(direction, -4, 0).reshape(3, size)
+        new_direction = np.zeros((3, size), dtype=direction.dtype)
+        new_direction[:, winner_targets] = components[:, winners]
+        new_direction = np.moveaxis(new_direction.reshape((3,) + shape), 0, -4)
+
+        return (new_cell_type.reshape(shape), new_temperature.reshape(shape), new_water_mass.reshape(shape),
+                new_pollution_level.reshape(shape), new_direction)
@@ -0,0 +1,262 @@
+import multiprocessing
+import multiprocessing.connection
+import os
+import threading
+import weakref
+import numpy as np
+from .SharedArrays import SharedArrays
+from .Stencil import Stencil
+from .WaterFlux import WaterFlux
+from .Advection import Advection
+from .World import World
+from .WorldState import WorldState
+
+_STEP, _STOP = 0, 1  # Commands of the worker processes
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# Next state of every cell before it moves (see `World.next_cell_states`)
+_NEXT_FIELDS = ("next_cell_type", "next_temperature", "next_water_mass", "next_pollution_level", "next_direction",
+                "elevation")
+
+
+class DomainDecomposition:
+    """
+    One World stepped by a group of worker processes, each owning a sub-domain of x-planes.
+
+    The state lives in `multiprocessing.shared_memory` blocks (see SharedArrays) that every worker maps, so
+    the halos of a sub-domain are read directly from the planes of its neighbors instead of being sent.
+    The processes step in lock-step, with a barrier after each phase of the day:
+
+    1. Every worker computes the water transfers of its planes from its planes and a one-plane halo.
+    2. Every worker computes the next state of its planes (`World.next_cell_states`) from the new water mass
+       of its planes and halo, and the flat target of each of its cells.
+    3. Every worker builds the next day of its planes from the cells that move into them, resolving their
+       collisions as `Advection.resolve` does. Cells cross sub-domain boundaries, and wrap around the x-axis,
+       like everywhere else: a worker reads the cells of every plane within the longest move of the day.
+
+    The state is double-buffered, so the workers never write what the others still read. The split only
+    decides which process computes which planes, never the values, so the next state is the same as with
+    the other engines for any number of processes.
+    """
+
+    def __init__(self, grid_size, parameters, processes=None):
+        """
+        Initialize the DomainDecomposition and start its worker processes.
+
+        Args:
+            grid_size (tuple): Dimensions of the grid (x, y, z).
+            parameters (Parameters): The compiled simulation parameters.
+            processes (int, optional): Number of worker processes. Defaults to the number of CPUs.
+        """
+        self.grid_size = tuple(grid_size)
+        self.parameters = parameters
+        size_x = self.grid_size[0]
+        count = max(1, min(processes or os.cpu_count() or 1, size_x))
+        edges = [size_x * domain // count for domain in range(count + 1)]
+        self.domains = list(zip(edges[:-1], edges[1:]))  # (start, stop) x-range of each worker
+
+        # Two buffers of the state (today and tomorrow), the new water mass, and the next state before it moves
+        shape, direction_shape = self.grid_size, (3,) + self.grid_size
+        specs = {}
+        for parity in (0, 1):
+            specs.update({
+                f"cell_type{parity}": (shape, np.int8), f"temperature{parity}": (shape, np.float64),
+                f"water_mass{parity}": (shape, np.float64), f"pollution_level{parity}": (shape, np.float64),
+                f"direction{parity}": (direction_shape, np.int8),
+            })
+        specs.update({
+            "water_mass": (shape, np.float64),
+            "next_cell_type": (shape, np.int8), "next_temperature": (shape, np.float64),
+            "next_water_mass": (shape, np.float64), "next_pollution_level": (shape, np.float64),
+            "next_direction": (direction_shape, np.int8), "elevation": (shape, np.int64),
+            "target": (shape, np.int64),
+            "reach": ((count,), np.int64),  # Longest x-move of the cells of each worker
+        })
+        self.shared = SharedArrays.create(specs)
+        self.parity = 0  # Buffer holding the current day
+        self._state = None  # WorldState last returned by `step`
+
+        # Fresh interpreters rather than forks, which would inherit the threads (e.g. of Numba) of the parent
+        context = multiprocessing.get_context(_START_METHOD)
+        self._barriers = (context.Barrier(count + 1), context.Barrier(count), context.Barrier(count + 1))
+        self._command = context.Value("i", _STEP, lock=False)
+        self.workers = [
+            context.Process(target=_run_worker, name=f"domain-{rank}", daemon=True, args=(
+                rank, self.grid_size, self.domains[rank], parameters, self.shared.descriptor, self._barriers,
+                self._command))
+            for rank in range(count)
+        ]
+        for worker in self.workers:
+            worker.start()
+        # Breaks the barriers as soon as a worker exits, so nobody waits for it (e.g. if it crashed or was killed)
+        threading.Thread(target=_watch, args=(self.workers, self._barriers), name="domain-watch", daemon=True).start()
+        self._finalizer = weakref.finalize(self, _shutdown, self.workers, self._barriers, self._command, self.shared)
+
+    def __len__(self):
+        return len(self.workers)
+
+    def step(self, state):
+        """
+        Compute the next day of a state.
+
+        Args:
+            state (WorldState): The cells of the current day.
+
+        Returns:
+            WorldState: The cells of the next day (new arrays, not shared with the workers).
+
+        Raises:
+            RuntimeError: If a worker process failed.
+        """
+        current = {field: self.shared[f"{field}{self.parity}"] for field in WorldState.FIELDS}
+        # The state returned by the last step is already in the current buffers, unless it was changed since
+        if self._state is None or any(getattr(state, field) is not getattr(self._state, field)
+                                      for field in WorldState.FIELDS):
+            for field in WorldState.FIELDS:
+                current[field][...] = getattr(state, field)
+
+        start, _, done = self._barriers
+        self._command.value = _STEP
+        try:
+            start.wait()
+            done.wait()
+        except threading.BrokenBarrierError:
+            raise RuntimeError("A domain worker process failed, see its traceback above.") from None
+
+        self.parity ^= 1
+        self._state = WorldState(self.grid_size, *(
+            self.shared[f"{field}{self.parity}"].copy() for field in WorldState.FIELDS))
+        return self._state
+
+    def close(self):
+        """
+        Stop the worker processes and free the shared memory. Also done when the DomainDecomposition is
+        garbage collected or at exit, but the processes may already be gone by then.
+        """
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _shutdown(workers, barriers, command, shared):
+    """
+    Stop the worker processes of a DomainDecomposition and free its shared memory.
+    """
+    if all(worker.is_alive() for worker in workers):
+        command.value = _STOP
+        try:
+            barriers[0].wait(timeout=5)
+        except threading.BrokenBarrierError:
+            pass  # A worker failed or did not answer in time
+    else:
+        for barrier in barriers:
+            barrier.abort()  # Some workers are gone: wake up the others instead of waiting for them
+    for worker in workers:
+        worker.join(timeout=5)
+        if worker.is_alive():
+            worker.terminate()
+            worker.join()
+    shared.close()
+
+
+def _watch(workers, barriers):
+    """
+    Wait until a worker process of a DomainDecomposition exits, then abort its barriers.
+    """
+    multiprocessing.connection.wait([worker.sentinel for worker in workers])
+    for barrier in barriers:
+        barrier.abort()
+
+
+def _run_worker(rank, grid_size, domain, parameters, descriptor, barriers, command):
+    """
+    Main loop of a worker process: step the planes of its sub-domain until told to stop.
+
+    Args:
+        rank (int): Index of the worker.
+        grid_size (tuple): Dimensions of the grid (x, y, z).
+        domain (tuple): (start, stop) x-range of the planes the worker owns.
+        parameters (Parameters): The compiled simulation parameters.
+        descriptor (dict): Descriptor of the SharedArrays of the DomainDecomposition.
+        barriers (tuple): Barriers at the start of a day, between the phases, and at the end of a day.
+        command: Shared value telling the workers to step (_STEP) or to exit (_STOP).
+    """
+    start_barrier, phase_barrier, done_barrier = barriers
+    size_x, size_y, size_z = grid_size
+    plane = size_y * size_z
+    start, stop = domain
+    low, high = max(start - 1, 0), min(stop + 1, size_x)  # Planes the phases 1-2 read: one halo plane
+    block = (high - low, size_y, size_z)
+    own = slice(start - low, stop - low)  # The planes of the worker within its block
+    parity = 0
+    shared = None
+    try:
+        shared = SharedArrays.attach(descriptor)
+        advection = Advection(grid_size, parameters)
+        water_flux = WaterFlux(Stencil(block), parameters)
+        while True:
+            start_barrier.wait()
+            if command.value == _STOP:
+                break
+            current = {field: shared[f"{field}{parity}"] for field in WorldState.FIELDS}
+            following = {field: shared[f"{field}{parity ^ 1}"] for field in WorldState.FIELDS}
+
+            # Phases 1-2: Water transfers of the worker's planes
+            shared["water_mass"][start:stop] = water_flux.apply(
+                current["cell_type"][low:high], current["water_mass"][low:high])[own]
+            phase_barrier.wait()
+
+            # Phase 3: Next states of the worker's planes, and where their cells move
+            fields = World.next_cell_states(
+                block, parameters, current["cell_type"][low:high], current["temperature"][low:high],
+                shared["water_mass"][low:high], current["pollution_level"][low:high],
+                current["direction"][:, low:high])
+            for name, field in zip(_NEXT_FIELDS, fields):
+                shared[name][..., start:stop, :, :] = field[..., own, :, :]  # x is the third-last axis
+            next_type, next_direction, elevation = fields[0][own], fields[4][:, own], fields[5][own]
+            shared["target"][start:stop] = advection.targets(next_type, next_direction, elevation, x_start=start)
+            moving = np.isin(next_type, Advection.MOVING_TYPES)
+            shared["reach"][rank] = np.abs(next_direction[0][moving]).max(initial=0)
+            phase_barrier.wait()
+
+            # Phases 4-5: Gather the cells moving into the worker's planes and resolve their collisions
+            reach = int(shared["reach"].max())
+            if stop - start + 2 * reach >= size_x:
+                planes = np.arange(size_x)
+            else:
+                planes = np.arange(start - reach, stop + reach) % size_x  # x wraps around
+            sources = (planes[:, None] * plane + np.arange(plane)).reshape(-1)
+            target = shared["target"].reshape(-1)
+            flat_type = shared["next_cell_type"].reshape(-1)
+            sources = sources[(target[sources] >= start * plane) & (target[sources] < stop * plane)]
+            sources.sort()  # Loop order, which decides the collisions
+            candidates = advection.candidates(sources, target[sources], flat_type)
+            winners = advection.winners(
+                candidates, target[candidates], flat_type, shared["next_water_mass"].reshape(-1))
+            winner_targets = target[winners]
+
+            # Cells nothing moved into become Vacuum
+            following["cell_type"][start:stop] = 8
+            for field in ("temperature", "water_mass", "pollution_level"):
+                following[field][start:stop] = 0
+            following["direction"][:, start:stop] = 0
+            for field in ("cell_type", "temperature", "water_mass", "pollution_level"):
+                following[field].reshape(-1)[winner_targets] = shared[f"next_{field}"].reshape(-1)[winners]
+            following["direction"].reshape(3, -1)[:, winner_targets] = \
+                shared["next_direction"].reshape(3, -1)[:, winners]
+
+            done_barrier.wait()
+            parity ^= 1
+    except threading.BrokenBarrierError:
+        pass  # Another worker failed; the parent reports it
+    except BaseException:
+        for barrier in barriers:
+            barrier.abort()
+        raise
+    finally:
+        if shared is not None:
+            shared.close()
@@ -0,0 +1,274 @@
+import logging
+import os
+from config.Config import config_instance
+from .World import World
+from .SlabExecutor import SlabExecutor
+from .DomainDecomposition import DomainDecomposition
+from . import NumbaKernels
+
+
+class Engine:
+    """
+    Interface of a simulation engine: how the World of day 0 is built and advanced by one day.
+
+    Engines are registered by name in ENGINES (see `register_engine`) and looked up with `get_engine`, so the
+    engine of a run can be chosen from the configuration or the command line. All engines produce the same
+    states; the reference engine is the ground truth the others are checked against.
+    """
+
+    name = None  # Registry name, set by subclasses
+
+    @classmethod
+    def available(cls):
+        """
+        Whether the engine can run in this environment (e.g. its optional dependencies are installed).
+        """
+        return True
+
+    def initialize(self, grid_size, initial_ratios, seed=None, state=None):
+        """
+        Build the World of day 0.
+
+        Args:
+            grid_size (tuple): Dimensions of the grid (x, y, z).
+            initial_ratios (dict): Initial ratios for cell types.
+            seed (int or RandomStreams, optional): Seed for the random initialization of the grid.
+            state (WorldState, optional): An already initialized grid to start from instead (shared, not copied).
+
+        Returns:
+            World: The initialized World.
+        """
+        world = World(grid_size=grid_size, initial_ratios=initial_ratios, day_number=0)
+        if state is None:
+            world.initialize_grid(seed=seed)
+        else:
+            world.state = state.share()
+            world._recalculate_global_attributes()
+        return world
+
+    def step(self, world):
+        """
+        Compute the World of the next day. The given World is left unchanged.
+
+        Args:
+            world (World): The World of the current day.
+
+        Returns:
+            World: The World of the next day.
+        """
+        next_world = world.clone()
+        next_world.day_number += 1
+        self.update(next_world)
+        return next_world
+
+    def update(self, world):
+        """
+        Advance a World by one day in place (also recalculates its global attributes).
+
+        Args:
+            world (World): The World to update.
+        """
+        raise NotImplementedError
+
+    def aggregates(self, world):
+        """
+        The global attributes of a World that the Simulation tracks over time.
+
+        Args:
+            world (World): The World to summarize.
+
+        Returns:
+            dict: Spatial averages, standard deviations and cell type counts of the World.
+        """
+        return {
+            "avg_pollution": world.avg_pollution,
+            "avg_temperature": world.avg_temperature,
+            "avg_water_mass": world.avg_water_mass,
+            "std_dev_pollution": world.std_dev_pollution,
+            "std_dev_temperature": world.std_dev_temperature,
+            "std_dev_water_mass": world.std_dev_water_mass,
+            "total_cities": world.total_cities,
+            "total_forests": world.total_forests,
+            "cell_type_counts": world.cell_type_counts,
+        }
+
+    def snapshot(self, world):
+        """
+        The cells of a World as a copy-on-write WorldState that later updates cannot change.
+
+        Args:
+            world (World): The World to snapshot.
+
+        Returns:
+            WorldState: The shared state of the World.
+        """
+        return world.state.share()
+
+    def close(self):
+        """
+        Release the threads, processes or shared memory of the engine. A closed engine can still be used: it
+        acquires them again on its next update.
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+ENGINES = {}  # Engine classes by name
+AUTO_NUMBA_MIN_CELLS = 8000  # Smaller grids are not worth the Numba compile time of a fresh install
+
+
+def register_engine(cls):
+    """
+    Class decorator adding an Engine subclass to ENGINES under its `name`.
+    """
+    ENGINES[cls.name] = cls
+    return cls
+
+
+@register_engine
+class ReferenceEngine(Engine):
+    """
+    The per-cell Particle update (`World.update_cells_on_grid`), the ground truth for the other engines.
+    """
+
+    name = "reference"
+
+    def update(self, world):
+        world.update_cells_on_grid()
+
+
+@register_engine
+class VectorizedEngine(Engine):
+    """
+    The array-based NumPy update (`World.update_cells_on_grid_vectorized`).
+    """
+
+    name = "numpy"
+
+    def update(self, world):
+        world.update_cells_on_grid_vectorized()
+
+
+@register_engine
+class ThreadedEngine(Engine):
+    """
+    The array-based update split into x-slabs on a thread pool (`World.update_cells_on_grid_threaded`), for
+    single large grids. The number of threads comes from the "threads" configuration key (0: one per CPU).
+    """
+
+    name = "threads"
+
+    def __init__(self, threads=None):
+        """
+        Initialize the ThreadedEngine.
+
+        Args:
+            threads (int, optional): Number of threads. Defaults to the configuration.
+        """
+        if threads is None:
+            threads = config_instance.get().get("threads", 0)
+        self.threads = threads or None
+        self.slabs = None  # SlabExecutor of the last grid size
+
+    def update(self, world):
+        if self.slabs is None or self.slabs.grid_size != tuple(world.grid_size):
+            if self.slabs is not None:
+                self.slabs.shutdown()
+            self.slabs = SlabExecutor(world.grid_size, self.threads)
+        world.update_cells_on_grid_threaded(self.slabs)
+
+    def close(self):
+        if self.slabs is not None:
+            self.slabs.shutdown()
+            self.slabs = None
+
+
+@register_engine
+class DistributedEngine(Engine):
+    """
+    The array-based update on worker processes that each own a sub-domain of x-planes and share the state
+    through shared memory (`World.update_cells_on_grid_distributed`), for single grids too large for one
+    process. The number of processes comes from the "processes" configuration key (0: one per CPU).
+    """
+
+    name = "processes"
+
+    def __init__(self, processes=None):
+        """
+        Initialize the DistributedEngine.
+
+        Args:
+            processes (int, optional): Number of worker processes. Defaults to the configuration.
+        """
+        if processes is None:
+            processes = config_instance.get().get("processes", 0)
+        self.processes = processes or None
+        self.domains = None  # DomainDecomposition of the last grid size and parameters
+
+    def update(self, world):
+        domains = self.domains
+        if domains is None or domains.grid_size != tuple(world.grid_size) or domains.parameters is not world.parameters:
+            if domains is not None:
+                domains.close()
+            self.domains = DomainDecomposition(world.grid_size, world.parameters, self.processes)
+        world.update_cells_on_grid_distributed(self.domains)
+
+    def close(self):
+        if self.domains is not None:
+            self.domains.close()
+            self.domains = None
+
+
+@register_engine
+class NumbaEngine(Engine):
+    """
+    The Numba-compiled update (`World.update_cells_on_grid_numba`). Requires the optional `numba` package.
+    """
+
+    name = "numba"
+
+    @classmethod
+    def available(cls):
+        return NumbaKernels.NUMBA_AVAILABLE
+
+    def update(self, world):
+        world.update_cells_on_grid_numba()
+
+
+def get_engine(name="auto", grid_size=None):
+    """
+    Create the engine registered under a name.
+
+    "auto" picks the fastest available engine for the grid size: for grids of at least AUTO_NUMBA_MIN_CELLS
+    cells, the Numba engine when Numba is installed, else the threaded engine on machines with several CPUs;
+    otherwise the NumPy engine.
+
+    Args:
+        name (str): A name in ENGINES, or "auto".
+        grid_size (tuple, optional): Dimensions of the grid, used by "auto".
+
+    Returns:
+        Engine: A new engine instance.
+
+    Raises:
+        ValueError: If no engine is registered under the name, or it is not available.
+    """
+    if name == "auto":
+        cells = grid_size[0] * grid_size[1] * grid_size[2] if grid_size else 0
+        if cells < AUTO_NUMBA_MIN_CELLS:
+            name = "numpy"
+        elif NumbaEngine.available():
+            name = "numba"
+        else:
+            name = "threads" if (os.cpu_count() or 1) > 1 else "numpy"
+        logging.info(f"Selected the '{name}' engine.")
+
+    if name not in ENGINES:
+        raise ValueError(f"Unknown engine '{name}'. Choose one of: auto, {', '.join(ENGINES)}.")
+    if not ENGINES[name].available():
+        raise ValueError(f"Engine '{name}' is not available in this environment.")
+    return ENGINES[name]()
@@ -0,0 +1,222 @@
+import argparse
+import logging
+import os
+import numpy as np
+from config.Config import config_instance
+from config.presets import PRESET_CONFIGS
+from .RandomStreams import RandomStreams
+from .RunResults import AGGREGATES, result_specs, run_simulation, run_tasks, write_run
+from .SharedArrays import SharedArrays
+from .Simulation import Simulation
+from .WorldBatch import WorldBatch
+from .WorldState import WorldState
+
+
+def _result_specs(grid_size, days, members, final_states):
+    """
+    Shapes and dtypes of the shared arrays the members write their results into.
+
+    Returns:
+        dict: Name -> (shape, dtype): one row per member for every aggregate (see `result_specs`), plus the
+        final state fields ("final_cell_type", ...) if requested.
+    """
+    specs = result_specs(members, days)
+    if final_states:
+        empty = WorldState.empty(grid_size)
+        for field in WorldState.FIELDS:
+            specs[f"final_{field}"] = ((members,) + getattr(empty, field).shape, getattr(empty, field).dtype)
+    return specs
+
+
+def _run_member(grid_size, initial_ratios, days, engine, streams, results, member):
+    """
+    Run one ensemble member without keeping its states, and write its aggregates (and its final state, if the
+    results have room for it) into row `member` of the shared result arrays.
+
+    Args:
+        results (dict): Descriptor of the SharedArrays of the results (see `_result_specs`).
+        member (int): Index of the member.
+    """
+    world, run = run_simulation(Simulation(grid_size, initial_ratios, days, engine=engine, seed=streams))
+    with SharedArrays.attach(results) as shared:
+        write_run(shared, member, run)
+        if "final_cell_type" in shared.arrays:
+            for field in WorldState.FIELDS:
+                shared[f"final_{field}"][member] = getattr(world.state, field)
+
+
+def _run_batch(grid_size, initial_ratios, days, streams, results, first):
+    """
+    Run several ensemble members together as one WorldBatch, and write their results into the rows of the
+    shared result arrays starting at `first` (see `_run_member`).
+    """
+    batch = WorldBatch.initialize(grid_size, initial_ratios, streams)
+    runs = batch.run(days)
+    with SharedArrays.attach(results) as shared:
+        for offset, run in enumerate(runs):
+            write_run(shared, first + offset, run)
+        if "final_cell_type" in shared.arrays:
+            for field in WorldState.FIELDS:
+                shared[f"final_{field}"][first:first + len(batch)] = batch.fields[field]
+
+
+class EnsembleResult:
+    """
+    Per-day aggregates of all the members of an ensemble, with their mean, std and percentile bands.
+    """
+
+    def __init__(self, members, final_states=None):
+        """
+        Initialize the EnsembleResult.
+
+        Args:
+            members (dict): Aggregate name -> array with one row per member (in member order) and one column
+                per day.
+            final_states (dict, optional): WorldState field -> array of the last day of every member.
+        """
+        self.members = members
+        self.final_states = final_states
+
+    def __len__(self):
+        return len(next(iter(self.members.values())))
+
+    def mean(self, name):
+        """
+        Per-day mean over the members.
+
+        Args:
+            name (str): One of AGGREGATES.
+
+        Returns:
+            np.ndarray: The mean of each day (one column per cell type for `cell_type_counts_over_time`).
+        """
+        return self.members[name].mean(axis=0)
+
+    def std(self, name):
+        """
+        Per-day (population) standard deviation over the members.
+
+        Args:
+            name (str): One of AGGREGATES.
+
+        Returns:
+            np.ndarray: The standard deviation of each day.
+        """
+        return self.members[name].std(axis=0)
+
+    def percentile(self, name, q):
+        """
+        Per-day percentiles over the members.
+
+        Args:
+            name (str): One of AGGREGATES.
+            q (float or sequence): Percentiles in [0, 100].
+
+        Returns:
+            np.ndarray: The percentiles of each day, with a leading axis for sequences of q.
+        """
+        return np.percentile(self.members[name], q, axis=0)
+
+    def band(self, name, low=5, high=95):
+        """
+        Mean and percentile band of an aggregate, e.g. for `MatplotlibDisplay.render_generic_graph`.
+
+        Args:
+            name (str): One of AGGREGATES.
+            low (float): Lower percentile.
+            high (float): Upper percentile.
+
+        Returns:
+            tuple: (mean, std, lower, upper) per-day arrays.
+        """
+        lower, upper = self.percentile(name, (low, high))
+        return self.mean(name), self.std(name), lower, upper
+
+    def save(self, path):
+        """
+        Save the member arrays (and the final states, as "final_<field>") to a compressed .npz file.
+
+        Args:
+            path (str): File path.
+        """
+        final_states = {f"final_{field}": values for field, values in (self.final_states or {}).items()}
+        np.savez_compressed(path, **self.members, **final_states)
+
+
+def run_ensemble(grid_size, initial_ratios, days, members, seed=None, engine=None, workers=None, batch_size=1,
+                 final_states=False):
+    """
+    Run the same configuration with `members` different seeds, spread over a process pool.
+
+    Member m is seeded with the child stream (RandomStreams.MEMBER, m) of `seed`, so the result does not depend
+    on the number of workers or the batch size. The workers write the per-day aggregate arrays (and the final
+    states) straight into shared memory that this process maps (see SharedArrays): nothing but small task
+    descriptors goes through the process pool, and the results are not copied.
+
+    Args:
+        grid_size (tuple): Dimensions of the grid (x, y, z).
+        initial_ratios (dict): Initial ratios for cell types.
+        days (int): Number of days to simulate.
+        members (int): Number of ensemble members.
+        seed (int, optional): Root seed of the ensemble. A fresh seed is drawn if omitted.
+        engine (str, optional): Engine name (see core.Engine). Defaults to the configuration's engine.
+        workers (int, optional): Number of processes. Defaults to the number of CPUs; 1 runs in this process.
+        batch_size (int): Number of members stepped together as one WorldBatch, which removes the per-world
+            overhead on small grids. Batches always use the array (NumPy) update; with 1, every member is its
+            own Simulation using `engine`.
+        final_states (bool): Also keep the state of the last day of every member (`EnsembleResult.final_states`).
+
+    Returns:
+        EnsembleResult: The aggregates of all members.
+    """
+    streams = RandomStreams(seed)
+    logging.info(f"Running an ensemble of {members} members (seed {streams.entropy}).")
+    member_streams = [streams.child(RandomStreams.MEMBER, member) for member in range(members)]
+    with SharedArrays.create(_result_specs(grid_size, days, members, final_states)) as shared:
+        if batch_size > 1:
+            task = _run_batch
+            arguments = [(grid_size, initial_ratios, days, member_streams[start:start + batch_size],
+                          shared.descriptor, start) for start in range(0, members, batch_size)]
+        else:
+            task = _run_member
+            arguments = [(grid_size, initial_ratios, days, engine, member_stream, shared.descriptor, member)
+                         for member, member_stream in enumerate(member_streams)]
+
+        if min(workers or os.cpu_count() or 1, len(arguments)) == 1:
+            for member in arguments:
+                task(*member)
+        else:
+            run_tasks(task, arguments, workers, config=dict(config_instance.get()))
+        results = shared.arrays  # Still mapped after the blocks are closed (see SharedArrays)
+    return EnsembleResult(
+        {name: results[name] for name in AGGREGATES},
+        {field: results[f"final_{field}"] for field in WorldState.FIELDS} if final_states else None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run an ensemble of simulations over seeds.")
+    parser.add_argument("--preset", default=next(iter(PRESET_CONFIGS)), choices=list(PRESET_CONFIGS))
+    parser.add_argument("--members", type=int, default=8)
+    parser.add_argument("--days", type=int, default=None, help="Defaults to the preset's days.")
+    parser.add_argument("--grid-size", default=None, help="Grid size as comma-separated integers.")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--engine", default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=1, help="Members stepped together as one batch.")
+    parser.add_argument("--final-states", action="store_true", help="Also save the last day of every member.")
+    parser.add_argument("--output", default="ensemble.npz", help="Where to save the member aggregates.")
+    arguments = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    config_instance.update(preset_name=arguments.preset)
+    config_instance.finalize()
+    config = config_instance.get()
+    grid_size = tuple(int(v) for v in arguments.grid_size.split(",")) if arguments.grid_size else config["grid_size"]
+
+    result = run_ensemble(grid_size, config["initial_ratios"], arguments.days or config["days"], arguments.members,
+                          seed=arguments.seed, engine=arguments.engine, workers=arguments.workers,
+                          batch_size=arguments.batch_size, final_states=arguments.final_states)
+    result.save(arguments.output)
+    mean, std, lower, upper = result.band("pollution_over_time")
+    logging.info(f"Final average pollution: {mean[-1]:.3f} ± {std[-1]:.3f} (5-95%: {lower[-1]:.3f}-{upper[-1]:.3f})")
+    logging.info(f"Saved the aggregates of {len(result)} members to {arguments.output}.")
@@ -0,0 +1,246 @@
+import argparse
+import contextlib
+import hashlib
+import logging
+import os
+from collections import namedtuple
+import numpy as np
+from config.Config import config_instance
+from config.presets import PRESET_CONFIGS
+from .Engine import ENGINES, get_engine
+from .WorldState import WorldState
+
+
+# First difference found by GoldenTrace.compare: `cell` is the grid position (None for aggregates)
+Divergence = namedtuple("Divergence", ["preset", "day", "field", "cell", "expected", "actual"])
+
+
+class GoldenTrace:
+    """
+    Per-day record of a seeded run of the reference engine, used to check other engines against it.
+
+    A trace holds, for every day, the state arrays, a SHA-256 checksum of each state field and the aggregates
+    the Simulation tracks (see `Engine.aggregates`). `compare` replays the same scenario with another engine
+    and reports the first day, field and cell where it leaves the trace.
+    """
+
+    def __init__(self, preset, grid_size, days, seed, states, checksums, aggregates):
+        """
+        Initialize a GoldenTrace from recorded data (see `record` and `load`).
+
+        Args:
+            preset (str): Name of the preset in PRESET_CONFIGS.
+            grid_size (tuple): Dimensions of the grid (x, y, z).
+            days (int): Number of simulated days (the trace has days + 1 entries).
+            seed (int): Seed of the initial grid.
+            states (list): WorldState of each day.
+            checksums (list): Per day, a dict of field -> hex digest.
+            aggregates (dict): Aggregate name -> array with one row per day.
+        """
+        self.preset = preset
+        self.grid_size = tuple(grid_size)
+        self.days = days
+        self.seed = seed
+        self.states = states
+        self.checksums = checksums
+        self.aggregates = aggregates
+
+    @staticmethod
+    def checksum_of(array):
+        """
+        SHA-256 hex digest of one array.
+        """
+        return hashlib.sha256(np.ascontiguousarray(array).tobytes()).hexdigest()
+
+    @classmethod
+    def checksum(cls, state):
+        """
+        SHA-256 digest of each field of a state.
+
+        Args:
+            state (WorldState): The state to hash.
+
+        Returns:
+            dict: Field -> hex digest.
+        """
+        return {field: cls.checksum_of(getattr(state, field)) for field in WorldState.FIELDS}
+
+    @staticmethod
+    def _days(preset, engine, grid_size, days, seed):
+        """
+        Run a preset with an engine and yield the World of each day. The engine is closed when the generator
+        is exhausted or closed.
+        """
+        config_instance.update(preset_name=preset)
+        engine = get_engine(engine, grid_size) if isinstance(engine, str) else engine
+        with engine:
+            world = engine.initialize(grid_size, PRESET_CONFIGS[preset]["initial_ratios"], seed=seed)
+            yield engine, world
+            for _ in range(days):
+                world = engine.step(world)
+                yield engine, world
+
+    @classmethod
+    def record(cls, preset, grid_size=(8, 8, 6), days=20, seed=0, engine="reference"):
+        """
+        Record the trace of a preset.
+
+        The configuration is switched to the preset, so it must not be finalized.
+
+        Args:
+            preset (str): Name of the preset in PRESET_CONFIGS.
+            grid_size (tuple): Dimensions of the grid (x, y, z).
+            days (int): Number of days to simulate.
+            seed (int): Seed of the initial grid.
+            engine (str or Engine): The engine recording the trace.
+
+        Returns:
+            GoldenTrace: The recorded trace.
+        """
+        states, checksums, rows = [], [], []
+        for engine, world in cls._days(preset, engine, grid_size, days, seed):
+            state = engine.snapshot(world)
+            states.append(state)
+            checksums.append(cls.checksum(state))
+            rows.append(engine.aggregates(world))
+        aggregates = {name: np.array([row[name] for row in rows]) for name in rows[0]}
+        return cls(preset, grid_size, days, seed, states, checksums, aggregates)
+
+    def compare(self, engine, rtol=0.0, atol=0.0):
+        """
+        Replay the scenario with another engine and find where it first leaves the trace.
+
+        Cell types and directions must match exactly; the float fields and aggregates are compared with
+        `np.isclose(actual, expected, rtol, atol)` (exactly with the default tolerances). Each day the state
+        fields are checked before the aggregates, and the replay stops at the first difference.
+
+        Args:
+            engine (str or Engine): The engine to check.
+            rtol (float): Relative tolerance for floats.
+            atol (float): Absolute tolerance for floats.
+
+        Returns:
+            Divergence or None: The first difference, or None if the engine follows the whole trace.
+        """
+        exact = rtol == 0 and atol == 0
+        replay = self._days(self.preset, engine, self.grid_size, self.days, self.seed)
+        with contextlib.closing(replay):  # Closes the engine, also when the replay stops early
+            for day, (engine, world) in enumerate(replay):
+                state = engine.snapshot(world)
+                expected_checksums = self.checksums[day]
+                for field in WorldState.FIELDS:
+                    expected, actual = getattr(self.states[day], field), getattr(state, field)
+                    if exact and self.checksum_of(actual) == expected_checksums[field]:
+                        continue
+                    if expected.dtype.kind == "f":
+                        matches = np.isclose(actual, expected, rtol=rtol, atol=atol, equal_nan=True)
+                    else:
+                        matches = actual == expected
+                    if not matches.all():
+                        index = tuple(int(i) for i in np.argwhere(~matches)[0])
+                        cell = index[1:] if field == "direction" else index
+                        return Divergence(self.preset, day, field, cell, expected[index], actual[index])
+
+                aggregates = engine.aggregates(world)
+                for name, values in self.aggregates.items():
+                    expected, actual = np.asarray(values[day]), np.asarray(aggregates[name])
+                    if not np.isclose(actual, expected, rtol=rtol, atol=atol, equal_nan=True).all():
+                        return Divergence(self.preset, day, name, None, expected, actual)
+        return None
+
+    def save(self, path):
+        """
+        Save the trace to a compressed .npz file.
+
+        Args:
+            path (str): File path.
+        """
+        arrays = {f"state_{field}": np.stack([getattr(state, field) for state in self.states])
+                  for field in WorldState.FIELDS}
+        arrays.update({f"aggregate_{name}": values for name, values in self.aggregates.items()})
+        np.savez_compressed(path, preset=self.preset, grid_size=self.grid_size, days=self.days, seed=self.seed,
+                            **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a trace saved with `save`.
+
+        Args:
+            path (str): File path.
+
+        Returns:
+            GoldenTrace: The loaded trace.
+        """
+        with np.load(path) as data:
+            grid_size = tuple(int(v) for v in data["grid_size"])
+            fields = [data[f"state_{field}"] for field in WorldState.FIELDS]
+            states = [WorldState(grid_size, *(array[day] for array in fields)) for day in range(len(fields[0]))]
+            aggregates = {name[len("aggregate_"):]: data[name] for name in data.files if name.startswith("aggregate_")}
+            trace = cls(str(data["preset"]), grid_size, int(data["days"]), int(data["seed"]), states, [],
+                        aggregates)
+        trace.checksums = [cls.checksum(state) for state in states]
+        return trace
+
+
+def run_harness(engines, presets=None, grid_size=(8, 8, 6), days=20, seed=0, rtol=0.0, atol=0.0, trace_dir=None):
+    """
+    Check engines against the reference traces of every preset.
+
+    The configuration is switched to each preset in turn (so it must not be finalized) and restored afterwards.
+
+    Args:
+        engines (list): Engine names to check.
+        presets (list, optional): Preset names. Defaults to all of PRESET_CONFIGS.
+        grid_size (tuple): Dimensions of the grid (x, y, z).
+        days (int): Number of days to simulate.
+        seed (int): Seed of the initial grids.
+        rtol (float): Relative tolerance for floats.
+        atol (float): Absolute tolerance for floats.
+        trace_dir (str, optional): Directory where the reference traces are loaded from if present, or saved.
+
+    Returns:
+        dict: (engine, preset) -> Divergence or None.
+    """
+    results = {}
+    original_config = dict(config_instance.get())  # The traces switch presets; restored at the end
+    try:
+        for index, preset in enumerate(presets or PRESET_CONFIGS):
+            path = os.path.join(trace_dir, f"preset_{index}_seed_{seed}.npz") if trace_dir else None
+            trace = GoldenTrace.load(path) if path and os.path.exists(path) else None
+            if trace is None or (trace.preset, trace.grid_size, trace.days) != (preset, tuple(grid_size), days):
+                trace = GoldenTrace.record(preset, grid_size, days, seed)
+                if path:
+                    os.makedirs(trace_dir, exist_ok=True)
+                    trace.save(path)
+
+            for engine in engines:
+                divergence = trace.compare(engine, rtol=rtol, atol=atol)
+                results[(engine, preset)] = divergence
+                if divergence is None:
+                    logging.info(f"[{engine}] {preset}: matches the reference for {trace.days} days.")
+                else:
+                    logging.info(f"[{engine}] {preset}: diverges on day {divergence.day}, field {divergence.field}, "
+                                 f"cell {divergence.cell}: expected {divergence.expected}, got {divergence.actual}.")
+    finally:
+        config_instance.update(custom_config=original_config)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check simulation engines against reference golden traces.")
+    parser.add_argument("--engines", nargs="+", default=[name for name in ENGINES if name != "reference"],
+                        help="Engines to check.")
+    parser.add_argument("--grid-size", default="8,8,6", help="Grid size as comma-separated integers.")
+    parser.add_argument("--days", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rtol", type=float, default=0.0)
+    parser.add_argument("--atol", type=float, default=0.0)
+    parser.add_argument("--trace-dir", help="Directory to load or save the reference traces.")
+    arguments = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    results = run_harness(arguments.engines, grid_size=tuple(int(v) for v in arguments.grid_size.split(",")),
+                          days=arguments.days, seed=arguments.seed, rtol=arguments.rtol, atol=arguments.atol,
+                          trace_dir=arguments.trace_dir)
+    raise SystemExit(0 if all(divergence is None for divergence in results.values()) else 1)
@@ -0,0 +1,54 @@
+import weakref
+import numpy as np
+from .Stencil import Stencil
+
+
+class NeighborTable:
+    """
+    Precomputed neighbors of every cell of a grid, for the per-cell (Particle) update.
+
+    `index` is a read-only int32 array of shape (x, y, z, 6): entry (i, j, k, n) is the flat (C order) index of
+    the n-th neighbor of cell (i, j, k), in Stencil.OFFSETS order (left, right, up, down, below, above), or
+    SENTINEL where that neighbor is outside the grid. The array-based updates gather their neighbors with
+    shifted arrays (see Stencil) and do not need the table.
+
+    Use `NeighborTable.get` to share a table between the World instances of a grid size; it is freed once none
+    of them uses it any more.
+    """
+
+    SENTINEL = -1  # Index of a neighbor outside the grid
+    _tables = weakref.WeakValueDictionary()  # Tables in use, keyed by grid size
+
+    def __init__(self, grid_size):
+        """
+        Build the NeighborTable.
+
+        Args:
+            grid_size (tuple): Dimensions of the grid (x, y, z).
+        """
+        self.grid_size = tuple(grid_size)
+        cells = np.indices(self.grid_size)  # (3, x, y, z)
+        offsets = np.array(Stencil.OFFSETS).reshape(len(Stencil.OFFSETS), 3, 1, 1, 1)
+        neighbors = cells + offsets  # (6, 3, x, y, z)
+        size = np.array(self.grid_size).reshape(3, 1, 1, 1)
+        exists = ((neighbors >= 0) & (neighbors < size)).all(axis=1)
+        flat = np.ravel_multi_index(tuple(neighbors.swapaxes(0, 1)), self.grid_size, mode="clip")
+        self.index = np.where(exists, flat, self.SENTINEL).astype(np.int32).transpose(1, 2, 3, 0).copy()
+        self.index.setflags(write=False)
+
+    @classmethod
+    def get(cls, grid_size):
+        """
+        Get the shared NeighborTable of a grid size, creating it if no World uses one.
+
+        Args:
+            grid_size (tuple): Dimensions of the grid (x, y, z).
+
+        Returns:
+            NeighborTable: The shared table.
+        """
+        key = tuple(grid_size)
+        table = cls._tables.get(key)
+        if table is None:
+            table = cls._tables[key] = cls(key)
+        return table
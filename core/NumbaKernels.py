@@ -0,0 +1,697 @@
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # Numba is optional; World falls back to the NumPy engine without it
+    numba = None
+
+
+NUMBA_AVAILABLE = numba is not None
+prange = numba.prange if NUMBA_AVAILABLE else range
+
+
+def _jit(parallel=False):
+    """
+    Compile a kernel with Numba when it is installed, otherwise leave it as plain Python.
+    """
+    def decorate(function):
+        if not NUMBA_AVAILABLE:
+            return function
+        return numba.njit(cache=True, parallel=parallel)(function)
+    return decorate
+
+
+# Row of each per-cell-type table in the packed table array
+BASELINE_TEMPERATURE, BASELINE_POLLUTION, POLLUTION_WEIGHTS, TEMPERATURE_WEIGHTS, WATER_WEIGHTS, COLLISION_WEIGHTS = range(6)
+TABLES = ("baseline_temperature", "baseline_pollution_level", "pollution_transfer_weights",
+          "temperature_transfer_weights", "water_transfer_weights", "collision_weights")
+
+# Index of each scalar in the packed scalar array
+SCALARS = ("water_transfer_threshold", "water_transfer_rate", "natural_pollution_decay_rate",
+           "natural_temperature_decay_rate", "pollution_diffusion_rate", "temperature_diffusion_rate",
+           "evaporation_point", "evaporation_rate", "freezing_point", "melting_point", "melting_rate",
+           "cloud_saturation_threshold", "ocean_conversion_threshold", "pollution_damage_threshold",
+           "pollution_level_tipping_point", "forest_pollution_absorption_rate", "forest_cooling_effect",
+           "forest_pollution_extinction_point", "forest_temperature_extinction_point",
+           "city_pollution_generation_rate", "city_warming_effect", "city_pollution_extinction_point")
+(WATER_THRESHOLD, WATER_RATE, POLLUTION_DECAY, TEMPERATURE_DECAY, POLLUTION_DIFFUSION, TEMPERATURE_DIFFUSION,
+ EVAPORATION_POINT, EVAPORATION_RATE, FREEZING_POINT, MELTING_POINT, MELTING_RATE, CLOUD_SATURATION,
+ OCEAN_CONVERSION, POLLUTION_DAMAGE, POLLUTION_TIPPING, FOREST_ABSORPTION, FOREST_COOLING,
+ FOREST_POLLUTION_EXTINCTION, FOREST_TEMPERATURE_EXTINCTION, CITY_POLLUTION_RATE, CITY_WARMING,
+ CITY_POLLUTION_EXTINCTION) = range(len(SCALARS))
+SQRT_EXPONENT = len(SCALARS)  # 0.5, passed at run time so that `x ** 0.5` stays a pow() call like in Python
+
+# Neighbor offsets in Stencil.OFFSETS order (left, right, up, down, below, above); even ones come earlier in loop order
+OFFSET_X = np.array([-1, 1, 0, 0, 0, 0], dtype=np.int64)
+OFFSET_Y = np.array([0, 0, -1, 1, 0, 0], dtype=np.int64)
+OFFSET_Z = np.array([0, 0, 0, 0, -1, 1], dtype=np.int64)
+SOURCE_ORDER = np.array([0, 2, 4, 5, 3, 1], dtype=np.int64)  # Order the per-cell loop visits the water sources
+
+# Neighbor subsets (Particle.get_*_neighbors)
+ALL, ABOVE, BELOW, ALIGNED, BELOW_OR_ALIGNED = range(5)
+
+
+def pack(parameters):
+    """
+    Pack the compiled parameters into the arrays the kernels take.
+
+    Args:
+        parameters (Parameters): The compiled simulation parameters.
+
+    Returns:
+        tuple: (scalars, tables) float64 arrays.
+    """
+    scalars = np.array([getattr(parameters, name) for name in SCALARS] + [0.5], dtype=np.float64)
+    tables = np.stack([getattr(parameters, name) for name in TABLES]).astype(np.float64)
+    return scalars, tables
+
+
+########################################################################################################################
+###################################### NEIGHBOR LIST PREDICATES ########################################################
+########################################################################################################################
+
+@_jit()
+def _in_subset(subset, neighbor_elevation, elevation):
+    if subset == ALL:
+        return True
+    if subset == ABOVE:
+        return neighbor_elevation > elevation
+    if subset == BELOW:
+        return neighbor_elevation < elevation
+    if subset == ALIGNED:
+        return neighbor_elevation == elevation
+    return neighbor_elevation <= elevation
+
+
+@_jit()
+def _sea(count, n_type, n_elevation, elevation, subset):
+    """
+    Particle.is_surrounded_by_sea_cells on a neighbor subset.
+    """
+    total = 0
+    sea = 0
+    for n in range(count):
+        if _in_subset(subset, n_elevation[n], elevation):
+            total += 1
+            if n_type[n] == 0 or n_type[n] == 3:
+                sea += 1
+    return sea > total // 2
+
+
+@_jit()
+def _all_of(count, n_type, n_elevation, elevation, subset, a, b, c):
+    """
+    Particle.is_surrounded_by_*_cells: every neighbor of the subset has type a, b or c (True if empty).
+    """
+    for n in range(count):
+        if _in_subset(subset, n_elevation[n], elevation):
+            t = n_type[n]
+            if t != a and t != b and t != c:
+                return False
+    return True
+
+
+@_jit()
+def _lower_than(count, n_type, n_elevation, elevation, subset, a, b, c):
+    """
+    Particle.is_below_sea_level / is_below_ground_level: lower than every neighbor of type a, b or c.
+    """
+    for n in range(count):
+        if _in_subset(subset, n_elevation[n], elevation):
+            t = n_type[n]
+            if (t == a or t == b or t == c) and not elevation < n_elevation[n]:
+                return False
+    return True
+
+
+########################################################################################################################
+###################################### CELL ELEVATION ##################################################################
+########################################################################################################################
+
+@_jit()
+def _wind(count, n_type, n_temperature, n_water, n_elevation, n_direction, temperature, elevation):
+    """
+    Particle.calculate_dynamic_wind_direction.
+    """
+    weighted_dx = 0.0
+    weighted_dy = 0.0
+    weighted_dz = 0.0
+    total_influence = 0.0
+    for n in range(count):
+        t = n_type[n]
+        if t != 2 and t != 6 and t != 7:  # Cloud, Air, Rain
+            continue
+        difference = n_temperature[n] - temperature
+        temperature_influence = (0.0 if 0 > difference else difference) / 10.0
+        altitude = elevation - n_elevation[n]
+        altitude_influence = (altitude if altitude > 0 else 0) / 100.0
+        influence = n_water[n] + temperature_influence + altitude_influence
+        weighted_dx += n_direction[n, 0] * influence
+        weighted_dy += n_direction[n, 1] * influence
+        weighted_dz += n_direction[n, 2] * influence
+        total_influence += influence
+
+    if total_influence > 0:
+        return (int(np.rint(weighted_dx / total_influence)), int(np.rint(weighted_dy / total_influence)),
+                int(np.rint(weighted_dz / total_influence)))
+    return 0, 0, 0
+
+
+@_jit()
+def _go_up(count, n_type, n_temperature, n_water, n_elevation, n_direction, temperature, elevation):
+    dx, dy, _ = _wind(count, n_type, n_temperature, n_water, n_elevation, n_direction, temperature, elevation)
+    return dx, dy, 1
+
+
+@_jit()
+def _absorb_water_mass(count, n_type, n_water, water_mass, scalars, tables):
+    """
+    Particle.absorb_water_mass.
+    """
+    for n in range(count):
+        difference = n_water[n] - water_mass
+        if abs(difference) > scalars[WATER_THRESHOLD]:
+            water_mass += difference * tables[WATER_WEIGHTS, n_type[n]] * scalars[WATER_RATE]
+    return water_mass
+
+
+########################################################################################################################
+###################################### CELL UPDATES ####################################################################
+########################################################################################################################
+
+@_jit()
+def _decay_and_equilibrate(cell_type, temperature, pollution_level, count, n_type, n_temperature, n_pollution,
+                           scalars, tables):
+    """
+    Particle._apply_natural_decay, equilibrate_temperature and equilibrate_pollution_level.
+    """
+    pollution_decay_rate = scalars[POLLUTION_DECAY] * 0.5
+    temperature_decay_rate = scalars[TEMPERATURE_DECAY] * 0.5
+    pollution_diffusion_rate = scalars[POLLUTION_DIFFUSION]
+    temperature_diffusion_rate = scalars[TEMPERATURE_DIFFUSION]
+
+    # Step 1: Apply non-linear decay for pollution
+    if pollution_level > 1:
+        pollution_level -= np.sqrt(pollution_level) * pollution_decay_rate
+
+    # Step 2: Temperature decay with a threshold
+    baseline_temperature = tables[BASELINE_TEMPERATURE, cell_type]
+    difference = temperature - baseline_temperature
+    magnitude = abs(difference)
+    if magnitude > 5:
+        temperature -= (difference / magnitude) * magnitude ** scalars[SQRT_EXPONENT] * temperature_decay_rate
+
+    # Step 3: Amplify neighbor influences
+    weighted_pollution_influence = 0.0
+    weighted_temperature_influence = 0.0
+    total_pollution_weight = 0.0
+    total_temperature_weight = 0
+    for n in range(count):
+        pollution_weight = tables[POLLUTION_WEIGHTS, n_type[n]]
+        total_pollution_weight += pollution_weight
+        weighted_pollution_influence += (n_pollution[n] - pollution_level) * pollution_diffusion_rate * pollution_weight
+        total_temperature_weight += 1
+        weighted_temperature_influence += (n_temperature[n] - temperature) * temperature_diffusion_rate
+    if total_pollution_weight > 0:
+        pollution_level += weighted_pollution_influence / total_pollution_weight
+    if total_temperature_weight > 0:
+        temperature += weighted_temperature_influence / total_temperature_weight
+
+    # Step 4: Enforce realistic bounds
+    pollution_level = pollution_level if pollution_level > 0 else 0.0
+    upper = baseline_temperature + 100
+    temperature = upper if upper < temperature else temperature
+    lower = baseline_temperature - 100
+    temperature = temperature if temperature > lower else lower
+
+    # Equilibrate with the weighted neighbor averages
+    weighted_sum = 0.0
+    total_weight = 0.0
+    for n in range(count):
+        weight = tables[TEMPERATURE_WEIGHTS, n_type[n]]
+        weighted_sum += n_temperature[n] * weight
+        total_weight += weight
+    if total_weight > 0:
+        temperature = (weighted_sum / total_weight + temperature) / 2
+
+    weighted_sum = 0.0
+    total_weight = 0.0
+    for n in range(count):
+        weight = tables[POLLUTION_WEIGHTS, n_type[n]]
+        weighted_sum += n_pollution[n] * weight
+        total_weight += weight
+    if total_weight > 0:
+        pollution_level = (weighted_sum / total_weight + pollution_level) / 2
+
+    return temperature, pollution_level
+
+
+@_jit()
+def _apply_type_rules(cell_type, temperature, water_mass, pollution_level, dx, dy, dz, elevation, height,
+                      count, n_type, n_temperature, n_water, n_elevation, n_direction, scalars, tables):
+    """
+    Particle.apply_type_rules for one cell and its neighbor list.
+
+    Returns:
+        tuple: (cell_type, temperature, water_mass, pollution_level, dx, dy, dz) after the rules.
+    """
+    e = elevation
+    if cell_type == 0:  # Ocean
+        dx, dy, _ = _wind(count, n_type, n_temperature, n_water, n_elevation, n_direction, temperature, e)
+        dz = 0
+        if e >= 0:  # Ocean cells tend to move downward
+            dx, dy, _ = _wind(count, n_type, n_temperature, n_water, n_elevation, n_direction, temperature, e)
+            dz = -1
+        if _sea(count, n_type, n_elevation, e, BELOW) and temperature > scalars[EVAPORATION_POINT] - 5:
+            water_mass -= scalars[EVAPORATION_RATE]
+            if water_mass <= 0:
+                water_mass = _absorb_water_mass(count, n_type, n_water, water_mass, scalars, tables)
+                cell_type = 6
+                water_mass = water_mass - 0.5 if water_mass - 0.5 > 0.0 else 0.0
+                temperature += 2
+                dx, dy, dz = _go_up(count, n_type, n_temperature, n_water, n_elevation, n_direction, temperature, e)
+        elif (temperature < scalars[FREEZING_POINT] - 1
+              and not _all_of(count, n_type, n_elevation, e, ABOVE, 1, 4, 5)
+              and not _all_of(count, n_type, n_elevation, e, ALIGNED, 1, 4, 5)
+              and (_sea(count, n_type, n_elevation, e, BELOW_OR_ALIGNED) or _sea(count, n_type, n_elevation, e, ABOVE))):
+            cell_type, water_mass, temperature = 3, 1.0, scalars[FREEZING_POINT]
+            dx, dy, dz = 0, 0, 0
+
+    elif cell_type == 1:  # Desert
+        forest_baseline_temperature = tables[BASELINE_TEMPERATURE, 4]
+        if water_mass > scalars[OCEAN_CONVERSION] and (
+                _sea(count, n_type, n_elevation, e, ALIGNED) or _sea(count, n_type, n_elevation, e, BELOW)):
+            cell_type, water_mass, temperature = 0, 1.0, tables[BASELINE_TEMPERATURE, 0]
+        elif (_all_of(count, n_type, n_elevation, e, ALIGNED, 1, 4, 5)
+              and pollution_level <= scalars[POLLUTION_DAMAGE]
+              and forest_baseline_temperature - 10 <= temperature <= forest_baseline_temperature + 10
+              and _all_of(count, n_type, n_elevation, e, ABOVE, 6, 6, 6)
+              and _all_of(count, n_type, n_elevation, e, BELOW, 1, 1, 1)
+              and (_all_of(count, n_type, n_elevation, e, ALIGNED, 1, 1, 1)
+                   or _all_of(count, n_type, n_elevation, e, ALIGNED, 4, 4, 4))
+              and not (_all_of(count, n_type, n_elevation, e, BELOW, 5, 5, 5)
+                       or _all_of(count, n_type, n_elevation, e, BELOW, 4, 4, 4)
+                       or _sea(count, n_type, n_elevation, e, ABOVE))):
+            cell_type, water_mass, temperature = 4, 0.0, tables[BASELINE_TEMPERATURE, 4]
+            dx, dy, dz = 0, 0, 0
+
+    elif cell_type == 2:  # Cloud
+        water_mass = _absorb_water_mass(count, n_type, n_water, water_mass, scalars, tables)
+        if ((_all_of(count, n_type, n_elevation, e, BELOW, 1, 4, 5) or _sea(count, n_type, n_elevation, e, BELOW))
+                and (_all_of(count, n_type, n_elevation, e, ALIGNED, 1, 4, 5)
+                     or _sea(count, n_type, n_elevation, e, ALIGNED))):
+            dx, dy, dz = _go_up(count, n_type, n_temperature, n_water, n_elevation, n_direction, temperature, e)
+        elif water_mass >= scalars[CLOUD_SATURATION]:
+            cell_type, water_mass = 7, 1.0
+            temperature -= 1
+            dx, dy, dz = 0, 0, -1
+        else:
+            dx, dy, dz = _wind(count, n_type, n_temperature, n_water, n_elevation, n_direction, temperature, e)
+
+    elif cell_type == 3:  # Ice
+        if temperature > scalars[MELTING_POINT] - 5:
+            water_mass -= scalars[MELTING_RATE]
+            if water_mass <= 0 and (_sea(count, n_type, n_elevation, e, ALIGNED)
+                                    or _lower_than(count, n_type, n_elevation, e, ABOVE, 0, 3, 3)
+                                    or _sea(count, n_type, n_elevation, e, BELOW)):
+                cell_type, water_mass, temperature = 0, 1.0, tables[BASELINE_TEMPERATURE, 0]
+        elif (_all_of(count, n_type, n_elevation, e, ALIGNED, 1, 4, 5)
+              or _all_of(count, n_type, n_elevation, e, ABOVE, 1, 4, 5)):
+            cell_type, water_mass, temperature = 1, 0.0, tables[BASELINE_TEMPERATURE, 1]
+            dx, dy, dz = 0, 0, 0
+
+    elif cell_type == 4:  # Forest
+        absorption_rate = scalars[FOREST_ABSORPTION]
+        cooling_effect = scalars[FOREST_COOLING]
+        forest_baseline_temperature = int(tables[BASELINE_TEMPERATURE, 4])
+        if pollution_level > scalars[POLLUTION_TIPPING]:
+            absorption_rate *= 0.5  # Reduced absorption under high pollution
+            cooling_effect *= 0.5  # Reduced cooling effect under high pollution
+        absorbed = pollution_level - absorption_rate * pollution_level
+        pollution_level = absorbed if absorbed > 0 else 0.0
+        temperature -= temperature * cooling_effect
+
+        if _sea(count, n_type, n_elevation, e, ABOVE) or _sea(count, n_type, n_elevation, e, BELOW):
+            cell_type, water_mass, temperature = 0, 1.0, tables[BASELINE_TEMPERATURE, 0]
+        elif water_mass > scalars[OCEAN_CONVERSION] and _sea(count, n_type, n_elevation, e, ALIGNED):
+            cell_type, water_mass, temperature = 0, 1.0, tables[BASELINE_TEMPERATURE, 0]
+        elif ((temperature >= scalars[FOREST_TEMPERATURE_EXTINCTION]
+               or pollution_level >= scalars[FOREST_POLLUTION_EXTINCTION])
+              and _all_of(count, n_type, n_elevation, e, ABOVE, 1, 4, 5)):
+            cell_type, water_mass, temperature = 1, 0.0, tables[BASELINE_TEMPERATURE, 1]
+            dx, dy, dz = 0, 0, 0
+        elif (pollution_level < scalars[POLLUTION_DAMAGE]
+              and forest_baseline_temperature - 10 <= temperature <= forest_baseline_temperature + 10
+              and (_all_of(count, n_type, n_elevation, e, ALIGNED, 1, 1, 1)
+                   or _all_of(count, n_type, n_elevation, e, ALIGNED, 5, 5, 5)
+                   or _all_of(count, n_type, n_elevation, e, ALIGNED, 4, 4, 4))
+              and not (_all_of(count, n_type, n_elevation, e, BELOW, 5, 5, 5)
+                       or _all_of(count, n_type, n_elevation, e, BELOW, 4, 4, 4)
+                       or _sea(count, n_type, n_elevation, e, BELOW))):
+            cell_type, water_mass = 5, 0.0
+            pollution_level = tables[BASELINE_POLLUTION, 5]
+            temperature = tables[BASELINE_TEMPERATURE, 5]
+            dx, dy, dz = 0, 0, 0
+
+    elif cell_type == 5:  # City
+        extinction_point = scalars[CITY_POLLUTION_EXTINCTION]
+        warmed = temperature + scalars[CITY_WARMING] * temperature
+        warmed = warmed if warmed > tables[BASELINE_TEMPERATURE, 5] else tables[BASELINE_TEMPERATURE, 5]
+        temperature = warmed if warmed < extinction_point else extinction_point
+        polluted = pollution_level + scalars[CITY_POLLUTION_RATE] * pollution_level
+        polluted = polluted if polluted > tables[BASELINE_POLLUTION, 5] else tables[BASELINE_POLLUTION, 5]
+        pollution_level = polluted if polluted < extinction_point else extinction_point
+
+        if _sea(count, n_type, n_elevation, e, ABOVE) or _sea(count, n_type, n_elevation, e, BELOW):
+            cell_type, water_mass, temperature = 0, 1.0, tables[BASELINE_TEMPERATURE, 0]
+        elif water_mass > scalars[OCEAN_CONVERSION] and _sea(count, n_type, n_elevation, e, ALIGNED):
+            cell_type, water_mass, temperature = 0, 1.0, tables[BASELINE_TEMPERATURE, 0]
+        elif (pollution_level >= extinction_point or temperature >= abs(extinction_point)
+              or _sea(count, n_type, n_elevation, e, ABOVE)):
+            cell_type, water_mass, temperature = 1, 0.0, tables[BASELINE_TEMPERATURE, 1]
+            dx, dy, dz = 0, 0, 0
+
+    elif cell_type == 6:  # Air
+        rain_above = False
+        rain_below = False
+        isolated = True
+        for n in range(count):
+            if n_type[n] == 7:
+                rain_above = rain_above or n_elevation[n] > e
+                rain_below = rain_below or n_elevation[n] < e
+            if tables[POLLUTION_WEIGHTS, n_type[n]] != 0.0:
+                isolated = False
+
+        water_mass = _absorb_water_mass(count, n_type, n_water, water_mass, scalars, tables)
+        dx, dy, dz = _wind(count, n_type, n_temperature, n_water, n_elevation, n_direction, temperature, e)
+
+        if (water_mass >= scalars[CLOUD_SATURATION] and _all_of(count, n_type, n_elevation, e, BELOW, 2, 2, 2)
+                and e >= height // 2):
+            cell_type = 2
+            water_mass = water_mass + 0.5 if water_mass + 0.5 < 1.0 else 1.0
+            temperature -= 2
+            dx, dy, dz = _go_up(count, n_type, n_temperature, n_water, n_elevation, n_direction, temperature, e)
+        elif (temperature < tables[BASELINE_TEMPERATURE, 8] + 10 and water_mass < 0.01 and pollution_level < 0.1
+              and dx == 0 and dy == 0 and dz == 0 and isolated):
+            cell_type, water_mass, pollution_level = 8, 0.0, 0.0
+            temperature = tables[BASELINE_TEMPERATURE, 8]
+            dx, dy, dz = 0, 0, 0
+        elif rain_above:
+            if e >= 0:
+                dx, dy, _ = _wind(count, n_type, n_temperature, n_water, n_elevation, n_direction, temperature, e)
+                dz = -1
+        elif (e <= 2 or rain_below or _lower_than(count, n_type, n_elevation, e, ALL, 1, 4, 5)
+              or _lower_than(count, n_type, n_elevation, e, ALL, 0, 3, 3)):
+            dx, dy, dz = _go_up(count, n_type, n_temperature, n_water, n_elevation, n_direction, temperature, e)
+
+    elif cell_type == 7:  # Rain
+        water_mass = _absorb_water_mass(count, n_type, n_water, water_mass, scalars, tables)
+        if e > 0:
+            dx, dy, dz = 0, 0, -1
+        elif _sea(count, n_type, n_elevation, e, BELOW):
+            cell_type, water_mass, temperature = 0, 1.0, tables[BASELINE_TEMPERATURE, 0]
+        elif _all_of(count, n_type, n_elevation, e, BELOW, 1, 4, 5):
+            cell_type = 6
+            water_mass = water_mass - 0.5 if water_mass - 0.5 > 0.0 else 0.0
+            temperature += 2
+            dx, dy, dz = _go_up(count, n_type, n_temperature, n_water, n_elevation, n_direction, temperature, e)
+
+    elif cell_type == 8:  # Vacuum is refilled by air
+        cell_type = 6
+        water_mass = water_mass - 0.5 if water_mass - 0.5 > 0.0 else 0.0
+        temperature += 2
+        dx, dy, dz = _wind(count, n_type, n_temperature, n_water, n_elevation, n_direction, temperature, e)
+
+    return cell_type, temperature, water_mass, pollution_level, dx, dy, dz
+
+
+########################################################################################################################
+###################################### GRID PHASES #####################################################################
+########################################################################################################################
+
+@_jit(parallel=True)
+def water_transfers(cell_type, water_mass, scalars, tables):
+    """
+    Phases 1-2: every cell receives water from its non-vacuum neighbors (see WaterFlux).
+
+    Returns:
+        np.ndarray: The water mass after the transfers.
+    """
+    size_x, size_y, size_z = cell_type.shape
+    result = np.empty_like(water_mass)
+    for i in prange(size_x):
+        for j in range(size_y):
+            for k in range(size_z):
+                own = water_mass[i, j, k]
+                weight = tables[WATER_WEIGHTS, cell_type[i, j, k]]
+                received = 0.0
+                touched = False
+                for n in SOURCE_ORDER:
+                    si, sj, sk = i + OFFSET_X[n], j + OFFSET_Y[n], k + OFFSET_Z[n]
+                    if si < 0 or si >= size_x or sj < 0 or sj >= size_y or sk < 0 or sk >= size_z:
+                        continue
+                    if cell_type[si, sj, sk] == 8:  # Vacuum does not transfer water
+                        continue
+                    difference = own - water_mass[si, sj, sk]
+                    if abs(difference) > scalars[WATER_THRESHOLD]:
+                        amount = difference * weight * scalars[WATER_RATE]
+                        if abs(amount) > 1e3:
+                            amount = amount / 1e3
+                        received += amount
+                        touched = True
+                if touched:
+                    transferred = own + received
+                    transferred = transferred if transferred < 1.0 else 1.0
+                    result[i, j, k] = transferred if transferred > 0.0 else 0.0
+                else:
+                    result[i, j, k] = own
+    return result
+
+
+@_jit()
+def _prepass_type(cell_type, i, j, k):
+    """
+    Type of a cell after the rain pre-pass: rain right above ground is absorbed and turns into air.
+    """
+    t = cell_type[i, j, k]
+    if t == 7 and k > 0:
+        below = cell_type[i, j, k - 1]
+        if below == 1 or below == 4 or below == 5:
+            return 6
+    return t
+
+
+@_jit()
+def _hands_down(cell_type, i, j, k):
+    """
+    True if the cell is rain that hands its water to the cell below in the rain pre-pass.
+    """
+    if cell_type[i, j, k] != 7 or k == 0:
+        return False
+    return _prepass_type(cell_type, i, j, k) == 6 or _prepass_type(cell_type, i, j, k - 1) == 6
+
+
+@_jit(parallel=True)
+def rain_prepass(cell_type, water_mass):
+    """
+    Rain handling at the start of Phase 3 (see World._rain_prepass).
+
+    Returns:
+        tuple: (cell_type, water_mass, water_mass_seen, falling) arrays after the pre-pass.
+    """
+    size_x, size_y, size_z = cell_type.shape
+    next_type = np.empty_like(cell_type)
+    own_water = np.empty_like(water_mass)
+    water_seen = np.empty_like(water_mass)
+    falling = np.zeros(cell_type.shape, dtype=np.int64)
+    for i in prange(size_x):
+        for j in range(size_y):
+            for k in range(size_z):
+                t = _prepass_type(cell_type, i, j, k)
+                next_type[i, j, k] = t
+                hands_down = _hands_down(cell_type, i, j, k)
+                feeds_air = hands_down and t == 7
+                if cell_type[i, j, k] == 7 and not hands_down:
+                    falling[i, j, k] = 1
+                own = 0.0 if feeds_air else water_mass[i, j, k]
+                own_water[i, j, k] = own
+                if k + 1 < size_z and _hands_down(cell_type, i, j, k + 1):
+                    water_seen[i, j, k] = own + water_mass[i, j, k + 1]
+                else:
+                    water_seen[i, j, k] = own
+    return next_type, own_water, water_seen, falling
+
+
+@_jit(parallel=True)
+def update_cells(cell_type, temperature, water_mass, pollution_level, direction,
+                 next_type, own_water, water_seen, falling, scalars, tables):
+    """
+    Phase 3: decay, equilibration and type rules of every cell.
+
+    Cells earlier in loop order (left, up, below) are seen after their rain pre-pass and later ones before it,
+    exactly like in the per-cell loop of World.update_cells_on_grid.
+
+    Returns:
+        tuple: (cell_type, temperature, water_mass, pollution_level, direction, elevation) after the rules.
+    """
+    size_x, size_y, size_z = cell_type.shape
+    out_type = np.empty_like(cell_type)
+    out_temperature = np.empty_like(temperature)
+    out_water = np.empty_like(water_mass)
+    out_pollution = np.empty_like(pollution_level)
+    out_direction = np.empty_like(direction)
+    elevation = np.empty(cell_type.shape, dtype=np.int64)
+
+    for i in prange(size_x):
+        # Neighbor list of the current cell, reused for the whole slab
+        n_type = np.empty(6, dtype=np.int64)
+        n_temperature = np.empty(6, dtype=np.float64)
+        n_water = np.empty(6, dtype=np.float64)
+        n_pollution = np.empty(6, dtype=np.float64)
+        n_elevation = np.empty(6, dtype=np.int64)
+        n_direction = np.empty((6, 3), dtype=np.int64)
+
+        for j in range(size_y):
+            for k in range(size_z):
+                t = np.int64(next_type[i, j, k])
+                e = k - falling[i, j, k]
+                count = 0
+                for n in range(6):
+                    si, sj, sk = i + OFFSET_X[n], j + OFFSET_Y[n], k + OFFSET_Z[n]
+                    if si < 0 or si >= size_x or sj < 0 or sj >= size_y or sk < 0 or sk >= size_z:
+                        continue
+                    if n % 2 == 0:  # Already visited in loop order
+                        neighbor_type = np.int64(next_type[si, sj, sk])
+                        n_water[count] = water_seen[si, sj, sk]
+                        n_elevation[count] = sk - falling[si, sj, sk]
+                    else:
+                        neighbor_type = np.int64(cell_type[si, sj, sk])
+                        n_water[count] = water_mass[si, sj, sk]
+                        n_elevation[count] = sk
+                    if t != 8 and neighbor_type == 8:  # Vacuum neighbors only count for vacuum cells
+                        continue
+                    n_type[count] = neighbor_type
+                    n_temperature[count] = temperature[si, sj, sk]
+                    n_pollution[count] = pollution_level[si, sj, sk]
+                    for axis in range(3):
+                        n_direction[count, axis] = direction[axis, si, sj, sk]
+                    count += 1
+
+                cell_temperature = temperature[i, j, k]
+                cell_pollution = pollution_level[i, j, k]
+                if t != 8:
+                    cell_temperature, cell_pollution = _decay_and_equilibrate(
+                        t, cell_temperature, cell_pollution, count, n_type, n_temperature, n_pollution, scalars, tables)
+
+                (out_t, out_temperature[i, j, k], out_water[i, j, k], out_pollution[i, j, k],
+                 dx, dy, dz) = _apply_type_rules(
+                    t, cell_temperature, own_water[i, j, k], cell_pollution,
+                    np.int64(direction[0, i, j, k]), np.int64(direction[1, i, j, k]), np.int64(direction[2, i, j, k]),
+                    e, size_z, count, n_type, n_temperature, n_water, n_elevation, n_direction, scalars, tables)
+                out_type[i, j, k] = out_t
+                out_direction[0, i, j, k] = dx
+                out_direction[1, i, j, k] = dy
+                out_direction[2, i, j, k] = dz
+                elevation[i, j, k] = e
+
+    return out_type, out_temperature, out_water, out_pollution, out_direction, elevation
+
+
+@_jit()
+def _existing_wins(existing_type, existing_water, incoming_type, incoming_water, tables):
+    """
+    World._resolve_collision: True if the cell already at the target is kept.
+    """
+    if existing_type == 6 and incoming_type == 6:
+        return existing_water >= incoming_water
+    if existing_type == 8 and (incoming_type == 2 or incoming_type == 6):
+        return False
+    if incoming_type == 8 and (existing_type == 2 or existing_type == 6):
+        return True
+    if existing_type == 7 and (incoming_type == 6 or incoming_type == 8):
+        return True
+    if incoming_type == 7 and (existing_type == 6 or existing_type == 8):
+        return False
+    if existing_type == 7 and incoming_type == 7:
+        return existing_water > incoming_water
+    if existing_type == 6 and incoming_type == 2:
+        return False
+    if existing_type == 2 and incoming_type == 6:
+        return True
+    return tables[COLLISION_WEIGHTS, existing_type] >= tables[COLLISION_WEIGHTS, incoming_type]
+
+
+@_jit()
+def advect(cell_type, temperature, water_mass, pollution_level, direction, elevation, tables):
+    """
+    Phases 4-5: move cloud, air and rain cells and resolve collisions in loop order (see Advection).
+
+    This phase is a sequential fold over the cells, so it runs on one thread.
+
+    Returns:
+        tuple: (cell_type, temperature, water_mass, pollution_level, direction) of the new grid.
+    """
+    size_x, size_y, size_z = cell_type.shape
+    occupant = np.full(cell_type.shape, -1, dtype=np.int64)
+    flat_type = cell_type.reshape(-1)
+    flat_water = water_mass.reshape(-1)
+    source = 0
+    for i in range(size_x):
+        for j in range(size_y):
+            for k in range(size_z):
+                t = flat_type[source]
+                if t == 2 or t == 6 or t == 7:
+                    dx, dy, dz = direction[0, i, j, k], direction[1, i, j, k], direction[2, i, j, k]
+                    e = elevation[i, j, k]
+                    if dx == 0 and dy == 0 and dz == 0:
+                        ti, tj, tk = i, j, e
+                    else:
+                        ti, tj = (i + dx) % size_x, (j + dy) % size_y
+                        tk = min(max(e + dz, 0), size_z - 1)
+                    target = source + ((ti - i) * size_y + (tj - j)) * size_z + (tk - k)
+                    ti, tk = target // (size_y * size_z), target % size_z
+                    tj = (target // size_z) % size_y
+                    existing = occupant[ti, tj, tk]
+                    if existing == -1 or not _existing_wins(
+                            flat_type[existing], flat_water[existing], t, flat_water[source], tables):
+                        occupant[ti, tj, tk] = source
+                else:
+                    occupant[i, j, k] = source  # A static cell replaces anything that moved there earlier
+                source += 1
+
+    new_type = np.full_like(cell_type, 8)
+    new_temperature = np.zeros_like(temperature)
+    new_water = np.zeros_like(water_mass)
+    new_pollution = np.zeros_like(pollution_level)
+    new_direction = np.zeros_like(direction)
+    flat_temperature = temperature.reshape(-1)
+    flat_pollution = pollution_level.reshape(-1)
+    for i in range(size_x):
+        for j in range(size_y):
+            for k in range(size_z):
+                winner = occupant[i, j, k]
+                if winner == -1:
+                    continue  # Nobody moved here: empty vacuum
+                wi, wk = winner // (size_y * size_z), winner % size_z
+                wj = (winner // size_z) % size_y
+                new_type[i, j, k] = flat_type[winner]
+                new_temperature[i, j, k] = flat_temperature[winner]
+                new_water[i, j, k] = flat_water[winner]
+                new_pollution[i, j, k] = flat_pollution[winner]
+                for axis in range(3):
+                    new_direction[axis, i, j, k] = direction[axis, wi, wj, wk]
+    return new_type, new_temperature, new_water, new_pollution, new_direction
+
+
+def step(cell_type, temperature, water_mass, pollution_level, direction, scalars, tables):
+    """
+    Run one full daily update on the state arrays.
+
+    Returns:
+        tuple: (cell_type, temperature, water_mass, pollution_level, direction) of the next day.
+    """
+    water_mass = water_transfers(cell_type, water_mass, scalars, tables)
+    next_type, own_water, water_seen, falling = rain_prepass(cell_type, water_mass)
+    updated = update_cells(cell_type, temperature, water_mass, pollution_level, direction,
+                           next_type, own_water, water_seen, falling, scalars, tables)
+    return advect(*updated, tables)
@@ -5,11 +5,16 @@ import logging
 class Particle:
     """
     Represents a single particle (or cell) in the simulation grid. Each particle has attributes such as type,
-    temperature, water mass, pollution level, direction, position, and the grid size.
+    temperature, water mass, pollution level, direction and position.
 
     This class provides methods for updating particle state, calculating movement, and visualizing the particle.
+    Particles use `__slots__` and keep no reference to the grid or the configuration: the grid size is passed
+    to the methods that need it, and the compiled parameters are shared by all particles.
     """
-    def __init__(self, cell_type, temperature, water_mass, pollution_level, direction, position, grid_size):
+
+    __slots__ = ("cell_type", "temperature", "water_mass", "pollution_level", "direction", "position")
+
+    def __init__(self, cell_type, temperature, water_mass, pollution_level, direction, position):
         """
         Initializes a Particle object with specified attributes.
 
@@ -20,7 +25,6 @@ class Particle:
             pollution_level (float): Pollution level of the cell.
             direction (tuple): Direction of movement as a 3D vector (dx, dy, dz).
             position (tuple): Current position of the cell in the grid (x, y, z).
-            grid_size (tuple): Dimensions of the simulation grid (x_max, y_max, z_max).
         """
         self.cell_type = cell_type
         self.temperature = temperature
@@ -28,8 +32,27 @@ class Particle:
         self.pollution_level = pollution_level
         self.direction = direction
         self.position = position  # Particle's current position in the grid
-        self.grid_size = grid_size  # Grid boundaries to manage particle movement
-        self.config = config_instance.get()  # Access the centralized configuration
+
+    @property
+    def parameters(self):
+        """
+        The compiled numeric parameters, shared by all particles (not stored per instance).
+        """
+        return config_instance.get_parameters()
+
+    @staticmethod
+    def vacuum():
+        """
+        Get the shared, immutable Vacuum particle.
+
+        All empty cells that need no position of their own (e.g. the cells left empty after movement) share this
+        one instance instead of allocating a Particle each. It cannot be modified; use `clone()` to get a
+        mutable copy.
+
+        Returns:
+            Particle: The Vacuum flyweight (cell_type 8, no temperature, water or pollution, no position).
+        """
+        return _VACUUM
 
     ####################################################################################################################
     ###################################### CLASS UTILS #################################################################
@@ -48,16 +71,18 @@ class Particle:
             water_mass=self.water_mass,
             pollution_level=self.pollution_level,
             direction=self.direction,
-            position=self.position,
-            grid_size=self.grid_size
+            position=self.position
         )
 
-    def get_next_position(self):
+    def get_next_position(self, grid_size):
         """
         Calculates the next position of the particle based on its direction and grid size.
         If the particle moves beyond the grid boundaries in the x or y directions, it wraps around (toroidal grid).
         In the z-direction, movement is clamped to remain within the grid's height.
 
+        Args:
+            grid_size (tuple): Dimensions of the simulation grid (x_max, y_max, z_max).
+
         Returns:
             tuple: The new position of the particle (x, y, z).
         """
@@ -68,10 +93,10 @@ class Particle:
         dx, dy, dz = self.direction
 
         # Wrap x and y positions (toroidal grid behavior)
-        new_x = (x + dx) % self.grid_size[0]
-        new_y = (y + dy) % self.grid_size[1]
+        new_x = (x + dx) % grid_size[0]
+        new_y = (y + dy) % grid_size[1]
         # Clamp z position (within grid height)
-        new_z = max(0, min(self.grid_size[2] - 1, z + dz))
+        new_z = max(0, min(grid_size[2] - 1, z + dz))
 
         return (new_x, new_y, new_z)
 
@@ -95,6 +120,7 @@ class Particle:
         Returns:
             tuple: RGBA color with light tint applied.
         """
+        parameters = self.parameters
         base_color = self.get_base_color()
         if base_color is None or len(base_color) != 4:
             logging.info(f"Invalid base color for cell_type {self.cell_type}: {base_color}")
@@ -105,8 +131,8 @@ class Particle:
             return base_color
 
         # Get baseline pollution and temperature
-        baseline_pollution_lvl = self.config["baseline_pollution_level"][self.cell_type]
-        baseline_temperature = self.config["baseline_temperature"][self.cell_type]
+        baseline_pollution_lvl = parameters.per_cell.baseline_pollution_level[self.cell_type]
+        baseline_temperature = parameters.per_cell.baseline_temperature[self.cell_type]
 
         # Compute pollution and temperature intensities
         pollution_intensity = (
@@ -181,7 +207,7 @@ class Particle:
         Returns:
             tuple: RGBA base color of the particle.
         """
-        base_color = self.config["base_colors"].get(self.cell_type)
+        base_color = tuple(self.parameters.base_colors[self.cell_type].tolist())
         if base_color is None:
             logging.info(f"Base color for cell_type {self.cell_type} is not defined.")
         # Default to white color if the cell type is undefined
@@ -193,17 +219,17 @@ class Particle:
 
         Returns a dictionary mapping the positions of neighboring cells to the amount of water transferred.
         """
+        parameters = self.parameters
         transfer_map = {}
         for neighbor in neighbors:
-            if neighbor.cell_type in self.config["cell_type_water_transfer_weights"]:
-                diff = neighbor.water_mass - self.water_mass
-                transfer_weight = self.config["cell_type_water_transfer_weights"][neighbor.cell_type]
+            diff = neighbor.water_mass - self.water_mass
+            transfer_weight = parameters.per_cell.water_transfer_weights[neighbor.cell_type]
 
-                if abs(diff) > self.config["water_transfer_threshold"]:
-                    # Compute weighted transfer amount
-                    transfer_amount = diff * transfer_weight * \
-                        self.config["water_transfer_rate"]
-                    transfer_map[neighbor.position] = transfer_amount
+            if abs(diff) > parameters.water_transfer_threshold:
+                # Compute weighted transfer amount
+                transfer_amount = diff * transfer_weight * \
+                    parameters.water_transfer_rate
+                transfer_map[neighbor.position] = transfer_amount
 
         return transfer_map
 
@@ -211,7 +237,7 @@ class Particle:
     ###################################### CELL UPDATES: ###############################################################
     ####################################################################################################################
 
-    def compute_next_state(self, neighbors):
+    def compute_next_state(self, neighbors, grid_size):
         """
         Computes the next state of the particle based on its type and interactions with neighboring particles.
 
@@ -223,6 +249,7 @@ class Particle:
 
         Args:
             neighbors (list): List of neighboring particles.
+            grid_size (tuple): Dimensions of the simulation grid (x_max, y_max, z_max).
 
         Returns:
             Particle: The updated particle after applying its next state.
@@ -237,26 +264,36 @@ class Particle:
             new_cell.equilibrate_pollution_level(neighbors)
 
         # Execute specific behavior based on the particle's type
+        new_cell.apply_type_rules(neighbors, grid_size)
+
+        return new_cell
+
+    def apply_type_rules(self, neighbors, grid_size):
+        """
+        Applies the behavior logic specific to the particle's type, in place.
+
+        Args:
+            neighbors (list): List of neighboring particles.
+            grid_size (tuple): Dimensions of the simulation grid (x_max, y_max, z_max).
+        """
         if self.cell_type == 0:  # Ocean
-            new_cell._update_ocean(neighbors)
+            self._update_ocean(neighbors)
         elif self.cell_type == 1:  # Desert
-            new_cell._update_desert(neighbors)
+            self._update_desert(neighbors)
         elif self.cell_type == 2:  # Cloud
-            new_cell._update_cloud(neighbors)
+            self._update_cloud(neighbors)
         elif self.cell_type == 3:  # Ice
-            new_cell._update_ice(neighbors)
+            self._update_ice(neighbors)
         elif self.cell_type == 4:  # Forest
-            new_cell._update_forest(neighbors)
+            self._update_forest(neighbors)
         elif self.cell_type == 5:  # City
-            new_cell._update_city(neighbors)
+            self._update_city(neighbors)
         elif self.cell_type == 6:  # Air
-            new_cell._update_air(neighbors)
+            self._update_air(neighbors, grid_size)
         elif self.cell_type == 7:  # Rain
-            new_cell._update_rain(neighbors)
+            self._update_rain(neighbors)
         elif self.cell_type == 8:  # Vacuum
-            new_cell._update_vacuum(neighbors)
-        
-        return new_cell
+            self._update_vacuum(neighbors)
 
     def _update_ocean(self, neighbors):
         """
@@ -267,6 +304,7 @@ class Particle:
         Args:
             neighbors (list): List of neighboring particles.
         """
+        parameters = self.parameters
         neighbors_above = self.get_above_neighbors(neighbors)
         neighbors_below = self.get_below_neighbors(neighbors)
         neighbors_aligned = self.get_aligned_neighbors(neighbors)
@@ -274,8 +312,8 @@ class Particle:
         self.direction = (dx,dy,0)
         # Ocean cells tend to move downward (e.g., gravity)
         self.go_down(neighbors)
-        if self.is_surrounded_by_sea_cells(neighbors_below) and self.temperature > self.config["evaporation_point"] - 5:
-            evaporation_rate = self.config["evaporation_rate"]
+        if self.is_surrounded_by_sea_cells(neighbors_below) and self.temperature > parameters.evaporation_point - 5:
+            evaporation_rate = parameters.evaporation_rate
             self.water_mass -= evaporation_rate  # Water evaporates
             if self.water_mass <= 0:  # Convert to air if water is fully evaporated
                 self.absorb_water_mass(
@@ -283,7 +321,7 @@ class Particle:
                 self.convert_to_air(neighbors)
 
         # Freeze into ice
-        elif self.temperature < self.config["freezing_point"] - 1 and not self.is_surrounded_by_land_cells(neighbors_above) and not self.is_surrounded_by_land_cells(neighbors_aligned) and (self.is_surrounded_by_sea_cells(neighbors_below+neighbors_aligned) or self.is_surrounded_by_sea_cells(neighbors_above)):
+        elif self.temperature < parameters.freezing_point - 1 and not self.is_surrounded_by_land_cells(neighbors_above) and not self.is_surrounded_by_land_cells(neighbors_aligned) and (self.is_surrounded_by_sea_cells(neighbors_below+neighbors_aligned) or self.is_surrounded_by_sea_cells(neighbors_above)):
             self.convert_to_ice(neighbors)
 
     def _update_cloud(self, neighbors):
@@ -299,7 +337,7 @@ class Particle:
         neighbors_aligned = self.get_aligned_neighbors(neighbors)
         self.absorb_water_mass(
             neighbors)  # Share water with neighboring cells
-        saturation_threshold = self.config["cloud_saturation_threshold"]
+        saturation_threshold = self.parameters.cloud_saturation_threshold
         if (self.is_surrounded_by_land_cells(neighbors_below) or self.is_surrounded_by_sea_cells(neighbors_below)) and (self.is_surrounded_by_land_cells(neighbors_aligned) or self.is_surrounded_by_sea_cells(neighbors_aligned)):
             self.go_up(neighbors)
         elif self.water_mass >= saturation_threshold:  # Convert to rain if saturated
@@ -315,12 +353,13 @@ class Particle:
         Args:
             neighbors (list): List of neighboring particles.
         """
+        parameters = self.parameters
         neighbors_above = self.get_above_neighbors(neighbors)
         neighbors_below = self.get_below_neighbors(neighbors)
         neighbors_aligned = self.get_aligned_neighbors(neighbors)
-        melting_rate = self.config["melting_rate"]
+        melting_rate = parameters.melting_rate
         # Melting conditions
-        if self.temperature > self.config["melting_point"] - 5:
+        if self.temperature > parameters.melting_point - 5:
             self.water_mass -= melting_rate
             # Convert to ocean when melted
             if self.water_mass <= 0 and (self.is_surrounded_by_sea_cells(neighbors_aligned) or self.is_below_sea_level(neighbors_above) or self.is_surrounded_by_sea_cells(neighbors_below)):
@@ -336,13 +375,14 @@ class Particle:
         Args:
             neighbors (list): List of neighboring particles.
         """
+        parameters = self.parameters
         neighbors_above = self.get_above_neighbors(neighbors)
         neighbors_below = self.get_below_neighbors(neighbors)
         neighbors_aligned = self.get_aligned_neighbors(neighbors)
-        pollution_damage_threshold = self.config["pollution_damage_threshold"]
-        forest_baseline_temperature = self.config["baseline_temperature"][4]
+        pollution_damage_threshold = parameters.pollution_damage_threshold
+        forest_baseline_temperature = parameters.per_cell.baseline_temperature[4]
         # Water mass required to convert a cell to ocean
-        ocean_conversion_threshold = self.config["ocean_conversion_threshold"]
+        ocean_conversion_threshold = parameters.ocean_conversion_threshold
 
         if self.water_mass > ocean_conversion_threshold and (self.is_surrounded_by_sea_cells(neighbors_aligned) or self.is_surrounded_by_sea_cells(neighbors_below)):
             self.convert_to_ocean(neighbors)
@@ -366,13 +406,14 @@ class Particle:
         Args:
             neighbors (list): List of neighboring particles.
         """
-        absorption_rate = self.config["forest_pollution_absorption_rate"]
-        cooling_effect = self.config["forest_cooling_effect"]
-        forest_pollution_extinction_point = self.config["forest_pollution_extinction_point"]
-        forest_temperature_extinction_point = self.config["forest_temperature_extinction_point"]
-        forest_baseline_temperature = self.config["baseline_temperature"][self.cell_type]
-        pollution_damage_threshold = self.config["pollution_damage_threshold"]
-        pollution_level_tipping_point = self.config["pollution_level_tipping_point"]
+        parameters = self.parameters
+        absorption_rate = parameters.forest_pollution_absorption_rate
+        cooling_effect = parameters.forest_cooling_effect
+        forest_pollution_extinction_point = parameters.forest_pollution_extinction_point
+        forest_temperature_extinction_point = parameters.forest_temperature_extinction_point
+        forest_baseline_temperature = parameters.per_cell.baseline_temperature[self.cell_type]
+        pollution_damage_threshold = parameters.pollution_damage_threshold
+        pollution_level_tipping_point = parameters.pollution_level_tipping_point
         neighbors_above = self.get_above_neighbors(neighbors)
         neighbors_aligned = self.get_aligned_neighbors(neighbors)
         neighbors_below = self.get_below_neighbors(neighbors)
@@ -388,7 +429,7 @@ class Particle:
         # Surrounded by water
         if (self.is_surrounded_by_sea_cells(neighbors_above) or self.is_surrounded_by_sea_cells(neighbors_below)):
             self.convert_to_ocean(neighbors)
-        elif self.water_mass > self.config["ocean_conversion_threshold"] and self.is_surrounded_by_sea_cells(neighbors_aligned):
+        elif self.water_mass > parameters.ocean_conversion_threshold and self.is_surrounded_by_sea_cells(neighbors_aligned):
             self.convert_to_ocean(neighbors)
         elif (self.temperature >= forest_temperature_extinction_point or self.pollution_level >= forest_pollution_extinction_point) and self.is_surrounded_by_land_cells(neighbors_above):  # Forest destruction
             self.convert_to_desert(neighbors)
@@ -408,11 +449,12 @@ class Particle:
         Args:
             neighbors (list): List of neighboring particles.
         """
-        pollution_increase_rate = self.config["city_pollution_generation_rate"]
-        warming_effect = self.config["city_warming_effect"]
-        baseline_pollution_level = self.config["baseline_pollution_level"][self.cell_type]
-        baseline_temperature = self.config["baseline_temperature"][self.cell_type]
-        city_pollution_extinction_point = self.config["city_pollution_extinction_point"]
+        parameters = self.parameters
+        pollution_increase_rate = parameters.city_pollution_generation_rate
+        warming_effect = parameters.city_warming_effect
+        baseline_pollution_level = parameters.per_cell.baseline_pollution_level[self.cell_type]
+        baseline_temperature = parameters.per_cell.baseline_temperature[self.cell_type]
+        city_pollution_extinction_point = parameters.city_pollution_extinction_point
         neighbors_above = self.get_above_neighbors(neighbors)
         neighbors_below = self.get_below_neighbors(neighbors)
 
@@ -437,13 +479,13 @@ class Particle:
         if (self.is_surrounded_by_sea_cells(neighbors_above) or self.is_surrounded_by_sea_cells(neighbors_below)):
             self.convert_to_ocean(neighbors)
 
-        elif self.water_mass > self.config["ocean_conversion_threshold"] and self.is_surrounded_by_sea_cells(neighbors_aligned):
+        elif self.water_mass > parameters.ocean_conversion_threshold and self.is_surrounded_by_sea_cells(neighbors_aligned):
             self.convert_to_ocean(neighbors)
         # Excessive pollution or temperature
         elif (self.pollution_level >= city_pollution_extinction_point or self.temperature >= abs(city_pollution_extinction_point)) or self.is_surrounded_by_sea_cells(neighbors_above):
             self.convert_to_desert(neighbors)
 
-    def _update_air(self, neighbors):
+    def _update_air(self, neighbors, grid_size):
         """
         Updates the behavior of air cells.
 
@@ -455,6 +497,7 @@ class Particle:
 
         Args:
             neighbors (list): List of neighboring particles.
+            grid_size (tuple): Dimensions of the simulation grid (x_max, y_max, z_max).
         """
         # Get rain-related neighbors to influence air behavior
         rain_above = self.get_above_neighbors(
@@ -470,9 +513,9 @@ class Particle:
 
         # Convert to cloud if the water mass exceeds the saturation threshold
         # and the particle is at or near the top of the grid.
-        if self.water_mass >= self.config["cloud_saturation_threshold"] and \
+        if self.water_mass >= self.parameters.cloud_saturation_threshold and \
                 self.is_surrounded_by_cloud_cells(neighbors_below) and \
-                self.position[2] >= self.grid_size[2] // 2:
+                self.position[2] >= grid_size[2] // 2:
             self.convert_to_cloud(neighbors)
             self.go_up(neighbors)
         # Convert to vacuum if conditions are met
@@ -538,7 +581,7 @@ class Particle:
         """
         self.cell_type = 0  # Set cell type to ocean
         self.water_mass = 1.0  # Oceans are full of water by default
-        self.temperature = self.config["baseline_temperature"][self.cell_type]
+        self.temperature = self.parameters.per_cell.baseline_temperature[self.cell_type]
         # self.stabilize(neighbors)  # Stabilize motion
 
     def convert_to_desert(self, neighbors):
@@ -552,7 +595,7 @@ class Particle:
         """
         self.cell_type = 1  # Set cell type to desert
         self.water_mass = 0.0  # Deserts have no water by default
-        self.temperature = self.config["baseline_temperature"][self.cell_type]
+        self.temperature = self.parameters.per_cell.baseline_temperature[self.cell_type]
         self.stabilize(neighbors)  # Stabilize motion
 
     def convert_to_cloud(self, neighbors):
@@ -582,7 +625,7 @@ class Particle:
         self.cell_type = 3  # Set cell type to ice
         self.water_mass = 1.0  # Ice retains full water mass
         # Set to freezing temperature
-        self.temperature = self.config["freezing_point"]
+        self.temperature = self.parameters.freezing_point
         self.stabilize(neighbors)  # Stabilize motion
 
     def convert_to_forest(self, neighbors):
@@ -596,7 +639,7 @@ class Particle:
         """
         self.cell_type = 4  # Set cell type to forest
         self.water_mass = 0.0  # Forest cells don't retain water mass
-        self.temperature = self.config["baseline_temperature"][self.cell_type]
+        self.temperature = self.parameters.per_cell.baseline_temperature[self.cell_type]
         self.stabilize(neighbors)  # Stabilize motion
 
     def convert_to_city(self, neighbors):
@@ -609,11 +652,12 @@ class Particle:
         - Start with a baseline pollution level defined in the configuration.
         - Have a baseline temperature defined in the configuration.
         """
+        parameters = self.parameters
         self.cell_type = 5  # Set cell type to city
         self.water_mass = 0.0  # Cities don't retain water mass
         # Set baseline pollution
-        self.pollution_level = self.config["baseline_pollution_level"][self.cell_type]
-        self.temperature = self.config["baseline_temperature"][self.cell_type]
+        self.pollution_level = parameters.per_cell.baseline_pollution_level[self.cell_type]
+        self.temperature = parameters.per_cell.baseline_temperature[self.cell_type]
         self.stabilize(neighbors)  # Stabilize motion
 
     def convert_to_air(self, neighbors):
@@ -665,7 +709,7 @@ class Particle:
         self.cell_type = 8  # Set cell type to vacuum
         self.water_mass = 0.0  # No water in vacuum
         self.pollution_level = 0.0  # No pollution in vacuum
-        self.temperature = self.config["baseline_temperature"][8]  # Near absolute zero
+        self.temperature = self.parameters.per_cell.baseline_temperature[8]  # Near absolute zero
         self.stabilize(neighbors)  # Halt motion
 
 
@@ -680,18 +724,19 @@ class Particle:
 
         Decay is applied only when values deviate significantly, and neighbor influences are amplified.
         """
-        pollution_decay_rate = self.config["natural_pollution_decay_rate"] * 0.5
-        temperature_decay_rate = self.config["natural_temperature_decay_rate"] * 0.5
-        pollution_diffusion_rate = self.config.get("pollution_diffusion_rate", 0.1)
-        temperature_diffusion_rate = self.config.get("temperature_diffusion_rate", 0.1)
-        transfer_weights = self.config.get("cell_type_pollution_transfer_weights", {})
+        parameters = self.parameters
+        pollution_decay_rate = parameters.natural_pollution_decay_rate * 0.5
+        temperature_decay_rate = parameters.natural_temperature_decay_rate * 0.5
+        pollution_diffusion_rate = parameters.pollution_diffusion_rate
+        temperature_diffusion_rate = parameters.temperature_diffusion_rate
+        transfer_weights = parameters.per_cell.pollution_transfer_weights
 
         # Step 1: Apply non-linear decay for pollution
         if self.pollution_level > 1:  # Decay only for significant pollution levels
             self.pollution_level -= math.sqrt(self.pollution_level) * pollution_decay_rate
 
         # Step 2: Temperature decay with a threshold
-        baseline_temp = self.config["baseline_temperature"][self.cell_type]
+        baseline_temp = parameters.per_cell.baseline_temperature[self.cell_type]
         temperature_diff = self.temperature - baseline_temp
         if abs(temperature_diff) > 5:  # Decay only for significant temperature deviations
             self.temperature -= (temperature_diff / abs(temperature_diff)) * abs(temperature_diff)**0.5 * temperature_decay_rate
@@ -703,7 +748,7 @@ class Particle:
         total_temperature_weight = 0
 
         for neighbor in neighbors:
-            if neighbor is None or neighbor.cell_type not in transfer_weights:
+            if neighbor is None:
                 continue
 
             pollution_weight = transfer_weights[neighbor.cell_type]
@@ -737,13 +782,14 @@ class Particle:
         The new temperature is computed as the weighted average of the neighbors' temperatures,
         with weights defined in the configuration for each cell type.
         """
+        parameters = self.parameters
         total_weight = 0
         weighted_temperature_sum = 0
 
         for neighbor in neighbors:
             weighted_temperature_sum += neighbor.temperature * \
-                self.config["cell_type_temperature_transfer_weights"][neighbor.cell_type]
-            total_weight += self.config["cell_type_temperature_transfer_weights"][neighbor.cell_type]
+                parameters.per_cell.temperature_transfer_weights[neighbor.cell_type]
+            total_weight += parameters.per_cell.temperature_transfer_weights[neighbor.cell_type]
 
         # Calculate weighted average temperature
         if total_weight > 0:
@@ -757,13 +803,14 @@ class Particle:
         The new pollution level is computed as the weighted average of the neighbors' pollution levels,
         with weights defined in the configuration for each cell type.
         """
+        parameters = self.parameters
         total_weight = 0
         weighted_pollution_sum = 0
 
         for neighbor in neighbors:
             weighted_pollution_sum += neighbor.pollution_level * \
-                self.config["cell_type_pollution_transfer_weights"][neighbor.cell_type]
-            total_weight += self.config["cell_type_pollution_transfer_weights"][neighbor.cell_type]
+                parameters.per_cell.pollution_transfer_weights[neighbor.cell_type]
+            total_weight += parameters.per_cell.pollution_transfer_weights[neighbor.cell_type]
 
         # Calculate weighted average pollution level
         if total_weight > 0:
@@ -777,20 +824,20 @@ class Particle:
         Water mass is exchanged based on the difference between the current cell's water mass
         and the neighbor's water mass, adjusted by a weight factor and a threshold.
         """
+        parameters = self.parameters
         total_transfer = 0
         for neighbor in neighbors:
-            if neighbor.cell_type in self.config["cell_type_water_transfer_weights"]:
-                diff = neighbor.water_mass - self.water_mass
-                transfer_weight = self.config["cell_type_water_transfer_weights"][neighbor.cell_type]
+            diff = neighbor.water_mass - self.water_mass
+            transfer_weight = parameters.per_cell.water_transfer_weights[neighbor.cell_type]
 
-                if abs(diff) > self.config["water_transfer_threshold"]:
-                    # Compute weighted water transfer
-                    water_transfer = diff * transfer_weight * \
-                        self.config["water_transfer_rate"]
+            if abs(diff) > parameters.water_transfer_threshold:
+                # Compute weighted water transfer
+                water_transfer = diff * transfer_weight * \
+                    parameters.water_transfer_rate
 
-                    # Adjust the current cell's water mass
-                    self.water_mass += water_transfer
-                    total_transfer += abs(water_transfer)
+                # Adjust the current cell's water mass
+                self.water_mass += water_transfer
+                total_transfer += abs(water_transfer)
 
         return total_transfer
 
@@ -868,12 +915,10 @@ class Particle:
         """
         Move the particle upward.
 
-        Ensures that the particle doesn't move above the grid's maximum height.
+        The particle never moves above the grid's maximum height: `get_next_position` clamps the z-coordinate.
         """
-
-        if self.position[2] < self.grid_size[2]:
-            dx, dy, _ = self.calculate_dynamic_wind_direction(neighbors)
-            self.direction = (dx, dy, 1)
+        dx, dy, _ = self.calculate_dynamic_wind_direction(neighbors)
+        self.direction = (dx, dy, 1)
 
     def stabilize(self, neighbors):
         """
@@ -1088,8 +1133,9 @@ class Particle:
         Returns:
             bool: True if the air cell should convert to vacuum, False otherwise.
         """
+        parameters = self.parameters
         # Thresholds for conversion
-        temperature_threshold = self.config["baseline_temperature"][8] + 10  # Near vacuum baseline
+        temperature_threshold = parameters.per_cell.baseline_temperature[8] + 10  # Near vacuum baseline
         water_mass_threshold = 0.01  # Critical low water mass
         pollution_level_threshold = 0.1  # Minimal pollution level for vacuum
         isolation_threshold = 0.0  # Pollution transfer weight for vacuum
@@ -1100,7 +1146,7 @@ class Particle:
         is_near_pristine = self.pollution_level < pollution_level_threshold
         is_stationary = self.direction == (0, 0, 0)
         is_isolated = all(
-            self.config["cell_type_pollution_transfer_weights"].get(neighbor.cell_type, 0.0) == isolation_threshold
+            parameters.per_cell.pollution_transfer_weights[neighbor.cell_type] == isolation_threshold
             for neighbor in neighbors
         )
 
@@ -1111,3 +1157,47 @@ class Particle:
             is_stationary and
             is_isolated
         )
+
+
+class ReadOnlyParticle(Particle):
+    """
+    Immutable snapshot of a cell, as returned by `World.grid`: the cells are stored in arrays, so a change to a
+    materialized Particle could never reach the World. Use `clone()` for a mutable copy, and store changes
+    with the `World.grid` setter or `WorldState.set_particle`.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, cell_type, temperature, water_mass, pollution_level, direction, position):
+        for name, value in (("cell_type", cell_type), ("temperature", temperature), ("water_mass", water_mass),
+                            ("pollution_level", pollution_level), ("direction", direction), ("position", position)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Particles of World.grid are read-only snapshots; clone() one and store it with the "
+                             "World.grid setter or WorldState.set_particle.")
+
+    def __delattr__(self, name):
+        raise AttributeError("Particles of World.grid are read-only snapshots.")
+
+
+class _VacuumParticle(Particle):
+    """
+    Immutable Vacuum particle shared by all empty cells (see `Particle.vacuum`).
+    """
+
+    __slots__ = ()
+
+    def __init__(self):
+        for name, value in (("cell_type", 8), ("temperature", 0.0), ("water_mass", 0.0), ("pollution_level", 0.0),
+                            ("direction", (0, 0, 0)), ("position", None)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("The shared Vacuum particle is immutable; clone() it first.")
+
+    def __delattr__(self, name):
+        raise AttributeError("The shared Vacuum particle is immutable; clone() it first.")
+
+
+_VACUUM = _VacuumParticle()
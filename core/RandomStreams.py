@@ -0,0 +1,66 @@
+import numpy as np
+
+
+class RandomStreams:
+    """
+    Seeded source of independent, reproducible random number streams.
+
+    Every stream is addressed by a key, e.g. `stream(RandomStreams.INITIALIZATION, slab)`, and derived from the
+    root `SeedSequence` by extending its spawn key. Unlike `SeedSequence.spawn`, which numbers children in the
+    order they are requested, a keyed stream does not depend on which thread or process asks for it or when:
+    a run split into slabs or ensemble members gives bit-identical results for any number of workers. There is
+    deliberately no root Generator: every draw goes through a keyed stream.
+    """
+
+    # First element of the stream keys, one per use of random numbers
+    INITIALIZATION = 0  # Initial grid, one stream per x-slab
+    MEMBER = 1  # Ensemble members, one child RandomStreams per member
+
+    def __init__(self, seed=None):
+        """
+        Initialize the RandomStreams.
+
+        Args:
+            seed (int, np.random.SeedSequence, np.random.Generator or RandomStreams, optional): The root seed.
+                A fresh seed is drawn from the OS if omitted; its `entropy` can be used to reproduce the run.
+        """
+        if isinstance(seed, RandomStreams):
+            seed = seed.seed_sequence
+        elif isinstance(seed, np.random.Generator):
+            seed = seed.bit_generator.seed_seq
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+
+    @property
+    def entropy(self):
+        """
+        The root entropy: `RandomStreams(entropy)` reproduces the streams of a root RandomStreams.
+        """
+        return self.seed_sequence.entropy
+
+    def _child_sequence(self, key):
+        return np.random.SeedSequence(self.seed_sequence.entropy, spawn_key=self.seed_sequence.spawn_key + key,
+                                      pool_size=self.seed_sequence.pool_size)
+
+    def stream(self, *key):
+        """
+        Get the Generator of a keyed stream. The same key always gives the same stream.
+
+        Args:
+            *key (int): Non-negative ints, starting with one of the purposes (e.g. INITIALIZATION).
+
+        Returns:
+            np.random.Generator: A new Generator at the start of the stream.
+        """
+        return np.random.default_rng(self._child_sequence(key))
+
+    def child(self, *key):
+        """
+        Get an independent RandomStreams, e.g. for one ensemble member.
+
+        Args:
+            *key (int): Non-negative ints, starting with one of the purposes (e.g. MEMBER).
+
+        Returns:
+            RandomStreams: The child streams.
+        """
+        return RandomStreams(self._child_sequence(key))
@@ -0,0 +1,529 @@
+from functools import lru_cache
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def _type_mask(cell_types):
+    """
+    Lookup table of the 9 cell types, True for the given ones: `_type_mask(types)[cell_type]` is a faster
+    `np.isin(cell_type, types)` for the small type sets of the rules.
+    """
+    mask = np.zeros(9, dtype=bool)
+    mask[list(cell_types)] = True
+    mask.setflags(write=False)
+    return mask
+
+
+class CellBatch:
+    """
+    The cells of one type together with their neighbors, as flat arrays.
+
+    This is the array counterpart of a list of Particles and their neighbor lists: the neighbor arrays
+    have a leading axis of 6 (see Stencil.OFFSETS) and `present` marks the neighbors that are in a
+    cell's neighbor list. The Particle conversion methods become masked assignments on the batch.
+    """
+
+    def __init__(self, parameters, cell_type, temperature, water_mass, pollution_level, direction, elevation, neighbors):
+        """
+        Initialize the CellBatch.
+
+        Args:
+            parameters (Parameters or ParameterBatch): The simulation parameters of the cells.
+            cell_type, temperature, water_mass, pollution_level (np.ndarray): Cell attributes, shape (n,).
+            direction (np.ndarray): Directions, shape (3, n).
+            elevation (np.ndarray): z position of each cell, shape (n,).
+            neighbors (dict): Neighbor attributes with the same keys, shapes (6, n) and (6, 3, n) for the
+                direction, plus "present" marking the neighbors in each cell's neighbor list.
+        """
+        self.parameters = parameters
+        self.cell_type = cell_type
+        self.temperature = temperature
+        self.water_mass = water_mass
+        self.pollution_level = pollution_level
+        self.direction = direction
+        self.elevation = elevation
+
+        self.neighbor_type = neighbors["cell_type"]
+        self.neighbor_temperature = neighbors["temperature"]
+        self.neighbor_water_mass = neighbors["water_mass"]
+        self.neighbor_direction = neighbors["direction"]
+        self.neighbor_elevation = neighbors["elevation"]
+
+        # Neighbor lists (all, above, below and aligned with the cell)
+        self.neighbors = neighbors["present"]
+        self.above = self.neighbors & (self.neighbor_elevation > elevation)
+        self.below = self.neighbors & (self.neighbor_elevation < elevation)
+        self.aligned = self.neighbors & (self.neighbor_elevation == elevation)
+
+    ####################################################################################################################
+    ###################################### SURROUNDINGS CHECK METHODS ##################################################
+    ####################################################################################################################
+
+    def count(self, subset, cell_types):
+        """
+        Count the neighbors in a neighbor list that have one of the given types.
+        """
+        return np.sum(subset & _type_mask(cell_types)[self.neighbor_type], axis=0)
+
+    def is_surrounded_by_sea_cells(self, subset):
+        """
+        Vectorized `Particle.is_surrounded_by_sea_cells`: more than half of the neighbors are sea or ice.
+        """
+        return self.count(subset, (0, 3)) > np.sum(subset, axis=0) // 2
+
+    def is_surrounded_by(self, subset, cell_types):
+        """
+        Vectorized `Particle.is_surrounded_by_cell_types`: all neighbors in the list have one of the types.
+        An empty list counts as surrounded.
+        """
+        return self.count(subset, cell_types) == np.sum(subset, axis=0)
+
+    def is_below(self, subset, cell_types):
+        """
+        Vectorized `Particle.is_below_sea_level` / `is_below_ground_level`: the cell is lower than every
+        neighbor in the list that has one of the types.
+        """
+        higher = self.neighbor_elevation > self.elevation
+        return ~np.any(subset & _type_mask(cell_types)[self.neighbor_type] & ~higher, axis=0)
+
+    ####################################################################################################################
+    ###################################### CELL ELEVATION ##############################################################
+    ####################################################################################################################
+
+    def wind(self, mask=None):
+        """
+        Vectorized `Particle.calculate_dynamic_wind_direction` using the current temperatures.
+
+        Args:
+            mask (np.ndarray, optional): Only compute the wind of these cells. Defaults to all cells.
+
+        Returns:
+            np.ndarray: Integer directions of shape (3, n), or (3, m) for the m masked cells.
+        """
+        cells = slice(None) if mask is None else np.flatnonzero(mask)
+        neighbor_type = self.neighbor_type[:, cells]
+        temperature = self.temperature[cells]
+        elevation = self.elevation[cells]
+
+        fluid = self.neighbors[:, cells] & _type_mask((2, 6, 7))[neighbor_type]  # Cloud, Air, Rain
+        temperature_influence = np.maximum(self.neighbor_temperature[:, cells] - temperature, 0) / 10.0
+        altitude_influence = np.maximum(elevation - self.neighbor_elevation[:, cells], 0) / 100.0
+        influence = self.neighbor_water_mass[:, cells] + temperature_influence + altitude_influence
+
+        neighbor_direction = self.neighbor_direction[..., cells]
+        weighted = np.zeros(neighbor_direction.shape[1:], dtype=np.float64)
+        total_influence = np.zeros(temperature.shape, dtype=np.float64)
+        for n in range(fluid.shape[0]):
+            weighted += np.where(fluid[n], neighbor_direction[n] * influence[n], 0.0)
+            total_influence += np.where(fluid[n], influence[n], 0.0)
+
+        significant = total_influence > 0
+        normalized = weighted / np.where(significant, total_influence, 1.0)
+        return np.where(significant, np.round(normalized), 0).astype(np.int64)
+
+    def go_down(self, mask):
+        """
+        Move the masked cells downward, keeping the horizontal wind direction.
+        """
+        mask = mask & (self.elevation >= 0)  # Ensure it doesn't go below the ground
+        self.direction[:2, mask] = self.wind(mask)[:2]
+        self.direction[2, mask] = -1
+
+    def go_up(self, mask):
+        """
+        Move the masked cells upward, keeping the horizontal wind direction.
+        """
+        self.direction[:2, mask] = self.wind(mask)[:2]
+        self.direction[2, mask] = 1
+
+    def stabilize(self, mask):
+        """
+        Halt the movement of the masked cells.
+        """
+        self.direction[:, mask] = 0
+
+    def absorb_water_mass(self, mask=None):
+        """
+        Vectorized `Particle.absorb_water_mass`: exchange water with each neighbor in turn.
+        """
+        parameters = self.parameters
+        for n in range(self.neighbors.shape[0]):
+            diff = self.neighbor_water_mass[n] - self.water_mass
+            transfers = self.neighbors[n] & (np.abs(diff) > parameters.water_transfer_threshold)
+            if mask is not None:
+                transfers &= mask
+            self.water_mass = np.where(
+                transfers,
+                self.water_mass + diff * parameters.water_transfer_weights[self.neighbor_type[n]] * parameters.water_transfer_rate,
+                self.water_mass)
+
+    ####################################################################################################################
+    ###################################### CELL CONVERSION METHODS #####################################################
+    ####################################################################################################################
+
+    def convert_to_ocean(self, mask):
+        self.cell_type[mask] = 0
+        self.water_mass[mask] = 1.0
+        self.temperature = np.where(mask, self.parameters.baseline_temperature[0], self.temperature)
+
+    def convert_to_desert(self, mask):
+        self.cell_type[mask] = 1
+        self.water_mass[mask] = 0.0
+        self.temperature = np.where(mask, self.parameters.baseline_temperature[1], self.temperature)
+        self.stabilize(mask)
+
+    def convert_to_cloud(self, mask):
+        self.cell_type[mask] = 2
+        condensed = self.water_mass + 0.5
+        self.water_mass = np.where(mask, np.where(condensed < 1.0, condensed, 1.0), self.water_mass)
+        self.temperature = np.where(mask, self.temperature - 2, self.temperature)
+        self.go_up(mask)
+
+    def convert_to_ice(self, mask):
+        self.cell_type[mask] = 3
+        self.water_mass[mask] = 1.0
+        self.temperature = np.where(mask, self.parameters.freezing_point, self.temperature)
+        self.stabilize(mask)
+
+    def convert_to_forest(self, mask):
+        self.cell_type[mask] = 4
+        self.water_mass[mask] = 0.0
+        self.temperature = np.where(mask, self.parameters.baseline_temperature[4], self.temperature)
+        self.stabilize(mask)
+
+    def convert_to_city(self, mask):
+        self.cell_type[mask] = 5
+        self.water_mass[mask] = 0.0
+        self.pollution_level = np.where(mask, self.parameters.baseline_pollution_level[5], self.pollution_level)
+        self.temperature = np.where(mask, self.parameters.baseline_temperature[5], self.temperature)
+        self.stabilize(mask)
+
+    def convert_to_air(self, mask):
+        self.cell_type[mask] = 6
+        evaporated = self.water_mass - 0.5
+        self.water_mass = np.where(mask, np.where(evaporated > 0.0, evaporated, 0.0), self.water_mass)
+        self.temperature = np.where(mask, self.temperature + 2, self.temperature)
+        self.go_up(mask)
+
+    def convert_to_rain(self, mask):
+        self.cell_type[mask] = 7
+        self.water_mass[mask] = 1.0
+        self.temperature = np.where(mask, self.temperature - 1, self.temperature)
+        self.direction[:, mask] = np.array([0, 0, -1])[:, None]
+
+    def convert_to_vacuum(self, mask):
+        self.cell_type[mask] = 8
+        self.water_mass[mask] = 0.0
+        self.pollution_level[mask] = 0.0
+        self.temperature = np.where(mask, self.parameters.baseline_temperature[8], self.temperature)
+        self.stabilize(mask)
+
+
+class RuleEngine:
+    """
+    Type-partitioned, vectorized version of the `Particle` type rules (`apply_type_rules`).
+
+    Every step a mask is built for each cell type, and that type's update runs as one kernel over just
+    those cells (a CellBatch). The kernels follow the `_update_*` methods of Particle condition by condition,
+    so the results are identical to applying the rules cell by cell.
+    """
+
+    KERNELS = {
+        0: "_update_ocean",
+        1: "_update_desert",
+        2: "_update_cloud",
+        3: "_update_ice",
+        4: "_update_forest",
+        5: "_update_city",
+        6: "_update_air",
+        7: "_update_rain",
+        8: "_update_vacuum",
+    }
+
+    def __init__(self, grid_size, parameters):
+        """
+        Initialize the RuleEngine.
+
+        Args:
+            grid_size (tuple): Dimensions of the grid (x, y, z).
+            parameters (Parameters or ParameterBatch): The compiled simulation parameters, or those of a batch
+                of worlds when the arrays have a leading batch axis.
+        """
+        self.grid_size = tuple(grid_size)
+        self.parameters = parameters
+
+    def apply(self, cell_type, temperature, water_mass, pollution_level, direction, elevation, neighbors):
+        """
+        Apply the type rules to every cell.
+
+        Args:
+            cell_type, temperature, water_mass, pollution_level (np.ndarray): Cell attributes.
+            direction (np.ndarray): Directions of shape (..., 3, x, y, z).
+            elevation (np.ndarray): z position of each cell.
+            neighbors (dict): Neighbor attributes ("cell_type", "temperature", "water_mass", "direction",
+                "elevation") of shape (6, ...) or (6, 3, ...) for the direction, and "present", which marks
+                the neighbors in each cell's neighbor list.
+
+        Returns:
+            tuple: (cell_type, temperature, water_mass, pollution_level, direction) after the rules.
+        """
+        shape = cell_type.shape
+        size = cell_type.size
+        flat_type = cell_type.reshape(size)
+        columns = {
+            "cell_type": flat_type,
+            "temperature": temperature.reshape(size),
+            "water_mass": water_mass.reshape(size),
+            "pollution_level": pollution_level.reshape(size),
+            "elevation": np.broadcast_to(elevation, shape).reshape(size),
+        }
+        cells_per_world = self.grid_size[0] * self.grid_size[1] * self.grid_size[2]
+        flat_direction = np.moveaxis(direction, -4, 0).reshape(3, size)
+        flat_neighbors = {
+            key: value.reshape(value.shape[:value.ndim - len(shape)] + (size,))
+            for key, value in neighbors.items()
+        }
+
+        result = {key: columns[key].copy() for key in ("cell_type", "temperature", "water_mass", "pollution_level")}
+        result_direction = flat_direction.copy()
+
+        for kernel_type, kernel in self.KERNELS.items():
+            index = np.flatnonzero(flat_type == kernel_type)
+            if index.size == 0:
+                continue
+            cells = CellBatch(
+                self.parameters.select(index // cells_per_world),  # Parameters of the world of each cell
+                columns["cell_type"][index].copy(),
+                columns["temperature"][index].copy(),
+                columns["water_mass"][index].copy(),
+                columns["pollution_level"][index].copy(),
+                flat_direction[:, index].astype(np.int64),
+                columns["elevation"][index],
+                {key: value[..., index] for key, value in flat_neighbors.items()},
+            )
+            getattr(self, kernel)(cells)
+
+            result["cell_type"][index] = cells.cell_type
+            result["temperature"][index] = cells.temperature
+            result["water_mass"][index] = cells.water_mass
+            result["pollution_level"][index] = cells.pollution_level
+            result_direction[:, index] = cells.direction
+
+        return (result["cell_type"].reshape(shape), result["temperature"].reshape(shape),
+                result["water_mass"].reshape(shape), result["pollution_level"].reshape(shape),
+                np.moveaxis(result_direction.reshape((3,) + shape), 0, -4))
+
+    ####################################################################################################################
+    ###################################### CELL UPDATES: ###############################################################
+    ####################################################################################################################
+
+    def _update_ocean(self, cells):
+        """
+        Ocean cells drift with the wind and sink, and may evaporate into air or freeze into ice.
+        """
+        parameters = cells.parameters
+        cells.go_down(np.ones(cells.cell_type.shape, dtype=bool))  # Ocean cells tend to move downward
+
+        evaporates = cells.is_surrounded_by_sea_cells(cells.below) & (cells.temperature > parameters.evaporation_point - 5)
+        freezes = (
+            ~evaporates
+            & (cells.temperature < parameters.freezing_point - 1)
+            & ~cells.is_surrounded_by(cells.above, (1, 4, 5))
+            & ~cells.is_surrounded_by(cells.aligned, (1, 4, 5))
+            & (cells.is_surrounded_by_sea_cells(cells.below | cells.aligned) | cells.is_surrounded_by_sea_cells(cells.above))
+        )
+
+        cells.water_mass = np.where(evaporates, cells.water_mass - parameters.evaporation_rate, cells.water_mass)
+        dries_up = evaporates & (cells.water_mass <= 0)  # Convert to air if water is fully evaporated
+        cells.absorb_water_mass(dries_up)
+        cells.convert_to_air(dries_up)
+        cells.convert_to_ice(freezes)
+
+    def _update_cloud(self, cells):
+        """
+        Clouds exchange water mass with neighbors, rise above land or sea, and may convert to rain if saturated.
+        """
+        cells.absorb_water_mass()
+        rises = (
+            (cells.is_surrounded_by(cells.below, (1, 4, 5)) | cells.is_surrounded_by_sea_cells(cells.below))
+            & (cells.is_surrounded_by(cells.aligned, (1, 4, 5)) | cells.is_surrounded_by_sea_cells(cells.aligned))
+        )
+        saturated = ~rises & (cells.water_mass >= cells.parameters.cloud_saturation_threshold)
+        drifts = ~rises & ~saturated
+
+        cells.go_up(rises)
+        cells.direction[:, drifts] = cells.wind(drifts)
+        cells.convert_to_rain(saturated)
+
+    def _update_ice(self, cells):
+        """
+        Ice can melt into water or turn into desert when surrounded by land.
+        """
+        parameters = cells.parameters
+        melts = cells.temperature > parameters.melting_point - 5
+        cells.water_mass = np.where(melts, cells.water_mass - parameters.melting_rate, cells.water_mass)
+
+        to_ocean = melts & (cells.water_mass <= 0) & (
+            cells.is_surrounded_by_sea_cells(cells.aligned)
+            | cells.is_below(cells.above, (0, 3))
+            | cells.is_surrounded_by_sea_cells(cells.below)
+        )
+        to_desert = ~melts & (
+            cells.is_surrounded_by(cells.aligned, (1, 4, 5)) | cells.is_surrounded_by(cells.above, (1, 4, 5)))
+
+        cells.convert_to_ocean(to_ocean)
+        cells.convert_to_desert(to_desert)
+
+    def _update_desert(self, cells):
+        """
+        Deserts may convert into oceans if surrounded by water or into forests if conditions permit.
+        """
+        parameters = cells.parameters
+        forest_baseline_temperature = parameters.baseline_temperature[4]
+
+        to_ocean = (cells.water_mass > parameters.ocean_conversion_threshold) & (
+            cells.is_surrounded_by_sea_cells(cells.aligned) | cells.is_surrounded_by_sea_cells(cells.below))
+        to_forest = (
+            ~to_ocean
+            & cells.is_surrounded_by(cells.aligned, (1, 4, 5))
+            & (cells.pollution_level <= parameters.pollution_damage_threshold)
+            & (forest_baseline_temperature - 10 <= cells.temperature)
+            & (cells.temperature <= forest_baseline_temperature + 10)
+            & cells.is_surrounded_by(cells.above, (6,))
+            & cells.is_surrounded_by(cells.below, (1,))
+            & (cells.is_surrounded_by(cells.aligned, (1,)) | cells.is_surrounded_by(cells.aligned, (4,)))
+            & ~(cells.is_surrounded_by(cells.below, (5,)) | cells.is_surrounded_by(cells.below, (4,))
+                | cells.is_surrounded_by_sea_cells(cells.above))
+        )
+
+        cells.convert_to_ocean(to_ocean)
+        cells.convert_to_forest(to_forest)
+
+    def _update_forest(self, cells):
+        """
+        Forests absorb pollution, cool down the environment, or may degrade into other types.
+        """
+        parameters = cells.parameters
+        forest_baseline_temperature = np.trunc(parameters.baseline_temperature[4])
+        pollution_damage_threshold = parameters.pollution_damage_threshold
+
+        # Reduced absorption and cooling under high pollution
+        tipping = cells.pollution_level > parameters.pollution_level_tipping_point
+        absorption_rate = np.where(
+            tipping, parameters.forest_pollution_absorption_rate * 0.5, parameters.forest_pollution_absorption_rate)
+        cooling_effect = np.where(tipping, parameters.forest_cooling_effect * 0.5, parameters.forest_cooling_effect)
+
+        absorbed = cells.pollution_level - absorption_rate * cells.pollution_level
+        cells.pollution_level = np.where(absorbed > 0, absorbed, 0.0)
+        cells.temperature = cells.temperature - cells.temperature * cooling_effect
+
+        to_ocean = (
+            cells.is_surrounded_by_sea_cells(cells.above) | cells.is_surrounded_by_sea_cells(cells.below)
+            | ((cells.water_mass > parameters.ocean_conversion_threshold) & cells.is_surrounded_by_sea_cells(cells.aligned))
+        )
+        to_desert = ~to_ocean & (
+            (cells.temperature >= parameters.forest_temperature_extinction_point)
+            | (cells.pollution_level >= parameters.forest_pollution_extinction_point)
+        ) & cells.is_surrounded_by(cells.above, (1, 4, 5))
+        to_city = (
+            ~to_ocean & ~to_desert
+            & (cells.pollution_level < pollution_damage_threshold)
+            & (forest_baseline_temperature - 10 <= cells.temperature)
+            & (cells.temperature <= forest_baseline_temperature + 10)
+            & (cells.is_surrounded_by(cells.aligned, (1,)) | cells.is_surrounded_by(cells.aligned, (5,))
+               | cells.is_surrounded_by(cells.aligned, (4,)))
+            & ~(cells.is_surrounded_by(cells.below, (5,)) | cells.is_surrounded_by(cells.below, (4,))
+                | cells.is_surrounded_by_sea_cells(cells.below))
+        )
+
+        cells.convert_to_ocean(to_ocean)
+        cells.convert_to_desert(to_desert)
+        cells.convert_to_city(to_city)
+
+    def _update_city(self, cells):
+        """
+        Cities increase pollution and temperature and may degrade into deserts or oceans.
+        """
+        parameters = cells.parameters
+        city_pollution_extinction_point = parameters.city_pollution_extinction_point
+
+        # Update temperature and pollution level, clamped like the builtin min/max of the per-cell rule
+        warmed = cells.temperature + parameters.city_warming_effect * cells.temperature
+        warmed = np.where(warmed > parameters.baseline_temperature[5], warmed, parameters.baseline_temperature[5])
+        cells.temperature = np.where(warmed < city_pollution_extinction_point, warmed, city_pollution_extinction_point)
+        polluted = cells.pollution_level + parameters.city_pollution_generation_rate * cells.pollution_level
+        polluted = np.where(polluted > parameters.baseline_pollution_level[5], polluted, parameters.baseline_pollution_level[5])
+        cells.pollution_level = np.where(
+            polluted < city_pollution_extinction_point, polluted, city_pollution_extinction_point)
+
+        to_ocean = (
+            cells.is_surrounded_by_sea_cells(cells.above) | cells.is_surrounded_by_sea_cells(cells.below)
+            | ((cells.water_mass > parameters.ocean_conversion_threshold) & cells.is_surrounded_by_sea_cells(cells.aligned))
+        )
+        to_desert = ~to_ocean & (
+            (cells.pollution_level >= city_pollution_extinction_point)
+            | (cells.temperature >= abs(city_pollution_extinction_point))
+            | cells.is_surrounded_by_sea_cells(cells.above)
+        )
+
+        cells.convert_to_ocean(to_ocean)
+        cells.convert_to_desert(to_desert)
+
+    def _update_air(self, cells):
+        """
+        Air cells exchange water, follow the wind, and may rise, sink, or convert into clouds or vacuum.
+        """
+        parameters = cells.parameters
+        rain = cells.neighbor_type == 7
+        rain_above = np.any(cells.above & rain, axis=0)
+        rain_below = np.any(cells.below & rain, axis=0)
+
+        cells.absorb_water_mass()
+        cells.direction[:] = cells.wind()
+
+        to_cloud = (
+            (cells.water_mass >= parameters.cloud_saturation_threshold)
+            & cells.is_surrounded_by(cells.below, (2,))
+            & (cells.elevation >= self.grid_size[2] // 2)
+        )
+        isolated = ~np.any(cells.neighbors & (parameters.pollution_transfer_weights[cells.neighbor_type] != 0.0), axis=0)
+        to_vacuum = (
+            ~to_cloud
+            & (cells.temperature < parameters.baseline_temperature[8] + 10)
+            & (cells.water_mass < 0.01)
+            & (cells.pollution_level < 0.1)
+            & np.all(cells.direction == 0, axis=0)
+            & isolated
+        )
+        sinks = ~to_cloud & ~to_vacuum & rain_above
+        rises = ~to_cloud & ~to_vacuum & ~rain_above & (
+            (cells.elevation <= 2)
+            | rain_below
+            | cells.is_below(cells.neighbors, (1, 4, 5))
+            | cells.is_below(cells.neighbors, (0, 3))
+        )
+
+        cells.go_down(sinks)
+        cells.go_up(rises)
+        cells.convert_to_cloud(to_cloud)
+        cells.convert_to_vacuum(to_vacuum)
+
+    def _update_rain(self, cells):
+        """
+        Rain falls until it reaches the ground, where it turns into ocean over sea or dries up into air over land.
+        """
+        cells.absorb_water_mass()
+        falls = cells.elevation > 0
+        to_ocean = ~falls & cells.is_surrounded_by_sea_cells(cells.below)
+        to_air = ~falls & ~to_ocean & cells.is_surrounded_by(cells.below, (1, 4, 5))
+
+        cells.direction[:, falls] = np.array([0, 0, -1])[:, None]
+        cells.convert_to_ocean(to_ocean)
+        cells.convert_to_air(to_air)
+
+    def _update_vacuum(self, cells):
+        """
+        Vacuum cells are refilled by air.
+        """
+        cells.convert_to_air(np.ones(cells.cell_type.shape, dtype=bool))
+        cells.direction[:] = cells.wind()
@@ -0,0 +1,89 @@
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from config.Config import config_instance
+from config.presets import PARTICLE_MAPPING
+from .DomainDecomposition import _START_METHOD
+from .WorldBatch import WorldBatch
+
+# Per-day aggregates of a run (attributes of Simulation), in table column order
+AGGREGATES = tuple(WorldBatch.OVER_TIME)
+COUNTS = "cell_type_counts_over_time"  # The aggregate with one column per cell type
+SCALAR_AGGREGATES = tuple(name for name in AGGREGATES if name != COUNTS)
+
+
+def result_specs(runs, days):
+    """
+    Shapes and dtypes of the shared arrays that the runs of an ensemble or a sweep write their aggregates into.
+
+    Args:
+        runs (int): Number of runs (one row each).
+        days (int): Number of days of the longest run.
+
+    Returns:
+        dict: Aggregate name -> (shape, dtype), for `SharedArrays.create`.
+    """
+    specs = {name: ((runs, days + 1), np.float64) for name in SCALAR_AGGREGATES}
+    specs[COUNTS] = ((runs, days + 1, len(PARTICLE_MAPPING)), np.int64)
+    return specs
+
+
+def write_run(shared, row, run):
+    """
+    Write the per-day aggregates of a run into a row of the shared result arrays.
+
+    Args:
+        shared (SharedArrays): The result arrays (see `result_specs`).
+        row (int): Index of the run.
+        run (dict): Aggregate name -> per-day array, from `run_simulation` or `WorldBatch.run`.
+    """
+    for name in AGGREGATES:
+        shared[name][row, :len(run[name])] = run[name]
+
+
+def run_simulation(simulation):
+    """
+    Run a Simulation to the end without keeping its states, and close its engine.
+
+    Args:
+        simulation (Simulation): The simulation to run.
+
+    Returns:
+        tuple: (World of the last day, dict of aggregate name -> per-day array).
+    """
+    with simulation.engine:
+        for world in simulation.run(retain="none"):
+            pass
+    return world, {name: getattr(simulation, name) for name in AGGREGATES}
+
+
+def initialize_worker(config=None):
+    """
+    Prepare a worker process of `run_tasks`.
+
+    Args:
+        config (dict, optional): Configuration the worker adopts, e.g. the one of the parent.
+    """
+    logging.disable(logging.INFO)  # Keep the per-day progress of the runs out of the parent's console
+    if config is not None:
+        config_instance.adopt(config)
+
+
+def run_tasks(task, arguments, workers=None, config=None):
+    """
+    Call `task(*args)` for every tuple of arguments on a pool of worker processes.
+
+    Args:
+        task (callable): A module-level function, so that it can be sent to the workers.
+        arguments (list): One tuple of arguments per call.
+        workers (int, optional): Number of processes, at most one per call. Defaults to the number of CPUs.
+        config (dict, optional): Configuration every worker adopts (see `initialize_worker`).
+    """
+    workers = min(workers or os.cpu_count() or 1, len(arguments))
+    # Not forked, for the same reason as the workers of a DomainDecomposition
+    context = multiprocessing.get_context(_START_METHOD)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=initialize_worker,
+                             initargs=(config,)) as pool:
+        list(pool.map(task, *zip(*arguments)))
@@ -0,0 +1,47 @@
+import numpy as np
+
+
+class RunningStats:
+    """
+    Running mean and standard deviation of a series, updated one value at a time (Welford's algorithm).
+
+    Each update costs O(1) regardless of how many values were seen, and the result equals `np.mean` and
+    `np.std` (population standard deviation) of all the values up to rounding. The values can also be NumPy
+    arrays of a fixed shape, in which case the statistics are tracked element-wise.
+    """
+
+    __slots__ = ("count", "mean", "_m2")
+
+    def __init__(self):
+        """
+        Initialize an empty accumulator.
+        """
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # Sum of squared differences from the current mean
+
+    def push(self, value):
+        """
+        Add a value to the series.
+
+        Args:
+            value (float or np.ndarray): The new value.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self):
+        """
+        Population variance of the values seen so far (0 for fewer than two values).
+        """
+        return self._m2 / self.count if self.count > 1 else self._m2 * 0.0
+
+    @property
+    def std(self):
+        """
+        Population standard deviation of the values seen so far (0 for fewer than two values).
+        """
+        return np.sqrt(self.variance)
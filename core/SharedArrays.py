@@ -0,0 +1,110 @@
+import weakref
+from multiprocessing import shared_memory
+import numpy as np
+
+
+class SharedArrays:
+    """
+    NumPy arrays living in named `multiprocessing.shared_memory` blocks, one block per array.
+
+    The process that creates the arrays owns the blocks and unlinks them; other processes attach to them by
+    name from the small, picklable `descriptor`, and read and write the same memory without copying. Arrays
+    (and views of them) that are still in use when the blocks are closed keep their memory mapped until they
+    are freed, so results written by other processes can be handed out without copying them.
+    """
+
+    def __init__(self, blocks, specs, owner):
+        """
+        Initialize the SharedArrays. Use `create` or `attach` instead.
+
+        Args:
+            blocks (dict): Name -> SharedMemory block.
+            specs (dict): Name -> (shape, dtype string).
+            owner (bool): Whether this process created the blocks (and must unlink them).
+        """
+        self.blocks = blocks
+        self.specs = specs
+        self.owner = owner
+        self.arrays = {}
+        self._exports = {}  # Per block, the memoryview the array keeps exported until its last view is freed
+        for name, (shape, dtype) in specs.items():
+            flat = np.frombuffer(blocks[name].buf, dtype=np.dtype(dtype), count=int(np.prod(shape)))
+            self.arrays[name] = flat.reshape(shape)
+            self._exports[name] = flat.base
+
+    @classmethod
+    def create(cls, specs):
+        """
+        Allocate new shared arrays.
+
+        Args:
+            specs (dict): Name -> (shape, dtype).
+
+        Returns:
+            SharedArrays: The new arrays (zero-filled), owned by this process.
+        """
+        specs = {name: (tuple(shape), np.dtype(dtype).str) for name, (shape, dtype) in specs.items()}
+        blocks = {}
+        try:
+            for name, (shape, dtype) in specs.items():
+                size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+                blocks[name] = shared_memory.SharedMemory(create=True, size=size)
+        except BaseException:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+            raise
+        arrays = cls(blocks, specs, owner=True)
+        for array in arrays.arrays.values():
+            array.fill(0)
+        return arrays
+
+    @classmethod
+    def attach(cls, descriptor):
+        """
+        Map the arrays of a descriptor in this process.
+
+        Args:
+            descriptor (dict): Name -> (block name, shape, dtype), as given by `descriptor`.
+
+        Returns:
+            SharedArrays: Views of the same memory, not owned by this process.
+        """
+        blocks = {name: shared_memory.SharedMemory(name=block) for name, (block, _, _) in descriptor.items()}
+        specs = {name: (tuple(shape), dtype) for name, (_, shape, dtype) in descriptor.items()}
+        return cls(blocks, specs, owner=False)
+
+    @property
+    def descriptor(self):
+        """
+        Picklable description of the arrays: name -> (block name, shape, dtype).
+        """
+        return {name: (self.blocks[name].name, shape, dtype) for name, (shape, dtype) in self.specs.items()}
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Unmap the arrays in this process, and free the blocks if this process owns them.
+
+        Arrays still used elsewhere stay valid: their block is unmapped once they are freed. The names of the
+        blocks are removed right away, so other processes can no longer attach to them.
+        """
+        exports, self._exports = self._exports, {}
+        self.arrays = {}
+        for name, block in self.blocks.items():
+            try:
+                block.close()
+            except BufferError:
+                # Views of the array are still alive: unmap the block once they are freed
+                weakref.finalize(exports[name], block.close).atexit = False
+            if self.owner:
+                block.unlink()
+        self.blocks = {}
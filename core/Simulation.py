@@ -1,6 +1,11 @@
-from core.World import World  # Import the World class
+from core.Engine import get_engine
+from core.StateHistory import StateHistory
+from core.RunningStats import RunningStats
+from core.RandomStreams import RandomStreams
 import logging
 import numpy as np
+from config.Config import config_instance
+from config.presets import PARTICLE_MAPPING
 
 class Simulation:
     """
@@ -9,7 +14,8 @@ class Simulation:
     and analyzing results.
     """
 
-    def __init__(self, grid_size, initial_ratios, days):
+    def __init__(self, grid_size, initial_ratios, days, engine=None, seed=None, keyframe_interval=10,
+                 initial_state=None):
         """
         Initialize the Simulation class with initial conditions.
 
@@ -17,11 +23,35 @@ class Simulation:
             grid_size (tuple): Dimensions of the grid (x, y, z).
             initial_ratios (dict): Initial ratios for different cell types (e.g., forest, city, desert).
             days (int): Number of days to run the simulation.
+            engine (str or Engine, optional): The engine computing the daily updates: a name registered in
+                `core.Engine.ENGINES` ("reference", "numpy", "numba"), "auto", or an Engine instance. Defaults
+                to the "engine" entry of the configuration. An engine created from a name is closed after each
+                run; an Engine instance stays with the caller, who closes it.
+            seed (int, np.random.SeedSequence or RandomStreams, optional): Root seed of the random streams of the
+                run. A fresh seed is drawn if omitted; it is kept in `seed` so the run can be reproduced.
+            keyframe_interval (int): Days between two full keyframes in the state history.
+            initial_state (WorldState, optional): Grid of Day 0, e.g. shared by several runs, instead of a new
+                random grid.
         """
         self.grid_size = grid_size
         self.initial_ratios = initial_ratios
         self.days = days
-        self.states = []  # Store the history of World objects (one per day)
+        if engine is None:
+            engine = config_instance.get().get("engine", "auto")
+        self._owns_engine = isinstance(engine, str)  # Engines created here are closed after each run
+        self.engine = get_engine(engine, grid_size) if self._owns_engine else engine
+        self.streams = RandomStreams(seed)  # Keyed child streams per slab, worker or ensemble member
+        self.seed = self.streams.entropy
+        self.initial_state = initial_state
+        self.keyframe_interval = keyframe_interval
+        self._reset()
+
+    def _reset(self):
+        """
+        Empty the state history and the per-day aggregates, before a (new) run.
+        """
+        self.states = StateHistory(self.keyframe_interval)  # History of World objects (the retained days)
+        self.states_days = []  # Day of each entry of `states`
         # Aggregates to track various metrics over time
         self.pollution_over_time = []  # Average pollution over time
         self.temperature_over_time = []  # Average temperature over time
@@ -31,18 +61,20 @@ class Simulation:
         self.std_dev_pollution_over_time = []  # Standard deviation of pollution
         self.std_dev_temperature_over_time = []  # Standard deviation of temperature
         self.std_dev_water_mass_over_time = []  # Standard deviation of water mass
-        # Track counts of each cell type
-        self.cell_type_counts_over_time = {
-            cell_type: [] for cell_type in range(10)}
-        self.cell_type_std_dev_over_time = {
-            # Track std dev per cell type
-            cell_type: [] for cell_type in range(10)}
+        # Track counts of each cell type: one row per day, one column per cell type in PARTICLE_MAPPING
+        self.cell_type_counts_over_time = np.zeros((self.days + 1, len(PARTICLE_MAPPING)), dtype=np.int64)
+        # Temporal std dev of the count of each cell type, up to each day
+        self.cell_type_std_dev_over_time = np.zeros((self.days + 1, len(PARTICLE_MAPPING)), dtype=np.float64)
+        self.aggregated_days = 0  # Number of rows filled in the per-day arrays
         # Standard deviation of cell type distribution over time
         self.std_dev_cell_distribution_over_time = []
         self.std_dev_forest_count_over_time = []  # Standard deviation of forest count
         # Standard deviation of city population
         self.std_dev_city_population_over_time = []
-
+        # Running (Welford) accumulators behind the temporal standard deviations
+        self._forest_count_stats = RunningStats()
+        self._city_population_stats = RunningStats()
+        self._cell_type_count_stats = RunningStats()
 
 
     def precompute(self):
@@ -55,30 +87,59 @@ class Simulation:
         2. For each day, clone the last state, update it, and store it.
         3. Update aggregates for analysis.
         """
-        # Initialize the first state (Day 0)
-        initial_state = World(
-            grid_size=self.grid_size,
-            initial_ratios=self.initial_ratios,
-            day_number=0
-        )
-        initial_state.initialize_grid()
-        self.states.append(initial_state)
-        self._update_aggregates(initial_state)  # Update aggregates for Day 0
-
-        # # Simulate for the specified number of days
-        for day in range(self.days):
-            logging.info(f"Pre-computing Day {day}...")
-
-            # Compute the next state by cloning the current state
-            next_state = self.states[-1].clone()
-            next_state.day_number += 1  # Increment the day number
-            next_state.update_cells_on_grid()  # Update the grid cells
-            next_state._recalculate_global_attributes()  # Recalculate global attributes
-            self.states.append(next_state)  # Store the new state
-            self._update_aggregates(next_state)  # Update aggregates
-        
+        for _ in self.run(retain="all"):
+            pass
+
         self.print_simulation_metrics()
 
+    def run(self, retain="all"):
+        """
+        Run the simulation day by day, yielding each day's World as soon as it is computed.
+
+        The aggregates (e.g. `pollution_over_time`) are updated before each World is yielded. Only the World of
+        the current day is held by the generator, so with `retain="none"` the memory use does not grow with the
+        number of days. Every run starts over from Day 0 with the same seed, replacing the states and
+        aggregates of an earlier run (e.g. of `precompute`). An engine the Simulation created from a name is
+        closed (see `Engine.close`) when the generator is exhausted or closed.
+
+        Args:
+            retain (str or int): Which days to keep in `self.states`: "all", "none", or an int k to keep every
+                k-th day (days 0, k, 2k, ...). `self.states_days` lists the day of each kept entry.
+
+        Yields:
+            World: The World of each day, starting with the initial state (Day 0).
+        """
+        if retain == "all":
+            retain_every = 1
+        elif retain == "none":
+            retain_every = None
+        elif isinstance(retain, int) and not isinstance(retain, bool) and retain >= 1:
+            retain_every = retain
+        else:
+            raise ValueError(f"Invalid retention policy '{retain}': use 'all', 'none' or a positive int.")
+        self._reset()  # Running again starts over from Day 0 (with the same seed)
+
+        # Initialize the first state (Day 0)
+        current_state = self.engine.initialize(
+            self.grid_size, self.initial_ratios, seed=self.streams, state=self.initial_state)
+
+        try:
+            for day in range(self.days + 1):
+                if day > 0:
+                    logging.info(f"Computing Day {day - 1}...")
+
+                    # Compute the next state from a copy-on-write clone of the current state
+                    current_state = self.engine.step(current_state)
+
+                if retain_every is not None and day % retain_every == 0:
+                    self.states.append(current_state)  # Store the new state
+                    self.states_days.append(day)
+                self._update_aggregates(current_state)  # Update aggregates
+                yield current_state
+        finally:
+            if self._owns_engine:
+                self.engine.close()  # Stop its threads or processes once the run is used up (or abandoned)
+
 
     def _update_aggregates(self, state):
         """
@@ -87,25 +148,32 @@ class Simulation:
         Args:
             state (World): Current World object representing the state of the grid.
         """
+        aggregates = self.engine.aggregates(state)
+
         # Append spatial averages from World
-        self.pollution_over_time.append(state.avg_pollution)
-        self.temperature_over_time.append(state.avg_temperature)
-        self.water_mass_over_time.append(state.avg_water_mass)
-        self.city_population_over_time.append(state.total_cities)
-        self.forest_count_over_time.append(state.total_forests)
+        self.pollution_over_time.append(aggregates["avg_pollution"])
+        self.temperature_over_time.append(aggregates["avg_temperature"])
+        self.water_mass_over_time.append(aggregates["avg_water_mass"])
+        self.city_population_over_time.append(aggregates["total_cities"])
+        self.forest_count_over_time.append(aggregates["total_forests"])
 
         # Append spatial std devs from World
-        self.std_dev_pollution_over_time.append(state.std_dev_pollution)
-        self.std_dev_temperature_over_time.append(state.std_dev_temperature)
-        self.std_dev_water_mass_over_time.append(state.std_dev_water_mass)
-
-        # Calculate temporal std devs dynamically
-        self.std_dev_forest_count_over_time.append(
-            np.std(self.forest_count_over_time) if len(self.forest_count_over_time) > 1 else 0
-        )
-        self.std_dev_city_population_over_time.append(
-            np.std(self.city_population_over_time) if len(self.city_population_over_time) > 1 else 0
-        )
+        self.std_dev_pollution_over_time.append(aggregates["std_dev_pollution"])
+        self.std_dev_temperature_over_time.append(aggregates["std_dev_temperature"])
+        self.std_dev_water_mass_over_time.append(aggregates["std_dev_water_mass"])
+
+        # Update the temporal std devs in O(1) per day
+        self._forest_count_stats.push(aggregates["total_forests"])
+        self._city_population_stats.push(aggregates["total_cities"])
+        self.std_dev_forest_count_over_time.append(self._forest_count_stats.std)
+        self.std_dev_city_population_over_time.append(self._city_population_stats.std)
+
+        # Composition of the grid: the counts of all cell types come from one bincount (see World)
+        counts = aggregates["cell_type_counts"][:len(PARTICLE_MAPPING)]
+        self._cell_type_count_stats.push(counts)
+        self.cell_type_counts_over_time[self.aggregated_days] = counts
+        self.cell_type_std_dev_over_time[self.aggregated_days] = self._cell_type_count_stats.std
+        self.aggregated_days += 1
 
 
     def print_simulation_metrics(self):
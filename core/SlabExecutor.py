@@ -0,0 +1,72 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+
+class SlabExecutor:
+    """
+    Thread pool running the stages of the daily update on x-slabs of the grid.
+
+    The grid is split into contiguous slabs of x-planes, at most one per thread. A stage reads its slab
+    extended by a halo of neighbor planes (see `halo`) and writes only the planes of its own slab, so the
+    slabs of a stage run concurrently without locks: NumPy releases the GIL inside the array kernels. The
+    split only decides which thread computes which planes, never the values, so results do not depend on the
+    number of threads.
+    """
+
+    def __init__(self, grid_size, threads=None):
+        """
+        Initialize the SlabExecutor.
+
+        Args:
+            grid_size (tuple): Dimensions of the grid (x, y, z).
+            threads (int, optional): Number of threads. Defaults to the number of CPUs.
+        """
+        self.grid_size = tuple(grid_size)
+        self.threads = threads or os.cpu_count() or 1
+        size_x = self.grid_size[0]
+        count = max(1, min(self.threads, size_x))
+        edges = [size_x * slab // count for slab in range(count + 1)]
+        self.slabs = list(zip(edges[:-1], edges[1:]))  # (start, stop) x-range of each slab
+        self.slab_of_x = np.repeat(np.arange(count), np.diff(edges))  # Slab owning each x-plane
+        self.pool = ThreadPoolExecutor(max_workers=count, thread_name_prefix="slab") if count > 1 else None
+
+    def __len__(self):
+        return len(self.slabs)
+
+    def halo(self, slab, width=1):
+        """
+        The x-range of a slab extended by `width` planes on each side, within the (bounded) grid.
+
+        Args:
+            slab (tuple): (start, stop) of the slab.
+            width (int): Number of halo planes.
+
+        Returns:
+            tuple: (start, stop) of the extended range.
+        """
+        start, stop = slab
+        return max(start - width, 0), min(stop + width, self.grid_size[0])
+
+    def map(self, function, tasks=None):
+        """
+        Run a function on every slab (or on the given tasks) and wait for all of them.
+
+        Args:
+            function (callable): Called with each task.
+            tasks (list, optional): One task per slab. Defaults to the (start, stop) ranges of the slabs.
+
+        Returns:
+            list: The results, in slab order.
+        """
+        tasks = self.slabs if tasks is None else tasks
+        if self.pool is None:
+            return [function(task) for task in tasks]
+        return list(self.pool.map(function, tasks))
+
+    def shutdown(self):
+        """
+        Stop the threads of the pool.
+        """
+        if self.pool is not None:
+            self.pool.shutdown()
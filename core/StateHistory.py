@@ -0,0 +1,153 @@
+import copy
+import numpy as np
+from .WorldState import WorldState
+
+
+class StateHistory:
+    """
+    In-memory history of the daily World states, stored as keyframes plus per-field deltas.
+
+    Every `keyframe_interval`-th entry keeps the full state arrays. The entries in between keep, for each field,
+    only the flat indices of the cells that changed since the previous entry and their new values. A field that
+    changed in so many cells that its delta would be larger than the array itself (e.g. temperature, which decays
+    everywhere every day) is kept whole instead.
+
+    The history behaves like a read-only list of World objects: `len(history)`, `history[day]` (negative indices
+    and slices included) and iteration. Reading an entry rebuilds its state from the nearest keyframe, so random
+    access costs at most `keyframe_interval - 1` deltas; sequential access (iteration, or reading day + 1 after
+    day) applies a single delta per entry.
+    """
+
+    def __init__(self, keyframe_interval=10):
+        """
+        Initialize an empty StateHistory.
+
+        Args:
+            keyframe_interval (int): Number of entries between two full keyframes (1 keeps every entry whole).
+        """
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1.")
+        self.keyframe_interval = keyframe_interval
+        self._worlds = []  # World objects without their state (day number, global attributes)
+        self._frames = []  # Per entry: field -> full array or (indices, values) delta
+        self._last = None  # State of the last appended entry, for computing the next delta
+        self._cursor = None  # (entry, state) of the last rebuilt entry, for sequential access
+
+    def append(self, world):
+        """
+        Store a World as the next entry.
+
+        The World itself is not kept: its state is stored as a keyframe or delta and its other attributes in a
+        shallow copy (without the state and the water flux of its last update).
+
+        Args:
+            world (World): The World to store.
+        """
+        state = world.state.share()  # Freeze the arrays so that the stored references stay valid
+        if len(self._frames) % self.keyframe_interval == 0:
+            frame = {field: getattr(state, field) for field in WorldState.FIELDS}
+        else:
+            frame = {field: self._delta(getattr(self._last, field), getattr(state, field))
+                     for field in WorldState.FIELDS}
+
+        stored = copy.copy(world)
+        stored.state = None
+        stored.water_flux = None
+        self._worlds.append(stored)
+        self._frames.append(frame)
+        self._last = state
+
+    @staticmethod
+    def _delta(previous, current):
+        """
+        Encode the change of one field between two consecutive entries.
+
+        Args:
+            previous (np.ndarray): The field in the previous entry.
+            current (np.ndarray): The field in the new entry.
+
+        Returns:
+            np.ndarray or tuple: `current` itself if a delta would not be smaller, else (indices, values).
+        """
+        indices = np.flatnonzero(previous != current)
+        index_dtype = np.int32 if current.size < 2 ** 31 else np.int64
+        if indices.size * (np.dtype(index_dtype).itemsize + current.itemsize) >= current.nbytes:
+            return current
+        return indices.astype(index_dtype), current.reshape(-1)[indices]
+
+    def _state(self, entry):
+        """
+        Rebuild the state of an entry from its keyframe and the deltas after it.
+
+        Args:
+            entry (int): Index of the entry (non-negative).
+
+        Returns:
+            WorldState: The state of the entry (read-only arrays).
+        """
+        keyframe = entry - entry % self.keyframe_interval
+        if entry == len(self._frames) - 1:
+            return self._last.share()
+
+        if self._cursor is not None and keyframe <= self._cursor[0] <= entry:
+            current, state = self._cursor
+        else:
+            current = keyframe
+            state = WorldState(self._last.grid_size, *(self._frames[keyframe][field] for field in WorldState.FIELDS))
+
+        while current < entry:
+            current += 1
+            fields = []
+            for field in WorldState.FIELDS:
+                change = self._frames[current][field]
+                if isinstance(change, np.ndarray):
+                    fields.append(change)
+                else:
+                    indices, values = change
+                    array = getattr(state, field).copy()
+                    array.reshape(-1)[indices] = values
+                    array.setflags(write=False)
+                    fields.append(array)
+            state = WorldState(state.grid_size, *fields)
+
+        self._cursor = (entry, state)
+        return state.share()
+
+    def __len__(self):
+        return len(self._frames)
+
+    def __getitem__(self, day):
+        """
+        Get the World of an entry.
+
+        Args:
+            day (int or slice): Index of the entry; negative indices count from the end.
+
+        Returns:
+            World or list: A World whose state is the rebuilt (copy-on-write) state of the entry.
+        """
+        if isinstance(day, slice):
+            return [self[entry] for entry in range(*day.indices(len(self)))]
+        if day < 0:
+            day += len(self)
+        if not 0 <= day < len(self):
+            raise IndexError("StateHistory index out of range.")
+
+        world = copy.copy(self._worlds[day])
+        world.state = self._state(day)
+        return world
+
+    def __iter__(self):
+        for day in range(len(self)):
+            yield self[day]
+
+    @property
+    def nbytes(self):
+        """
+        Memory used by the stored keyframes and deltas, in bytes.
+        """
+        total = 0
+        for frame in self._frames:
+            for change in frame.values():
+                total += sum(array.nbytes for array in change) if isinstance(change, tuple) else change.nbytes
+        return total
@@ -0,0 +1,216 @@
+import numpy as np
+
+
+class Stencil:
+    """
+    Whole-grid 6-neighbor stencil operating on the state arrays.
+
+    Neighbor values are read through shifted copies of the field arrays, so a single NumPy expression
+    processes every cell at once. The neighbor order matches NeighborTable (left, right, up, down, below, above),
+    which keeps floating point sums identical to the per-cell code. Neighbors outside the grid do not exist.
+
+    The spatial axes are always the last three axes of the arrays, so leading batch axes are carried along.
+    """
+
+    OFFSETS = (
+        (-1, 0, 0), (1, 0, 0),  # Left and right
+        (0, -1, 0), (0, 1, 0),  # Up and down
+        (0, 0, -1), (0, 0, 1)   # Below and above
+    )
+    BACKWARD = (0, 2, 4)  # Offsets pointing to cells that come earlier in (x, y, z) loop order
+    FORWARD = (1, 3, 5)  # Offsets pointing to cells that come later in (x, y, z) loop order
+
+    def __init__(self, grid_size):
+        """
+        Initialize the Stencil for a grid size.
+
+        Args:
+            grid_size (tuple): Dimensions of the grid (x, y, z).
+        """
+        self.grid_size = tuple(grid_size)
+
+        # valid[n] is True where the n-th neighbor of a cell exists
+        self.valid = np.stack([
+            self.gather(np.ones(self.grid_size, dtype=bool), n, fill=False)
+            for n in range(len(self.OFFSETS))
+        ])
+
+    def valid_for(self, field):
+        """
+        The `valid` mask shaped to broadcast against the neighbor arrays of a field with leading batch axes.
+
+        Args:
+            field (np.ndarray): Array whose last three axes are the grid axes.
+
+        Returns:
+            np.ndarray: View of `valid` of shape (6, 1, ..., 1, x, y, z).
+        """
+        return self.valid.reshape((len(self.OFFSETS),) + (1,) * (field.ndim - 3) + self.grid_size)
+
+    def gather(self, field, n, fill=0):
+        """
+        Read the n-th neighbor of every cell.
+
+        Args:
+            field (np.ndarray): Array whose last three axes are the grid axes.
+            n (int): Index into OFFSETS.
+            fill: Value used where the neighbor does not exist.
+
+        Returns:
+            np.ndarray: Array of the same shape where entry (i, j, k) is the field value at the n-th neighbor.
+        """
+        offset = self.OFFSETS[n]
+        axis = next(a for a in range(3) if offset[a] != 0)
+        step = offset[axis]
+        array_axis = field.ndim - 3 + axis
+
+        out = np.full_like(field, fill)
+        size = field.shape[array_axis]
+        destination = [slice(None)] * field.ndim
+        source = [slice(None)] * field.ndim
+        if step > 0:
+            destination[array_axis] = slice(0, size - step)
+            source[array_axis] = slice(step, size)
+        else:
+            destination[array_axis] = slice(-step, size)
+            source[array_axis] = slice(0, size + step)
+        out[tuple(destination)] = field[tuple(source)]
+        return out
+
+    def neighbors(self, field, backward_field=None, fill=0):
+        """
+        Gather all six neighbors of every cell.
+
+        Args:
+            field (np.ndarray): Values read for the forward neighbors (and all neighbors if backward_field is None).
+            backward_field (np.ndarray, optional): Values read for the backward neighbors. Used when cells
+                that were already visited in loop order must be seen with their updated values.
+            fill: Value used where the neighbor does not exist.
+
+        Returns:
+            np.ndarray: Array of shape (6, *field.shape) with the neighbor values in OFFSETS order.
+        """
+        if backward_field is None:
+            backward_field = field
+        return np.stack([
+            self.gather(backward_field if n in self.BACKWARD else field, n, fill=fill)
+            for n in range(len(self.OFFSETS))
+        ])
+
+    def weighted_sum(self, values, weights, mask):
+        """
+        Sum weighted neighbor values in neighbor order.
+
+        Args:
+            values (np.ndarray): Neighbor values of shape (6, ...).
+            weights (np.ndarray): Neighbor weights of shape (6, ...).
+            mask (np.ndarray): Boolean array of shape (6, ...) selecting the neighbors that take part.
+
+        Returns:
+            tuple: (weighted sum, total weight) arrays.
+        """
+        weighted_sum = np.zeros(values.shape[1:], dtype=np.float64)
+        total_weight = np.zeros(values.shape[1:], dtype=np.float64)
+        for n in range(len(self.OFFSETS)):
+            weighted_sum += np.where(mask[n], values[n] * weights[n], 0.0)
+            total_weight += np.where(mask[n], weights[n], 0.0)
+        return weighted_sum, total_weight
+
+    ####################################################################################################################
+    ###################################### CELL EQUILIBRATE ###################################################
+    ####################################################################################################################
+
+    def apply_natural_decay(self, parameters, cell_type, temperature, pollution_level,
+                            neighbor_types, neighbor_temperatures, neighbor_pollution_levels, mask):
+        """
+        Vectorized `Particle._apply_natural_decay` for all cells.
+
+        Args:
+            parameters (Parameters): The compiled simulation parameters.
+            cell_type (np.ndarray): Cell types.
+            temperature (np.ndarray): Cell temperatures.
+            pollution_level (np.ndarray): Cell pollution levels.
+            neighbor_types (np.ndarray): Neighbor cell types, shape (6, ...).
+            neighbor_temperatures (np.ndarray): Neighbor temperatures, shape (6, ...).
+            neighbor_pollution_levels (np.ndarray): Neighbor pollution levels, shape (6, ...).
+            mask (np.ndarray): Boolean array of shape (6, ...) selecting the neighbors of each cell.
+
+        Returns:
+            tuple: (temperature, pollution_level) arrays after decay.
+        """
+        pollution_decay_rate = parameters.natural_pollution_decay_rate * 0.5
+        temperature_decay_rate = parameters.natural_temperature_decay_rate * 0.5
+        pollution_diffusion_rate = parameters.pollution_diffusion_rate
+        temperature_diffusion_rate = parameters.temperature_diffusion_rate
+        pollution_weights = parameters.pollution_transfer_weights
+        baseline_temp = parameters.baseline_temperature[cell_type]
+
+        # Step 1: Apply non-linear decay for pollution
+        significant = pollution_level > 1
+        pollution_level = np.where(
+            significant, pollution_level - np.sqrt(np.abs(pollution_level)) * pollution_decay_rate, pollution_level)
+
+        # Step 2: Temperature decay with a threshold
+        temperature_diff = temperature - baseline_temp
+        magnitude = np.abs(temperature_diff)
+        significant = magnitude > 5
+        safe_magnitude = np.where(significant, magnitude, 1.0)
+        # float_power goes through the C pow() like `x ** 0.5`; np.power may use sqrt and differ in the last bit
+        temperature = np.where(
+            significant,
+            temperature - (temperature_diff / safe_magnitude) * np.float_power(safe_magnitude, 0.5) * temperature_decay_rate,
+            temperature)
+
+        # Step 3: Amplify neighbor influences
+        weighted_pollution_influence = np.zeros_like(pollution_level)
+        weighted_temperature_influence = np.zeros_like(temperature)
+        total_pollution_weight = np.zeros_like(pollution_level)
+        total_temperature_weight = np.zeros_like(temperature)
+        for n in range(len(self.OFFSETS)):
+            pollution_weight = pollution_weights[neighbor_types[n]]
+            total_pollution_weight += np.where(mask[n], pollution_weight, 0.0)
+            weighted_pollution_influence += np.where(
+                mask[n], (neighbor_pollution_levels[n] - pollution_level) * pollution_diffusion_rate * pollution_weight, 0.0)
+            total_temperature_weight += mask[n]
+            weighted_temperature_influence += np.where(
+                mask[n], (neighbor_temperatures[n] - temperature) * temperature_diffusion_rate, 0.0)
+
+        has_weight = total_pollution_weight > 0
+        pollution_level = np.where(
+            has_weight, pollution_level + weighted_pollution_influence / np.where(has_weight, total_pollution_weight, 1.0),
+            pollution_level)
+        has_weight = total_temperature_weight > 0
+        temperature = np.where(
+            has_weight, temperature + weighted_temperature_influence / np.where(has_weight, total_temperature_weight, 1.0),
+            temperature)
+
+        # Step 4: Enforce realistic bounds
+        pollution_level = np.maximum(0, pollution_level)
+        temperature = np.maximum(baseline_temp - 100, np.minimum(temperature, baseline_temp + 100))
+        return temperature, pollution_level
+
+    def equilibrate_temperature(self, parameters, temperature, neighbor_types, neighbor_temperatures, mask):
+        """
+        Vectorized `Particle.equilibrate_temperature` for all cells.
+
+        Returns:
+            np.ndarray: The equilibrated temperatures.
+        """
+        weights = parameters.temperature_transfer_weights[neighbor_types]
+        weighted_sum, total_weight = self.weighted_sum(neighbor_temperatures, weights, mask)
+        has_weight = total_weight > 0
+        return np.where(
+            has_weight, (weighted_sum / np.where(has_weight, total_weight, 1.0) + temperature) / 2, temperature)
+
+    def equilibrate_pollution_level(self, parameters, pollution_level, neighbor_types, neighbor_pollution_levels, mask):
+        """
+        Vectorized `Particle.equilibrate_pollution_level` for all cells.
+
+        Returns:
+            np.ndarray: The equilibrated pollution levels.
+        """
+        weights = parameters.pollution_transfer_weights[neighbor_types]
+        weighted_sum, total_weight = self.weighted_sum(neighbor_pollution_levels, weights, mask)
+        has_weight = total_weight > 0
+        return np.where(
+            has_weight, (weighted_sum / np.where(has_weight, total_weight, 1.0) + pollution_level) / 2, pollution_level)
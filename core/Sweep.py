@@ -0,0 +1,256 @@
+import argparse
+import ast
+import copy
+import csv
+import itertools
+import logging
+from config.Config import config_instance
+from config.Parameters import Parameters
+from config.presets import PRESET_CONFIGS, DEFAULT_PRESET, PARTICLE_MAPPING
+from .World import World
+from .RunResults import AGGREGATES, COUNTS, SCALAR_AGGREGATES, result_specs, run_simulation, run_tasks, write_run
+from .SharedArrays import SharedArrays
+from .Simulation import Simulation
+from .WorldBatch import WorldBatch
+from .WorldState import WorldState
+
+
+def _set_key(config, key, value):
+    """
+    Set a configuration key; dotted keys reach into dicts and lists (e.g. "initial_ratios.city",
+    "baseline_temperature.5").
+    """
+    def _part(container, part):
+        if isinstance(container, list):
+            return int(part)
+        if part not in container and part.isdigit() and int(part) in container:
+            return int(part)  # Dicts keyed by cell type
+        if part not in container:
+            raise KeyError(f"Unknown configuration key '{key}'.")
+        return part
+
+    *path, last = key.split(".")
+    target = config
+    for part in path:
+        target = target[_part(target, part)]
+    target[_part(target, last)] = value
+
+
+def combinations(parameter_grid, base_preset=None):
+    """
+    Expand a parameter grid into one configuration per combination.
+
+    Args:
+        parameter_grid (dict): Configuration key -> list of values. The special key "preset" sweeps preset names;
+            the other keys are applied on top of the preset.
+        base_preset (str, optional): Preset used when "preset" is not swept. Defaults to the default preset.
+
+    Returns:
+        list: (values, config) pairs, where values maps each swept key to its value in the combination.
+    """
+    keys = list(parameter_grid)
+    result = []
+    for combination in itertools.product(*(parameter_grid[key] for key in keys)):
+        values = dict(zip(keys, combination))
+        preset = values.get("preset", base_preset)
+        if preset is not None and preset not in PRESET_CONFIGS:
+            raise ValueError(f"Preset '{preset}' does not exist.")
+        config = copy.deepcopy(dict(PRESET_CONFIGS[preset] if preset else DEFAULT_PRESET))
+        for key, value in values.items():
+            if key != "preset":
+                _set_key(config, key, value)
+        result.append((values, config))
+    return result
+
+
+def _initial_world_key(config, grid_size, seed):
+    """
+    Everything `World.initialize_grid` depends on: runs with the same key start from the same grid.
+    """
+    return (tuple(grid_size), tuple(sorted(config["initial_ratios"].items())), seed,
+            tuple(config["baseline_temperature"]), tuple(config["baseline_pollution_level"]))
+
+
+def _initial_state(shared, grid_size, grid):
+    """
+    An initial grid of the sweep, as a WorldState over the shared arrays (read, never written, by the runs).
+    """
+    return WorldState(grid_size, *(shared[f"initial{grid}_{field}"] for field in WorldState.FIELDS))
+
+
+def _run_combination(config, grid_size, days, grid, arrays, index):
+    """
+    Run one combination from a shared initial grid without keeping its states, and write its per-day
+    aggregates and cell type counts into row `index` of the shared result arrays.
+
+    Args:
+        arrays (dict): Descriptor of the SharedArrays holding the initial grids and the results.
+        grid (int): Index of the initial grid of the combination.
+        index (int): Index of the combination.
+    """
+    config_instance.adopt(config)
+    with SharedArrays.attach(arrays) as shared:
+        _, run = run_simulation(Simulation(grid_size, config["initial_ratios"], days,
+                                           initial_state=_initial_state(shared, grid_size, grid)))
+        write_run(shared, index, run)
+
+
+def _run_batch(configs, grid_size, days, grids, arrays, indices):
+    """
+    Run several combinations of the same grid size and number of days together as one WorldBatch, and write
+    their results into the rows `indices` of the shared result arrays (see `_run_combination`).
+    """
+    with SharedArrays.attach(arrays) as shared:
+        batch = WorldBatch(grid_size, [_initial_state(shared, grid_size, grid) for grid in grids],
+                           [Parameters(config) for config in configs])
+        for index, run in zip(indices, batch.run(days)):
+            write_run(shared, index, run)
+
+
+class SweepResult:
+    """
+    Tidy table of a sweep: one row per combination and day, with the swept values and the day's aggregates.
+    """
+
+    def __init__(self, keys, values, runs):
+        """
+        Initialize the SweepResult.
+
+        Args:
+            keys (list): The swept configuration keys.
+            values (list): Per combination, a dict of swept key -> value.
+            runs (list): Per combination, the dict returned by the run.
+        """
+        self.columns = (["combination", *keys, "day"] + [name[:-len("_over_time")] for name in SCALAR_AGGREGATES]
+                        + [f"count_{PARTICLE_MAPPING[t].lower()}" for t in sorted(PARTICLE_MAPPING)])
+        self.rows = []
+        for combination, (combination_values, run) in enumerate(zip(values, runs)):
+            counts = run[COUNTS]
+            for day in range(len(counts)):
+                self.rows.append([combination, *(combination_values[key] for key in keys), day,
+                                  *(float(run[name][day]) for name in SCALAR_AGGREGATES),
+                                  *(int(c) for c in counts[day])])
+
+    def __len__(self):
+        return len(self.rows)
+
+    def column(self, name):
+        """
+        All values of a column, in row order.
+
+        Args:
+            name (str): A column name.
+
+        Returns:
+            list: The column.
+        """
+        index = self.columns.index(name)
+        return [row[index] for row in self.rows]
+
+    def to_csv(self, path):
+        """
+        Write the table to a CSV file.
+
+        Args:
+            path (str): File path.
+        """
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(self.columns)
+            writer.writerows(self.rows)
+
+
+def run_sweep(parameter_grid, base_preset=None, grid_size=None, days=None, seed=0, workers=None, batch_size=1):
+    """
+    Run every combination of a parameter grid across a process pool.
+
+    The initial grids are built once in this process and shared by all the combinations that have the same
+    grid size, initial ratios, baseline values and seed; the workers only step the days. With a batch size
+    above 1, combinations with the same grid size and number of days are stepped together as WorldBatches,
+    each world with the parameters of its own combination. The initial grids and the per-day results live in
+    shared memory (see SharedArrays), so only the configurations and small descriptors go through the pool.
+
+    Args:
+        parameter_grid (dict): Configuration key -> list of values (see `combinations`).
+        base_preset (str, optional): Preset used when "preset" is not swept.
+        grid_size (tuple, optional): Dimensions of the grid. Defaults to each combination's configuration.
+        days (int, optional): Number of days to simulate. Defaults to each combination's configuration.
+        seed (int): Seed of the initial grids, the same for every combination.
+        workers (int, optional): Number of processes. Defaults to the number of CPUs.
+        batch_size (int): Number of combinations per WorldBatch; 1 runs each as its own Simulation.
+
+    Returns:
+        SweepResult: The per-day aggregates of all combinations.
+    """
+    swept = combinations(parameter_grid, base_preset)
+    initial_states = {}
+    tasks = []
+    for _, config in swept:
+        size = tuple(grid_size or config["grid_size"])
+        key = _initial_world_key(config, size, seed)
+        if key not in initial_states:
+            world = World(grid_size=size, initial_ratios=config["initial_ratios"])
+            world.parameters = Parameters(config)
+            world.initialize_grid(seed=seed)
+            initial_states[key] = (len(initial_states), world.state)
+        tasks.append((config, size, days or config["days"], initial_states[key][0]))
+    logging.info(f"Running {len(tasks)} combinations from {len(initial_states)} initial grids.")
+
+    # Shared memory: the initial grids, and one row of per-day results per combination
+    specs = result_specs(len(tasks), max(combination_days for _, _, combination_days, _ in tasks))
+    for grid, state in initial_states.values():
+        specs.update({f"initial{grid}_{field}": (getattr(state, field).shape, getattr(state, field).dtype)
+                      for field in WorldState.FIELDS})
+    with SharedArrays.create(specs) as shared:
+        for grid, state in initial_states.values():
+            for field in WorldState.FIELDS:
+                shared[f"initial{grid}_{field}"][...] = getattr(state, field)
+
+        # The runs always go to worker processes, which adopt the configuration of their combination
+        if batch_size > 1:
+            groups = {}
+            for index, (_, size, combination_days, _) in enumerate(tasks):
+                groups.setdefault((size, combination_days), []).append(index)
+            batches = [indices[start:start + batch_size] for indices in groups.values()
+                       for start in range(0, len(indices), batch_size)]
+            run_tasks(_run_batch, [([tasks[i][0] for i in indices], tasks[indices[0]][1], tasks[indices[0]][2],
+                                    [tasks[i][3] for i in indices], shared.descriptor, indices)
+                                   for indices in batches], workers)
+        else:
+            run_tasks(_run_combination, [(*task, shared.descriptor, index) for index, task in enumerate(tasks)],
+                      workers)
+        # Still mapped after the blocks are closed (see SharedArrays)
+        runs = [{name: shared[name][index, :combination_days + 1] for name in AGGREGATES}
+                for index, (_, _, combination_days, _) in enumerate(tasks)]
+    return SweepResult(list(parameter_grid), [values for values, _ in swept], runs)
+
+
+def _parse_value(text):
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text  # Plain strings such as preset names
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run every combination of a grid of configuration values.")
+    parser.add_argument("--param", nargs="+", action="append", default=[], metavar=("KEY", "VALUE"),
+                        help='A key and its values, e.g. --param city_pollution_generation_rate 0.1 0.2 or '
+                             '--param preset "Low Air Pollution (Stable)" "Generic". Repeat for more keys.')
+    parser.add_argument("--preset", default=None, help="Base preset when 'preset' is not swept.")
+    parser.add_argument("--grid-size", default=None, help="Grid size as comma-separated integers.")
+    parser.add_argument("--days", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=1, help="Combinations stepped together as one batch.")
+    parser.add_argument("--output", default="sweep.csv")
+    arguments = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    grid = {key: [value if key == "preset" else _parse_value(value) for value in values]
+            for key, *values in arguments.param}
+    result = run_sweep(grid, base_preset=arguments.preset, days=arguments.days, seed=arguments.seed,
+                       grid_size=tuple(int(v) for v in arguments.grid_size.split(",")) if arguments.grid_size else None,
+                       workers=arguments.workers, batch_size=arguments.batch_size)
+    result.to_csv(arguments.output)
+    logging.info(f"Saved {len(result)} rows to {arguments.output}.")
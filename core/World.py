@@ -1,14 +1,29 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from .Particle import Particle
+from .WorldState import WorldState
+from .Stencil import Stencil
+from .WaterFlux import WaterFlux
+from .Advection import Advection
+from .RuleEngine import RuleEngine
+from .NeighborTable import NeighborTable
+from . import NumbaKernels
+from .RandomStreams import RandomStreams
 from config.Config import config_instance
 
 
 class World:
     """
     Represents the simulation world, including the grid of particles and associated behaviors.
+
+    The cells are stored as a WorldState (one contiguous array per attribute). The `grid` property
+    still exposes them as an object array of Particles for code that works cell by cell.
     """
 
-    def __init__(self, grid_size=None, initial_ratios=None, day_number=0):
+    _numba_fallback_logged = False  # The missing-Numba warning is only logged once
+
+    def __init__(self, grid_size=None, initial_ratios=None, day_number=0, state=None):
         """
         Initialize the World class.
 
@@ -16,10 +31,12 @@ class World:
             grid_size (tuple): Dimensions of the grid (x, y, z). Defaults to config's Grid Dimensions.
             initial_ratios (dict): Initial ratios for cell types. Defaults to config's initial ratios.
             day_number (int): The current day in the simulation.
+            state (WorldState, optional): The cells of the world. Defaults to an all-Vacuum state.
         """
         self.config = config_instance.get()  # Access the centralized configuration
+        self.parameters = config_instance.get_parameters()  # Compiled numeric parameters
         self.grid_size = grid_size or self.config["grid_size"]
-        self.grid = np.empty(self.grid_size, dtype=object)
+        self.state = state if state is not None else WorldState.empty(self.grid_size)
 
         initial_ratios = initial_ratios or self.config["initial_ratios"]
         self.initial_cities_ratio = initial_ratios["city"]
@@ -27,10 +44,25 @@ class World:
         self.initial_deserts_ratio = initial_ratios["desert"]
         self.initial_vacuum_ratio = initial_ratios["vacuum"]
         self.day_number = day_number
+        self.water_flux = None  # WaterFlux of the last vectorized update
+        self._neighbor_table = None  # Built on first use by the per-cell update
+
+    @property
+    def neighbor_table(self):
+        """
+        The NeighborTable of the grid, shared by all World instances of the same grid size (and their clones).
+        """
+        if self._neighbor_table is None:
+            self._neighbor_table = NeighborTable.get(self.grid_size)
+        return self._neighbor_table
 
     def clone(self):
         """
-        Create a deep copy of the current World state.
+        Create a copy of the current World state.
+
+        The copy is copy-on-write: both worlds share the state arrays until one of them writes to a field
+        (see `WorldState.share`). The daily updates build new arrays instead of writing into the old ones,
+        so advancing a clone by one day never copies the previous day's grid.
 
         Returns:
             World: A cloned instance of the current World.
@@ -43,27 +75,35 @@ class World:
                 "desert": self.initial_deserts_ratio,
                 "vacuum": self.initial_vacuum_ratio
             },
-            day_number=self.day_number
+            day_number=self.day_number,
+            state=self.state.share()
         )
 
-        for i in range(self.grid_size[0]):
-            for j in range(self.grid_size[1]):
-                for k in range(self.grid_size[2]):
-                    if self.grid[i, j, k] is None:
-                        self.grid[i, j, k] = Particle(
-                            cell_type=8,  # Default to Vacuum
-                            temperature=0,
-                            water_mass=0,
-                            pollution_level=0,
-                            direction=(0, 0, 0),
-                            position=(i, j, k),
-                            grid_size=self.grid_size
-                        )
-                    cloned_state.grid[i, j, k] = self.grid[i, j, k].clone()
+        cloned_state.parameters = self.parameters
+        cloned_state._neighbor_table = self._neighbor_table
 
         return cloned_state
 
-    def initialize_grid(self):
+    @property
+    def grid(self):
+        """
+        The cells of the world as an object array of read-only Particles.
+
+        The Particles are materialized from the state on every access, so they are snapshots: setting an
+        attribute (e.g. `world.grid[i][j][k].pollution_level = ...`) raises AttributeError instead of changing
+        the World. To change cells, put new Particles into the array and assign it back (`world.grid = grid`),
+        or use `world.state.set_particle`.
+
+        Returns:
+            np.ndarray: Object array of shape grid_size holding one ReadOnlyParticle per cell.
+        """
+        return self.state.to_particles(read_only=True)
+
+    @grid.setter
+    def grid(self, grid):
+        self.state = WorldState.from_particles(grid)
+
+    def initialize_grid(self, seed=None, workers=1):
         """
         Initialize the grid with a realistic distribution of various cell types, such as oceans, forests, cities,
         deserts, and other elements. Includes logic to:
@@ -77,45 +117,66 @@ class World:
         Steps:
         1. Generate an elevation map for terrain features.
         2. Normalize initial ratios to calculate probabilities for cell assignment.
-        3. Loop through all cells in the grid, assigning types based on height and neighboring conditions.
+        3. Assign types to whole columns at once, based on height and the surface type of each column.
         4. Configure additional properties like temperature, pollution, and direction for dynamic cells.
 
+        The random numbers are drawn in bulk, one x-slab at a time, each slab from its own keyed stream (see
+        RandomStreams). The grid only depends on the seed, not on how many workers draw the slabs.
+
+        Args:
+            seed (int, np.random.SeedSequence, np.random.Generator or RandomStreams, optional): Seed for the random
+                streams. A fresh, unpredictable seed is used if omitted.
+            workers (int): Number of threads drawing the slabs.
+
         Returns:
             None
         """
 
-        def _get_dynamic_air_or_cloud_type(k, z):
+        def _choose(u, values, p):
             """
-            Determine the type of Air, Cloud, or Vacuum based on elevation.
+            Pick values from uniform draws, like `np.random.choice(values, p=p)` does for one draw.
+
+            Args:
+                u (np.ndarray): Uniform draws in [0, 1).
+                values (list): Values to choose from.
+                p (np.ndarray): Probabilities of the values, last axis broadcastable against u.
+
+            Returns:
+                np.ndarray: The chosen values, same shape as u.
+            """
+            cdf = np.cumsum(p, axis=-1)
+            index = np.sum(u[..., None] >= cdf[..., :-1], axis=-1)
+            return np.asarray(values)[index]
+
+        def _get_dynamic_air_or_cloud_probabilities(z):
+            """
+            Probabilities of Air, Cloud, or Vacuum for every elevation.
 
             Args:
-                k (int): Current elevation.
                 z (int): Maximum elevation.
 
             Returns:
-                int: Cell type (6: Air, 2: Cloud, 8: Vacuum).
+                np.ndarray: Array of shape (z, 3) with the probabilities of (6: Air, 2: Cloud, 8: Vacuum).
             """
+            probabilities = np.zeros((z, 3))
+            probabilities[:, 0] = 1.0  # Default to Air
             vacuum_ratio = self.initial_vacuum_ratio
 
-            if k >= 0.9 * z:
-                air_ratio = 0.5 - vacuum_ratio
-                cloud_ratio = 0.4
-            elif k >= 0.8 * z:
-                air_ratio = 0.6 - vacuum_ratio
-                cloud_ratio = 0.3
-            elif k >= 0.7 * z:
-                air_ratio = 0.8 - vacuum_ratio
-                cloud_ratio = 0.1
-            else:
-                return 6  # Default to Air
+            for k in range(z):
+                if k >= 0.9 * z:
+                    air_ratio, cloud_ratio = 0.5 - vacuum_ratio, 0.4
+                elif k >= 0.8 * z:
+                    air_ratio, cloud_ratio = 0.6 - vacuum_ratio, 0.3
+                elif k >= 0.7 * z:
+                    air_ratio, cloud_ratio = 0.8 - vacuum_ratio, 0.1
+                else:
+                    continue
 
-            # Normalize probabilities
-            total_ratio = air_ratio + cloud_ratio + vacuum_ratio
-            air_ratio /= total_ratio
-            cloud_ratio /= total_ratio
-            vacuum_ratio /= total_ratio
+                # Normalize probabilities
+                total_ratio = air_ratio + cloud_ratio + vacuum_ratio
+                probabilities[k] = (air_ratio / total_ratio, cloud_ratio / total_ratio, vacuum_ratio / total_ratio)
 
-            return np.random.choice([6, 2, 8], p=[air_ratio, cloud_ratio, vacuum_ratio])
+            return probabilities
 
         def _generate_elevation_map():
             """
@@ -141,8 +202,27 @@ class World:
 
             return elevation_map
 
+        def _draw_slab(i):
+            """
+            Draw the random numbers of the x-slab i from its own stream.
+
+            Returns:
+                tuple: (type draws, horizontal directions, temperature noise) of the slab.
+            """
+            rng = streams.stream(RandomStreams.INITIALIZATION, i)
+            return (rng.random((y, z)), rng.integers(-1, 2, size=(2, y, z)),
+                    rng.uniform(-2, 2, size=(y, z)))
+
         x, y, z = self.grid_size
-        elevation_map = _generate_elevation_map()
+        streams = RandomStreams(seed)
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                slabs = list(pool.map(_draw_slab, range(x)))
+        else:
+            slabs = [_draw_slab(i) for i in range(x)]
+        u, drift, temperature_noise = (np.stack(draws, axis=axis) for draws, axis in zip(zip(*slabs), (0, 1, 0)))
+        elevation = _generate_elevation_map()[:, :, None]
+        k = np.arange(z)
 
         # Normalize the initial ratios without modifying instance variables
         total_ratio = (
@@ -156,265 +236,73 @@ class World:
         forests_ratio = self.initial_forests_ratio / total_ratio
         deserts_ratio = self.initial_deserts_ratio / total_ratio
         vacuum_ratio = self.initial_vacuum_ratio / total_ratio
-        plane_surfaces_map = {}  # Tracks the type of surface for each plane
-
-        # Use baseline values for temperature and pollution from config
-        baseline_temperature = self.config["baseline_temperature"]
-        baseline_pollution_level = self.config["baseline_pollution_level"]
-
-        for i in range(x):
-            for j in range(y):
-                for k in range(z):
-
-                    if self.grid[i, j, k] is None:
-                        # Default to vacuum
-                        self.grid[i, j, k] = Particle(
-                            cell_type=8,  # Vacuum
-                            temperature=0,
-                            water_mass=0,
-                            pollution_level=0,
-                            direction=(0, 0, 0),
-                            position=(i, j, k),
-                            grid_size=self.grid_size
-                        )
-
-                    cell_type = 8  # Default to Vacuum
-                    direction = (0, 0, 0)
-
-                    if k == 0:
-                        # Surface layer: Assign initial sea or land
-                        cell_type = np.random.choice(
-                            [0, 1], p=[0.5, 0.5]  # 50% Sea, 50% Land
-                        )
-                        plane_surfaces_map[(i, j, k)] = (
-                            'unused_land' if cell_type == 1 else 'sea'
-                        )
-                    else:
-                        # Check the surface type below this cell
-                        surface_type = plane_surfaces_map.get(
-                            (i, j, k - 1), 'sky'
-                        )
-
-                        if surface_type == 'sea':
-                            # Sea layer behavior
-                            if k < elevation_map[i, j]:
-                                cell_type = np.random.choice(
-                                    # Mostly sea, some ice
-                                    [0, 3], p=[0.99, 0.01]
-                                )
-                            elif k == elevation_map[i, j]:
-                                cell_type = np.random.choice(
-                                    [0, 3, 6], p=[0.75, 0.10, 0.15]  # Sea/Ice/Air
-                                )
-                            elif k > elevation_map[i, j]:  # Above sea
-                                cell_type = _get_dynamic_air_or_cloud_type(
-                                    k, z)
-
-                        elif surface_type == 'unused_land':
-                            # Land layer behavior
-                            if k <= elevation_map[i, j]:
-                                cell_type = 1  # Unused Land (Desert)
-                            elif k == elevation_map[i, j] + 1:
-                                # Prevent forests/cities above existing forests/cities
-                                if plane_surfaces_map.get((i, j, k - 1)) != 'used_land':
-                                    cell_type = np.random.choice(
-                                        [1, 4, 5, 8],
-                                        p=[deserts_ratio, forests_ratio,
-                                            cities_ratio, vacuum_ratio]
-                                    )
-                                    plane_surfaces_map[(i, j, k)] = 'used_land'
-                            elif k > elevation_map[i, j] + 1:  # Above land
-                                cell_type = _get_dynamic_air_or_cloud_type(
-                                    k, z)
-
-                        elif surface_type == 'used_land':
-                            # Above forests/cities, only air or cloud
-                            cell_type = _get_dynamic_air_or_cloud_type(
-                                k, z)
-
-                        elif surface_type == 'sky':
-                            # Above sky, only air or cloud
-                            cell_type = _get_dynamic_air_or_cloud_type(
-                                k, z)
-                    # Update the plane_surfaces_map based on the assigned cell type
-                    if cell_type in {0, 3}:  # Sea or Ice
-                        plane_surfaces_map[(i, j, k)] = 'sea'
-                    elif cell_type == 1:  # Unused Land (Desert)
-                        plane_surfaces_map[(i, j, k)] = 'unused_land'
-                    elif cell_type in {4, 5}:  # Forest or City
-                        plane_surfaces_map[(i, j, k)] = 'used_land'
-                    elif cell_type in {2, 6}:  # Cloud or Air
-                        plane_surfaces_map[(i, j, k)] = 'sky'
-                    elif cell_type == 8:  # Vacuum
-                        plane_surfaces_map[(i, j, k)] = 'vacuum'
-
-                    # Assign direction for dynamic cells
-                    if cell_type in {0, 3}:  # Sea/Ice
-                        dx, dy = np.random.choice(
-                            [-1, 0, 1]), np.random.choice([-1, 0, 1])
-                        dz = 0
-                        direction = (dx, dy, dz)
-
-                    elif cell_type in {2, 6}:  # Cloud/Air
-                        dx, dy = np.random.choice(
-                            [-1, 0, 1]), np.random.choice([-1, 0, 1])
-                        dz = -1 if cell_type == 6 else 1  # Air falls, clouds rise
-                        direction = (dx, dy, dz)
-
-                    if cell_type != 8:
-                        # Create the particle for the cell
-                        temperature = baseline_temperature[cell_type] + \
-                            np.random.uniform(-2, 2)
-                        pollution = baseline_pollution_level[cell_type]
-                        self.grid[i, j, k] = Particle(
-                            cell_type=cell_type,
-                            temperature=temperature,
-                            water_mass=1 if cell_type in {0, 2, 3} else 0,
-                            pollution_level=pollution,
-                            direction=direction,
-                            position=(i, j, k),
-                            grid_size=self.grid_size
-                        )
-
-        self._recalculate_global_attributes()  # Update global stats
-
-    def update_cells_on_grid(self):
-        """
-        Update all cells in the grid based on their next states and resolve collisions.
-        """
-        def resolve_collision(cell1, cell2):
-            """
-            Resolve collisions between two cells with improved handling of interactions.
-
-            Args:
-                cell1 (Particle): The first cell involved in the collision.
-                cell2 (Particle): The second cell involved in the collision.
-
-            Returns:
-                Particle: The resolved cell after the collision.
-            """
-
-            if (cell1.cell_type == 6 and cell2.cell_type == 6):
-                # return cell1 if (cell1.water_mass + cell1.temperature) > (cell2.water_mass+cell2.temperature) else cell2
-                return cell1 if cell1.water_mass >= cell2.water_mass else cell2
-
-            # Prevent vacuum overwrite air or cloud
-            if cell1.cell_type == 8 and cell2.cell_type in {2, 6}:
-                return cell2
-            if cell2.cell_type == 8 and cell1.cell_type in {2, 6}:
-                return cell1
 
-            # Handle rain interactions
-            # Cell1 is Rain
-            if cell1.cell_type == 7 and cell2.cell_type in {6, 8}:
-                return cell1
+        # One uniform draw per cell decides its type
+        dynamic = _choose(u, [6, 2, 8], _get_dynamic_air_or_cloud_probabilities(z))
 
-            # Cell2 is Rain
-            if cell2.cell_type == 7 and cell1.cell_type in {6, 8}:
-                return cell2
+        # Sea columns: mostly sea with some ice up to the elevation, sea/ice/air at it, air or cloud above
+        sea = np.where(
+            k < elevation, _choose(u, [0, 3], np.array([0.99, 0.01])),
+            np.where(k == elevation, _choose(u, [0, 3, 6], np.array([0.75, 0.10, 0.15])), dynamic))
 
-            if cell1.cell_type == 7 and cell2.cell_type == 7:
-                return cell1 if cell1.water_mass > cell2.water_mass else cell2
-            # Handle rain clouds interactions (Clouds replace air)
-            if cell1.cell_type == 6 and cell2.cell_type == 2:  # Cell1 is Rain
-                return cell2
+        # Land columns: desert up to the elevation, one used-land layer on top of it, air or cloud above
+        used_land = _choose(u, [1, 4, 5, 8], np.array([deserts_ratio, forests_ratio, cities_ratio, vacuum_ratio]))
+        land = np.where(k <= elevation, 1, np.where(k == elevation + 1, used_land, dynamic))
 
-            if cell1.cell_type == 2 and cell2.cell_type == 6:  # Cell2 is Rain
-                return cell1
+        # Surface layer: 50% Sea, 50% Land
+        is_sea = u[:, :, :1] < 0.5
+        cell_type = np.where(is_sea, sea, land).astype(np.int8)
+        cell_type[:, :, 0] = np.where(is_sea[:, :, 0], 0, 1)
 
-            # Default behavior based on cell type weights
-            return cell1 if self.config["cell_type_collision_weights"][cell1.cell_type] >= self.config["cell_type_collision_weights"][cell2.cell_type] else cell2
+        # Nothing is placed above a vacuum cell
+        cell_type[np.logical_or.accumulate(cell_type == 8, axis=2)] = 8
 
-        def get_neighbor_positions(i, j, k):
-            """
-            Get the positions of neighboring cells for the given cell position (i, j, k).
-
-            Args:
-                i (int): The x-coordinate of the cell.
-                j (int): The y-coordinate of the cell.
-                k (int): The z-coordinate of the cell.
+        # Assign direction for dynamic cells: sea/ice drift, air falls and clouds rise
+        state = WorldState.empty(self.grid_size)
+        drifts = np.isin(cell_type, (0, 2, 3, 6))
+        state.direction[:2] = np.where(drifts, drift, 0)
+        state.direction[2] = np.where(cell_type == 6, -1, np.where(cell_type == 2, 1, 0))
 
-            Returns:
-                list: A list of tuples representing the positions of neighboring cells.
-            """
-            neighbors = []
-            directions = [
-                (-1, 0, 0), (1, 0, 0),  # Left and right
-                (0, -1, 0), (0, 1, 0),  # Up and down
-                (0, 0, -1), (0, 0, 1)   # Below and above
-            ]
-
-            for dx, dy, dz in directions:
-                nx, ny, nz = i + dx, j + dy, k + dz
-                if 0 <= nx < self.grid_size[0] and 0 <= ny < self.grid_size[1] and 0 <= nz < self.grid_size[2]:
-                    neighbors.append((nx, ny, nz))
-
-            return neighbors
-
-        def accumulate_water_transfers():
-            """
-            Compute all water transfers for the grid.
-
-            Returns:
-                dict: A transfer map with positions as keys and scaled transfer amounts as values.
-            """
-            transfer_map = {}
-            scale_factor = 1e3  # Scale down large transfer amounts if necessary
-
-            for i in range(self.grid_size[0]):
-                for j in range(self.grid_size[1]):
-                    for k in range(self.grid_size[2]):
-                        cell = self.grid[i, j, k]
-                        if cell and cell.cell_type != 8:  # Exclude Vacuum
-                            neighbors = [
-                                self.grid[nx, ny, nz]
-                                for nx, ny, nz in get_neighbor_positions(i, j, k)
-                            ]
-                            cell_transfers = cell.calculate_water_transfer(
-                                neighbors)
-                            for neighbor_pos, transfer_amount in cell_transfers.items():
-                                # Scale transfer amounts if they exceed the scale factor
-                                scaled_transfer = transfer_amount / \
-                                    scale_factor if abs(
-                                        transfer_amount) > scale_factor else transfer_amount
-                                transfer_map[neighbor_pos] = transfer_map.get(
-                                    neighbor_pos, 0) + scaled_transfer
-
-            return transfer_map
-
-        def apply_water_transfers(transfer_map):
-            """
-            Apply the water transfers to the grid based on the computed transfer map.
-            Ensures water_mass stays within reasonable limits to prevent instability.
-            """
-            max_water_mass = 1.0  # Maximum allowed water mass for a cell (example value)
-            min_water_mass = 0.0  # Minimum allowed water mass for a cell
+        # Use baseline values for temperature and pollution from config
+        non_vacuum = cell_type != 8
+        baseline_temperature = self.parameters.baseline_temperature[cell_type]
+        baseline_pollution_level = self.parameters.baseline_pollution_level[cell_type]
 
-            for (i, j, k), transfer_amount in transfer_map.items():
-                cell = self.grid[i, j, k]
-                if cell:  # Ensure cell exists
-                    cell.water_mass += transfer_amount
+        state.cell_type[...] = cell_type
+        state.temperature[...] = np.where(
+            non_vacuum, baseline_temperature + temperature_noise, 0.0)
+        state.water_mass[...] = np.isin(cell_type, (0, 2, 3))
+        state.pollution_level[...] = np.where(non_vacuum, baseline_pollution_level, 0.0)
 
-                    # Clamp water_mass to stay within defined bounds
-                    cell.water_mass = max(min_water_mass, min(
-                        cell.water_mass, max_water_mass))
+        self.state = state
+        self._recalculate_global_attributes()  # Update global stats
 
+    def update_cells_on_grid(self):
+        """
+        Update all cells in the grid based on their next states and resolve collisions.
+        """
         x, y, z = self.grid_size
 
+        # Materialize the cells as Particles for the per-cell update
+        grid = self.state.to_particles()
+
         # Phase 1: Compute water transfers
-        transfer_map = accumulate_water_transfers()
+        transfer_map = self._accumulate_water_transfers(grid)
 
         # Phase 2: Apply transfers
-        apply_water_transfers(transfer_map)
+        self._apply_water_transfers(grid, transfer_map)
         updates = {}
+        cells = grid.reshape(-1)  # The cells by flat index
+        sentinel = NeighborTable.SENTINEL
 
         # Phase 3: Compute next states for all cells
         for i in range(x):
+            plane = self.neighbor_table.index[i].tolist()  # Neighbor indices of the cells of x-plane i
             for j in range(y):
                 for k in range(z):
-                    cell = self.grid[i, j, k]
+                    cell = grid[i, j, k]
                     if cell.cell_type == 7:  # Rain
-                            below = self.grid[i, j, k -
+                            below = grid[i, j, k -
                                               1] if k - 1 >= 0 else None
                             # Ground types
                             if below and below.cell_type in {1, 4, 5}:
@@ -426,12 +314,352 @@ class World:
                             else:  # Rain continues falling
                                 cell.position = (i, j, k - 1)
                     neighbors = [
-                            self.grid[nx, ny, nz]
-                            for nx, ny, nz in get_neighbor_positions(i, j, k)
-                            if self.grid[nx, ny, nz] is not None
+                            cells[n]
+                            for n in plane[j][k]
+                            if n != sentinel and cells[n] is not None
                     ]
-                    updates[(i, j, k)] = cell.compute_next_state(neighbors)
+                    updates[(i, j, k)] = cell.compute_next_state(neighbors, self.grid_size)
+
+        # Phases 4-5: Resolve collisions and populate the new grid
+        new_grid = self._populate_grid(updates)
+
+        self.state = WorldState.from_particles(new_grid)
+        self._recalculate_global_attributes()
+
+    def update_cells_on_grid_vectorized(self):
+        """
+        Array-based version of `update_cells_on_grid` that produces the same next state.
+
+        The water transfers are computed as a flux field over the state arrays (kept in `water_flux`),
+        and the natural decay and the temperature and pollution equilibration of every cell are computed
+        in one pass with a Stencil, instead of once per cell and neighbor. The type rules run as one
+        kernel per cell type (RuleEngine), and movement and collision resolution are done by Advection
+        over the whole grid.
+        """
+        self.water_flux, fields = self.vectorized_update(
+            self.grid_size, self.parameters, *(getattr(self.state, field) for field in WorldState.FIELDS))
+        self.state = WorldState(self.grid_size, *fields)
+        self._recalculate_global_attributes()
+
+    @staticmethod
+    def vectorized_update(grid_size, parameters, cell_type, temperature, water_mass, pollution_level, direction):
+        """
+        The phases of `update_cells_on_grid_vectorized` on state arrays.
+
+        The arrays may carry a leading batch axis of independent worlds of the same grid size, e.g. cell types
+        of shape (B, x, y, z) and directions of shape (B, 3, x, y, z), with a ParameterBatch holding the
+        parameters of each world (see WorldBatch).
+
+        Args:
+            grid_size (tuple): Dimensions of the grid (x, y, z).
+            parameters (Parameters or ParameterBatch): The compiled simulation parameters.
+            cell_type, temperature, water_mass, pollution_level, direction (np.ndarray): The state arrays.
+
+        Returns:
+            tuple: (WaterFlux, (cell_type, temperature, water_mass, pollution_level, direction) of the next day).
+        """
+        # Phases 1-2: Compute and apply water transfers
+        water_flux = WaterFlux(Stencil(grid_size), parameters)
+        water_mass = water_flux.apply(cell_type, water_mass)
+
+        # Phase 3: Compute next states for all cells
+        *next_state, elevation = World.next_cell_states(
+            grid_size, parameters, cell_type, temperature, water_mass, pollution_level, direction)
+
+        # Phases 4-5: Move the cells and resolve collisions in one grouped reduction
+        advection = Advection(grid_size, parameters)
+        return water_flux, advection.resolve(*next_state, elevation)
+
+    @staticmethod
+    def next_cell_states(grid_size, parameters, cell_type, temperature, water_mass, pollution_level, direction):
+        """
+        Phase 3 of the array-based update: the next state of every cell before it moves.
+
+        A cell only depends on its own column and its six neighbors, so the result on a block of x-planes is
+        exact for every plane whose two x-neighbors are also in the block (see `update_cells_on_grid_threaded`).
+
+        Args:
+            grid_size (tuple): Dimensions of the grid (x, y, z) of the arrays.
+            parameters (Parameters or ParameterBatch): The compiled simulation parameters.
+            cell_type, temperature, pollution_level, direction (np.ndarray): The state arrays.
+            water_mass (np.ndarray): Water mass after the water transfers.
+
+        Returns:
+            tuple: (cell_type, temperature, water_mass, pollution_level, direction, elevation) of every cell,
+            where elevation is one lower for rain that keeps falling.
+        """
+        z = grid_size[2]
+        stencil = Stencil(grid_size)
+        valid = stencil.valid_for(cell_type)
+
+        prepass = World._rain_prepass(stencil, cell_type, water_mass)
+        elevation = np.broadcast_to(np.arange(z), cell_type.shape)
+        self_elevation = elevation - prepass["falling"]
+
+        # Cells earlier in loop order are seen after their rain pre-pass, later ones before it
+        neighbor_types = stencil.neighbors(cell_type, prepass["cell_type"], fill=8)
+        neighbor_temperatures = stencil.neighbors(temperature)
+        neighbor_pollution_levels = stencil.neighbors(pollution_level)
+        non_vacuum = valid & (neighbor_types != 8)
+
+        next_temperature, next_pollution_level = stencil.apply_natural_decay(
+            parameters, prepass["cell_type"], temperature, pollution_level,
+            neighbor_types, neighbor_temperatures, neighbor_pollution_levels, non_vacuum)
+        next_temperature = stencil.equilibrate_temperature(
+            parameters, next_temperature, neighbor_types, neighbor_temperatures, non_vacuum)
+        next_pollution_level = stencil.equilibrate_pollution_level(
+            parameters, next_pollution_level, neighbor_types, neighbor_pollution_levels, non_vacuum)
+
+        # Vacuum cells skip decay and equilibration
+        vacuum = prepass["cell_type"] == 8
+        next_temperature = np.where(vacuum, temperature, next_temperature)
+        next_pollution_level = np.where(vacuum, pollution_level, next_pollution_level)
+
+        # Type rules, with rain that keeps falling seen one cell lower by the cells after it
+        present = valid & ((neighbor_types != 8) | vacuum[None])  # Vacuum cells also see vacuum neighbors
+        neighbors = {
+            "cell_type": neighbor_types,
+            "temperature": neighbor_temperatures,
+            "water_mass": stencil.neighbors(water_mass, prepass["water_mass_seen"]),
+            "direction": np.stack([stencil.neighbors(component) for component in np.moveaxis(direction, -4, 0)],
+                                  axis=1),
+            "elevation": stencil.neighbors(elevation, self_elevation),
+            "present": present,
+        }
+        rules = RuleEngine(grid_size, parameters)
+        return (*rules.apply(prepass["cell_type"], next_temperature, prepass["water_mass"], next_pollution_level,
+                             direction, self_elevation, neighbors), self_elevation)
+
+    def update_cells_on_grid_threaded(self, slabs):
+        """
+        `update_cells_on_grid_vectorized` split into x-slabs that run on a thread pool.
+
+        Every stage reads its slab with a one-plane halo on each side and writes only its own planes: first the
+        water transfers, then, once all the slabs have their new water mass, the next state of every cell
+        (`next_cell_states`). Collisions are resolved per target slab (see `Advection.resolve`) and the cell type
+        counts are reduced per slab. The next state is the same for any number of threads.
+
+        Args:
+            slabs (SlabExecutor): The thread pool and the slabs of the grid.
+        """
+        state = self.state
+        water_mass = np.empty_like(state.water_mass)
+        next_state = [np.empty_like(state.cell_type), np.empty_like(state.temperature),
+                      np.empty_like(state.water_mass), np.empty_like(state.pollution_level),
+                      np.empty_like(state.direction), np.empty(self.grid_size, dtype=np.int64)]
+
+        def _transfer_water(slab):
+            start, stop = slab
+            low, high = slabs.halo(slab)
+            water_flux = WaterFlux(Stencil((high - low,) + tuple(self.grid_size[1:])), self.parameters)
+            transferred = water_flux.apply(state.cell_type[low:high], state.water_mass[low:high])
+            water_mass[start:stop] = transferred[start - low:stop - low]
+
+        def _update_cells(slab):
+            start, stop = slab
+            low, high = slabs.halo(slab)
+            fields = self.next_cell_states(
+                (high - low,) + tuple(self.grid_size[1:]), self.parameters,
+                state.cell_type[low:high], state.temperature[low:high], water_mass[low:high],
+                state.pollution_level[low:high], state.direction[:, low:high])
+            for output, field in zip(next_state, fields):
+                output[..., start:stop, :, :] = field[..., start - low:stop - low, :, :]  # x is the third-last axis
+
+        # Phases 1-3, with a barrier in between: the cells read the new water mass of their neighbors
+        slabs.map(_transfer_water)
+        slabs.map(_update_cells)
+
+        # Phases 4-5: Move the cells and resolve the collisions of each target slab
+        advection = Advection(self.grid_size, self.parameters)
+        self.state = WorldState(self.grid_size, *advection.resolve(*next_state, slabs=slabs))
+        self.water_flux = None
+        self._recalculate_global_attributes(slabs)
+
+    def update_cells_on_grid_distributed(self, domains):
+        """
+        `update_cells_on_grid_vectorized` on worker processes that each own a sub-domain of x-planes and
+        exchange their halos through shared memory (see DomainDecomposition).
+
+        Args:
+            domains (DomainDecomposition): The worker processes, set up for this grid size and parameters.
+        """
+        self.state = domains.step(self.state)
+        self.water_flux = None
+        self._recalculate_global_attributes()
+
+    def update_cells_on_grid_numba(self):
+        """
+        Compiled version of `update_cells_on_grid` that produces the same next state.
+
+        The phases run as Numba kernels over the state arrays (see NumbaKernels): the per-cell phases run in
+        parallel across x-slabs, and collisions are resolved in one sequential pass in loop order. Numba is
+        optional; without it this falls back to `update_cells_on_grid_vectorized`.
+        """
+        if not NumbaKernels.NUMBA_AVAILABLE:
+            if not World._numba_fallback_logged:
+                logging.warning("Numba is not installed; using the NumPy engine instead.")
+                World._numba_fallback_logged = True
+            self.update_cells_on_grid_vectorized()
+            return
+
+        scalars, tables = NumbaKernels.pack(self.parameters)
+        self.state = WorldState(self.grid_size, *NumbaKernels.step(
+            *(getattr(self.state, field) for field in WorldState.FIELDS), scalars, tables))
+        self.water_flux = None
+        self._recalculate_global_attributes()
+
+    @staticmethod
+    def _rain_prepass(stencil, cell_type, water_mass):
+        """
+        Vectorized rain handling that runs at the start of Phase 3.
+
+        Rain above ground is absorbed and turns into air, rain above air hands its water to the air below,
+        and any other rain keeps falling (its position moves one cell down).
+
+        Args:
+            stencil (Stencil): Stencil for the grid.
+            cell_type (np.ndarray): Cell types.
+            water_mass (np.ndarray): Water mass after the water transfers.
+
+        Returns:
+            dict: Arrays describing the grid after the pre-pass:
+                - "cell_type": cell types after the pre-pass.
+                - "water_mass": water mass of each cell when its own next state is computed.
+                - "water_mass_seen": water mass of each cell once the rain above it was handled.
+                - "falling": 1 where rain keeps falling, 0 elsewhere.
+        """
+        rain = cell_type == 7
+        below_type = stencil.gather(cell_type, 4, fill=-1)
+
+        turns_into_air = rain & np.isin(below_type, (1, 4, 5))
+        next_cell_type = np.where(turns_into_air, 6, cell_type).astype(cell_type.dtype)
+        feeds_air = rain & ~turns_into_air & (stencil.gather(next_cell_type, 4, fill=-1) == 6)
+        falling = rain & ~turns_into_air & ~feeds_air
+
+        # Water of each cell when its own next state is computed
+        own_water_mass = np.where(feeds_air, 0.0, water_mass)
+
+        # Water handed down by the rain directly above
+        hands_down = turns_into_air | feeds_air
+        received = stencil.gather(np.where(hands_down, water_mass, 0.0), 5, fill=0.0)
+        receives = stencil.gather(hands_down, 5, fill=False)
+
+        return {
+            "cell_type": next_cell_type,
+            "water_mass": own_water_mass,
+            "water_mass_seen": np.where(receives, own_water_mass + received, own_water_mass),
+            "falling": falling.astype(np.int64),
+        }
+
+    def _resolve_collision(self, cell1, cell2):
+        """
+        Resolve collisions between two cells with improved handling of interactions.
+
+        Args:
+            cell1 (Particle): The first cell involved in the collision.
+            cell2 (Particle): The second cell involved in the collision.
+
+        Returns:
+            Particle: The resolved cell after the collision.
+        """
+
+        if (cell1.cell_type == 6 and cell2.cell_type == 6):
+            # return cell1 if (cell1.water_mass + cell1.temperature) > (cell2.water_mass+cell2.temperature) else cell2
+            return cell1 if cell1.water_mass >= cell2.water_mass else cell2
+
+        # Prevent vacuum overwrite air or cloud
+        if cell1.cell_type == 8 and cell2.cell_type in {2, 6}:
+            return cell2
+        if cell2.cell_type == 8 and cell1.cell_type in {2, 6}:
+            return cell1
+
+        # Handle rain interactions
+        # Cell1 is Rain
+        if cell1.cell_type == 7 and cell2.cell_type in {6, 8}:
+            return cell1
+
+        # Cell2 is Rain
+        if cell2.cell_type == 7 and cell1.cell_type in {6, 8}:
+            return cell2
 
+        if cell1.cell_type == 7 and cell2.cell_type == 7:
+            return cell1 if cell1.water_mass > cell2.water_mass else cell2
+        # Handle rain clouds interactions (Clouds replace air)
+        if cell1.cell_type == 6 and cell2.cell_type == 2:  # Cell1 is Rain
+            return cell2
+
+        if cell1.cell_type == 2 and cell2.cell_type == 6:  # Cell2 is Rain
+            return cell1
+
+        # Default behavior based on cell type weights
+        collision_weights = self.parameters.per_cell.collision_weights
+        return cell1 if collision_weights[cell1.cell_type] >= collision_weights[cell2.cell_type] else cell2
+
+    def _accumulate_water_transfers(self, grid):
+        """
+        Compute all water transfers for the grid.
+
+        Args:
+            grid (np.ndarray): Object array of Particles.
+
+        Returns:
+            dict: A transfer map with positions as keys and scaled transfer amounts as values.
+        """
+        transfer_map = {}
+        scale_factor = 1e3  # Scale down large transfer amounts if necessary
+        cells = grid.reshape(-1)  # The cells by flat index
+        sentinel = NeighborTable.SENTINEL
+
+        for i in range(self.grid_size[0]):
+            plane = self.neighbor_table.index[i].tolist()  # Neighbor indices of the cells of x-plane i
+            for j in range(self.grid_size[1]):
+                for k in range(self.grid_size[2]):
+                    cell = grid[i, j, k]
+                    if cell and cell.cell_type != 8:  # Exclude Vacuum
+                        neighbors = [cells[n] for n in plane[j][k] if n != sentinel]
+                        cell_transfers = cell.calculate_water_transfer(
+                            neighbors)
+                        for neighbor_pos, transfer_amount in cell_transfers.items():
+                            # Scale transfer amounts if they exceed the scale factor
+                            scaled_transfer = transfer_amount / \
+                                scale_factor if abs(
+                                    transfer_amount) > scale_factor else transfer_amount
+                            transfer_map[neighbor_pos] = transfer_map.get(
+                                neighbor_pos, 0) + scaled_transfer
+
+        return transfer_map
+
+    def _apply_water_transfers(self, grid, transfer_map):
+        """
+        Apply the water transfers to the grid based on the computed transfer map.
+        Ensures water_mass stays within reasonable limits to prevent instability.
+
+        Args:
+            grid (np.ndarray): Object array of Particles, updated in place.
+            transfer_map (dict): Transfer amounts keyed by position.
+        """
+        max_water_mass = 1.0  # Maximum allowed water mass for a cell (example value)
+        min_water_mass = 0.0  # Minimum allowed water mass for a cell
+
+        for (i, j, k), transfer_amount in transfer_map.items():
+            cell = grid[i, j, k]
+            if cell:  # Ensure cell exists
+                cell.water_mass += transfer_amount
+
+                # Clamp water_mass to stay within defined bounds
+                cell.water_mass = max(min_water_mass, min(
+                    cell.water_mass, max_water_mass))
+
+    def _populate_grid(self, updates):
+        """
+        Move the updated cells to their next positions, resolving collisions, and build the new grid.
+
+        Args:
+            updates (dict): Updated Particles keyed by their (i, j, k) position in loop order.
+
+        Returns:
+            np.ndarray: The new object grid of Particles.
+        """
         # Phase 4: Resolve collisions
         position_map = {}
         for (i, j, k), updated_cell in updates.items():
@@ -439,102 +667,82 @@ class World:
                 position_map[i, j, k] = updated_cell
                 continue
 
-            next_position = updated_cell.get_next_position()
+            next_position = updated_cell.get_next_position(self.grid_size)
             if next_position not in position_map:
                 position_map[next_position] = updated_cell
             else:
-                position_map[next_position] = resolve_collision(
+                position_map[next_position] = self._resolve_collision(
                     position_map[next_position], updated_cell
                 )
 
         # Phase 5: Populate the new grid
-        new_grid = np.empty_like(self.grid)
+        new_grid = np.empty(self.grid_size, dtype=object)
         for (i, j, k), cell in position_map.items():
             cell.position = (i, j, k)
             new_grid[i, j, k] = cell
 
-        # Fill remaining cells with vacuum
-        for i in range(x):
-            for j in range(y):
-                for k in range(z):
-                    if new_grid[i, j, k] is None:
-                        new_grid[i, j, k] = Particle(
-                            cell_type=8,  # Vacuum
-                            temperature=0,
-                            water_mass=0,
-                            pollution_level=0,
-                            direction=(0, 0, 0),
-                            position=(i, j, k),
-                            grid_size=self.grid_size
-                        )
-
-        self.grid = new_grid
-        self._recalculate_global_attributes()
+        # Fill remaining cells with the shared vacuum particle
+        new_grid[np.equal(new_grid, None)] = Particle.vacuum()
+
+        return new_grid
+
+    @staticmethod
+    def _moments(fields):
+        """
+        Compute the mean and the (population) standard deviation of several arrays together: one reduction
+        gives the sums of all the arrays and one the sums of their squares.
+
+        Each array is shifted by its first value before it is squared, so that arrays far from zero keep their
+        spread (a constant array has exactly 0), and no per-array deviation arrays are needed.
 
-    def _recalculate_global_attributes(self):
+        Args:
+            fields (sequence): Arrays of the same size.
+
+        Returns:
+            tuple: (mean, std) arrays with one entry per array, or zeros for empty arrays.
+        """
+        cells = fields[0].size
+        if cells == 0:
+            return np.zeros(len(fields)), np.zeros(len(fields))
+        shifts = np.array([field.reshape(-1)[0] for field in fields], dtype=np.float64)
+        shifted = np.empty((len(fields), cells))
+        for row, field in enumerate(fields):
+            np.subtract(field.reshape(-1), shifts[row], out=shifted[row])
+        means = shifted.sum(axis=1) / cells
+        squares = np.einsum("ij,ij->i", shifted, shifted) / cells
+        return shifts + means, np.sqrt(np.maximum(squares - means * means, 0.0))
+
+    def _recalculate_global_attributes(self, slabs=None):
         """
         Recalculate global attributes like average temperature, pollution, water mass,
         and counts of cities and forests. Also calculates averages and standard deviations
         for temperature, pollution, water mass, city count, and forest count.
-        """
-        total_temperature = 0
-        total_pollution = 0
-        total_water_mass = 0
-        total_cells = 0
-
-        temperature_values = []
-        pollution_values = []
-        water_mass_values = []
-        city_counts = []
-        forest_counts = []
 
-        total_cities = 0
-        total_forests = 0
+        All the cell type counts come from a single bincount, and the means and standard deviations of
+        the float fields from one sum and one sum of squares over all of them (see `_moments`; equal to
+        `np.mean` and `np.std` up to rounding).
 
-        # Iterate over the grid
-        for i in range(self.grid_size[0]):
-            for j in range(self.grid_size[1]):
-                for k in range(self.grid_size[2]):
-                    cell = self.grid[i, j, k]
-                    if cell is None:
-                        continue
-                    total_cells += 1
-                    total_temperature += cell.temperature
-                    total_pollution += cell.pollution_level
-                    total_water_mass += cell.water_mass
-
-                    temperature_values.append(cell.temperature)
-                    pollution_values.append(cell.pollution_level)
-                    water_mass_values.append(cell.water_mass)
-
-                    # Count cities and forests
-                    if cell.cell_type == 5:  # City
-                        total_cities += 1
-                    elif cell.cell_type == 4:  # Forest
-                        total_forests += 1
-
-        # Add city and forest counts for standard deviation calculations
-        city_counts.append(total_cities)
-        forest_counts.append(total_forests)
-
-        # Global averages
-        self.avg_temperature = total_temperature / total_cells if total_cells > 0 else 0
-        self.avg_pollution = total_pollution / total_cells if total_cells > 0 else 0
-        self.avg_water_mass = total_water_mass / total_cells if total_cells > 0 else 0
+        Args:
+            slabs (SlabExecutor, optional): Count the cell types of each x-slab on its thread pool. The
+                averages are always summed over the whole grid, so they do not depend on the slabs.
+        """
+        state = self.state
+        total_cells = state.cell_type.size
 
         # Total counts
-        self.total_cities = total_cities
-        self.total_forests = total_forests
+        if slabs is None:
+            self.cell_type_counts = np.bincount(state.cell_type.reshape(-1), minlength=9)
+        else:
+            self.cell_type_counts = np.sum(slabs.map(
+                lambda slab: np.bincount(state.cell_type[slab[0]:slab[1]].reshape(-1), minlength=9)), axis=0)
+        self.total_cities = int(self.cell_type_counts[5])  # City
+        self.total_forests = int(self.cell_type_counts[4])  # Forest
         self.total_cells = total_cells
 
-        # Standard deviations
-        self.std_dev_temperature = np.std(
-            temperature_values) if temperature_values else 0
-        self.std_dev_pollution = np.std(
-            pollution_values) if pollution_values else 0
-        self.std_dev_water_mass = np.std(
-            water_mass_values) if water_mass_values else 0
-        self.std_dev_city_population = np.std(
-            city_counts) if city_counts else 0
-        self.std_dev_forest_count = np.std(
-            forest_counts) if forest_counts else 0
+        # Global averages and standard deviations
+        means, stds = self._moments((state.temperature, state.pollution_level, state.water_mass))
+        self.avg_temperature, self.avg_pollution, self.avg_water_mass = (float(mean) for mean in means)
+        self.std_dev_temperature, self.std_dev_pollution, self.std_dev_water_mass = (float(std) for std in stds)
+        # A single snapshot has no spread in its city and forest counts
+        self.std_dev_city_population = 0
+        self.std_dev_forest_count = 0
@@ -0,0 +1,143 @@
+import numpy as np
+from config.Config import config_instance
+from config.ParameterBatch import ParameterBatch
+from .World import World
+from .WorldState import WorldState
+
+
+class WorldBatch:
+    """
+    B independent worlds of the same grid size, advanced together by one array operation per phase.
+
+    The state arrays of all the worlds are stacked along a leading member axis (cell types of shape
+    (B, x, y, z), directions of shape (B, 3, x, y, z)) and stepped with `World.vectorized_update`, so the Python
+    overhead of a day is paid once for the whole batch instead of once per world. Every world keeps its own
+    parameters (see ParameterBatch): ensemble members differ by seed, sweep combinations by configuration.
+    Each member evolves exactly like a World stepped on its own.
+    """
+
+    # Simulation attribute -> per-member aggregate of a day, in the order `run` returns them
+    OVER_TIME = {
+        "pollution_over_time": "avg_pollution",
+        "temperature_over_time": "avg_temperature",
+        "water_mass_over_time": "avg_water_mass",
+        "city_population_over_time": "total_cities",
+        "forest_count_over_time": "total_forests",
+        "std_dev_pollution_over_time": "std_dev_pollution",
+        "std_dev_temperature_over_time": "std_dev_temperature",
+        "std_dev_water_mass_over_time": "std_dev_water_mass",
+        "cell_type_counts_over_time": "cell_type_counts",
+    }
+
+    def __init__(self, grid_size, states, parameters, day_number=0):
+        """
+        Initialize the WorldBatch from the states of its worlds.
+
+        Args:
+            grid_size (tuple): Dimensions of the grid (x, y, z), the same for every world.
+            states (list): The WorldState of each world.
+            parameters (list): The Parameters of each world.
+            day_number (int): The current day of all the worlds.
+        """
+        if len(states) != len(parameters):
+            raise ValueError(f"Got {len(states)} states for {len(parameters)} parameter sets.")
+        self.grid_size = tuple(grid_size)
+        self.parameters = ParameterBatch(parameters)
+        self.day_number = day_number
+        self.fields = {field: np.stack([getattr(state, field) for state in states]) for field in WorldState.FIELDS}
+        self._recalculate_global_attributes()
+
+    @classmethod
+    def initialize(cls, grid_size, initial_ratios, seeds, parameters=None):
+        """
+        Build a batch of random worlds of day 0, one per seed.
+
+        Args:
+            grid_size (tuple): Dimensions of the grid (x, y, z).
+            initial_ratios (dict): Initial ratios for cell types.
+            seeds (list): Seed of each world (int, SeedSequence or RandomStreams, see `World.initialize_grid`).
+            parameters (list, optional): The Parameters of each world. Defaults to the configuration's.
+
+        Returns:
+            WorldBatch: The initialized batch.
+        """
+        parameters = parameters or [config_instance.get_parameters()] * len(seeds)
+        states = []
+        for seed, member_parameters in zip(seeds, parameters):
+            world = World(grid_size=grid_size, initial_ratios=initial_ratios)
+            world.parameters = member_parameters
+            world.initialize_grid(seed=seed)
+            states.append(world.state)
+        return cls(grid_size, states, parameters)
+
+    def __len__(self):
+        return len(self.parameters)
+
+    def step(self):
+        """
+        Advance every world of the batch by one day.
+        """
+        _, fields = World.vectorized_update(
+            self.grid_size, self.parameters, *(self.fields[field] for field in WorldState.FIELDS))
+        self.fields = dict(zip(WorldState.FIELDS, fields))
+        self.day_number += 1
+        self._recalculate_global_attributes()
+
+    def world(self, member):
+        """
+        One world of the batch as a World.
+
+        Args:
+            member (int): Index of the world in the batch.
+
+        Returns:
+            World: The World, sharing the arrays of the batch (copy-on-write, see `WorldState.share`).
+        """
+        world = World(grid_size=self.grid_size, day_number=self.day_number, state=WorldState(
+            self.grid_size, *(self.fields[field][member] for field in WorldState.FIELDS)).share())
+        world.parameters = self.parameters.members[member]
+        world._recalculate_global_attributes()
+        return world
+
+    def run(self, days):
+        """
+        Advance the batch by a number of days and collect the aggregates of every member.
+
+        Args:
+            days (int): Number of days to simulate.
+
+        Returns:
+            list: Per member, a dict of Simulation attribute (see OVER_TIME) -> per-day array, starting with
+            the current day.
+        """
+        history = {name: [] for name in self.OVER_TIME}
+        for day in range(days + 1):
+            if day > 0:
+                self.step()
+            for name, aggregate in self.OVER_TIME.items():
+                history[name].append(self.aggregates[aggregate])
+        history = {name: np.stack(values, axis=1) for name, values in history.items()}
+        return [{name: values[member] for name, values in history.items()} for member in range(len(self))]
+
+    ####################################################################################################################
+    ###################################### PER-MEMBER AGGREGATES #######################################################
+    ####################################################################################################################
+
+    def _recalculate_global_attributes(self):
+        """
+        Recalculate the aggregates of every member (the global attributes of World, one entry per world).
+        """
+        members = len(self)
+        cell_type = self.fields["cell_type"].reshape(members, -1)
+        # One bincount for the whole batch: the types of world b are counted in bins 9b to 9b + 8
+        offsets = np.arange(members)[:, None] * 9
+        counts = np.bincount((cell_type + offsets).reshape(-1), minlength=9 * members).reshape(members, 9)
+
+        aggregates = {"cell_type_counts": counts, "total_cities": counts[:, 5], "total_forests": counts[:, 4]}
+        # The moments of every field of every world in one go, exactly as World computes those of one world
+        fields = (("temperature", "temperature"), ("pollution_level", "pollution"), ("water_mass", "water_mass"))
+        means, stds = World._moments([member for field, _ in fields for member in self.fields[field]])
+        for index, (_, name) in enumerate(fields):
+            aggregates[f"avg_{name}"] = means[index * members:(index + 1) * members]
+            aggregates[f"std_dev_{name}"] = stds[index * members:(index + 1) * members]
+        self.aggregates = aggregates
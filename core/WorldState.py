@@ -0,0 +1,197 @@
+import numpy as np
+from .Particle import Particle, ReadOnlyParticle
+
+
+class WorldState:
+    """
+    Structure-of-arrays storage for the cells of a World.
+
+    Every cell attribute lives in its own contiguous NumPy array indexed by grid position, instead of one
+    Particle object per cell. Particle objects are only materialized on demand (see `particle` and
+    `to_particles`) for code that still works cell by cell.
+
+    States can share their arrays (see `share`). Shared arrays are read-only and are copied on the first
+    write through `set_particle`, one field at a time.
+    """
+
+    FIELDS = ("cell_type", "temperature", "water_mass", "pollution_level", "direction")
+
+    def __init__(self, grid_size, cell_type, temperature, water_mass, pollution_level, direction):
+        """
+        Initialize the WorldState from existing arrays.
+
+        Args:
+            grid_size (tuple): Dimensions of the grid (x, y, z).
+            cell_type (np.ndarray): int8 array of shape grid_size with the cell types.
+            temperature (np.ndarray): float64 array of shape grid_size.
+            water_mass (np.ndarray): float64 array of shape grid_size.
+            pollution_level (np.ndarray): float64 array of shape grid_size.
+            direction (np.ndarray): int8 array of shape (3, *grid_size) holding the (dx, dy, dz) components.
+        """
+        self.grid_size = tuple(grid_size)
+        self.cell_type = cell_type
+        self.temperature = temperature
+        self.water_mass = water_mass
+        self.pollution_level = pollution_level
+        self.direction = direction
+
+    @classmethod
+    def empty(cls, grid_size):
+        """
+        Create a state where every cell is an empty Vacuum cell.
+
+        Args:
+            grid_size (tuple): Dimensions of the grid (x, y, z).
+
+        Returns:
+            WorldState: A new state filled with Vacuum (cell_type 8) and zeroed attributes.
+        """
+        grid_size = tuple(grid_size)
+        return cls(
+            grid_size=grid_size,
+            cell_type=np.full(grid_size, 8, dtype=np.int8),
+            temperature=np.zeros(grid_size, dtype=np.float64),
+            water_mass=np.zeros(grid_size, dtype=np.float64),
+            pollution_level=np.zeros(grid_size, dtype=np.float64),
+            direction=np.zeros((3,) + grid_size, dtype=np.int8),
+        )
+
+    @classmethod
+    def from_particles(cls, grid):
+        """
+        Pack an object grid of Particles into a new WorldState.
+
+        Args:
+            grid (np.ndarray): Object array of Particles. Empty (None) entries are stored as Vacuum.
+
+        Returns:
+            WorldState: The packed state.
+        """
+        state = cls.empty(grid.shape)
+        x, y, z = grid.shape
+        for i in range(x):
+            for j in range(y):
+                for k in range(z):
+                    cell = grid[i, j, k]
+                    if cell is not None:
+                        state.set_particle(i, j, k, cell)
+        return state
+
+    def copy(self):
+        """
+        Create a deep copy of the state.
+
+        Returns:
+            WorldState: A new state with copies of all arrays.
+        """
+        return WorldState(
+            grid_size=self.grid_size,
+            cell_type=self.cell_type.copy(),
+            temperature=self.temperature.copy(),
+            water_mass=self.water_mass.copy(),
+            pollution_level=self.pollution_level.copy(),
+            direction=self.direction.copy(),
+        )
+
+    def share(self):
+        """
+        Create a copy-on-write copy of the state.
+
+        The new state references the same arrays, which are made read-only for both states. Whichever state
+        writes to a field first gets its own copy of that field (see `writable`); code that replaces the
+        arrays instead of writing into them (as the daily updates do) never copies anything.
+
+        Returns:
+            WorldState: A new state sharing the arrays of this one.
+        """
+        for field in self.FIELDS:
+            getattr(self, field).setflags(write=False)
+        return WorldState(self.grid_size, *(getattr(self, field) for field in self.FIELDS))
+
+    def writable(self, field):
+        """
+        Get a field array that can be written in place, copying it first if it is shared.
+
+        Args:
+            field (str): One of FIELDS.
+
+        Returns:
+            np.ndarray: The writable array of the field.
+        """
+        array = getattr(self, field)
+        if not array.flags.writeable:
+            array = array.copy()
+            setattr(self, field, array)
+        return array
+
+    @property
+    def nbytes(self):
+        """
+        Total memory used by the state arrays, in bytes.
+        """
+        return sum(getattr(self, field).nbytes for field in self.FIELDS)
+
+    ####################################################################################################################
+    ###################################### PARTICLE VIEWS ##############################################################
+    ####################################################################################################################
+
+    def particle(self, i, j, k, read_only=False):
+        """
+        Materialize the cell at (i, j, k) as a Particle.
+
+        The returned Particle is a detached snapshot; writing to it does not change the state.
+        Use `set_particle` to store it back.
+
+        Args:
+            i (int): The x-coordinate of the cell.
+            j (int): The y-coordinate of the cell.
+            k (int): The z-coordinate of the cell.
+            read_only (bool): Return a ReadOnlyParticle, which raises on writes instead of ignoring them.
+
+        Returns:
+            Particle: The cell as a Particle object.
+        """
+        return (ReadOnlyParticle if read_only else Particle)(
+            cell_type=int(self.cell_type[i, j, k]),
+            temperature=float(self.temperature[i, j, k]),
+            water_mass=float(self.water_mass[i, j, k]),
+            pollution_level=float(self.pollution_level[i, j, k]),
+            direction=(int(self.direction[0, i, j, k]),
+                       int(self.direction[1, i, j, k]),
+                       int(self.direction[2, i, j, k])),
+            position=(i, j, k)
+        )
+
+    def set_particle(self, i, j, k, particle):
+        """
+        Store the attributes of a Particle into the cell at (i, j, k).
+
+        Args:
+            i (int): The x-coordinate of the cell.
+            j (int): The y-coordinate of the cell.
+            k (int): The z-coordinate of the cell.
+            particle (Particle): The particle whose attributes are stored.
+        """
+        self.writable("cell_type")[i, j, k] = particle.cell_type
+        self.writable("temperature")[i, j, k] = particle.temperature
+        self.writable("water_mass")[i, j, k] = particle.water_mass
+        self.writable("pollution_level")[i, j, k] = particle.pollution_level
+        self.writable("direction")[:, i, j, k] = particle.direction
+
+    def to_particles(self, read_only=False):
+        """
+        Materialize the whole state as an object grid of Particles.
+
+        Args:
+            read_only (bool): Materialize ReadOnlyParticles (see `particle`).
+
+        Returns:
+            np.ndarray: Object array of shape grid_size holding one Particle per cell.
+        """
+        grid = np.empty(self.grid_size, dtype=object)
+        x, y, z = self.grid_size
+        for i in range(x):
+            for j in range(y):
+                for k in range(z):
+                    grid[i, j, k] = self.particle(i, j, k, read_only)
+        return grid
@@ -94,9 +94,9 @@ class MatplotlibDisplay:
 
         # Create a Matplotlib figure
         # Adjust figure size
-        fig = plt.Figure(figsize=(18.8, 22), tight_layout=True)
-        # Adjust GridSpec to create 15 plots across 5 rows and 3 columns
-        gs = fig.add_gridspec(5, 3)  # 5 rows and 3 columns
+        fig = plt.Figure(figsize=(18.8, 26.4), tight_layout=True)
+        # Adjust GridSpec to create 15 plots across 5 rows and 3 columns, plus a full-width composition plot
+        gs = fig.add_gridspec(6, 3)  # 6 rows and 3 columns
         fig.subplots_adjust(hspace=0.4)  # Adjust spacing between plots
 
         self.fig = fig
@@ -129,6 +129,9 @@ class MatplotlibDisplay:
             "forests": self.fig.add_subplot(gs[4, 0]),
             "water_mass": self.fig.add_subplot(gs[4, 1]),
             "std_dev_water_mass": self.fig.add_subplot(gs[4, 2]),
+
+            # Row 6: Counts of every cell type
+            "cell_types": self.fig.add_subplot(gs[5, :]),
         }
 
         # Render standardized graphs
@@ -166,6 +169,9 @@ class MatplotlibDisplay:
         self.render_std_dev_water_mass_graph(
             self.axes["std_dev_water_mass"], color="cyan")
 
+        # Render the cell type composition
+        self.render_cell_type_counts_graph(self.axes["cell_types"])
+
         # Add 3D visualization and config table
         self.open_3d_in_new_window(self.main_window)
         self.add_config_table_with_scrollbar(self.main_window)
@@ -390,32 +396,79 @@ class MatplotlibDisplay:
         """
         Precompute 3D visualization data for all days.
         """
-        for state in self.simulation.states:
-            points = []
-            untinted_colors = []
-            tinted_colors = []
-            sizes = []
-
-            for x in range(state.grid.shape[0]):
-                for y in range(state.grid.shape[1]):
-                    for z in range(state.grid.shape[2]):
-                        cell = state.grid[x][y][z]
-                        base_color = cell.get_base_color()
-                        tinted_color = cell.get_color_tinted_by_attributes()
-
-                        if base_color:
-                            points.append((x, y, z))
-                            untinted_colors.append(base_color)
-                            tinted_colors.append(tinted_color)
-                            sizes.append(200.0)  # Adjust size as needed
+        for world in self.simulation.states:
+            state = world.state
+            untinted_colors, tinted_colors = self.cell_colors(state, world.parameters)
+            points = np.indices(state.grid_size).reshape(3, -1).T  # (x, y, z) of every cell, in C order
 
             self.precomputed_data.append({
                 "points": points,
                 "untinted_colors": untinted_colors,
                 "tinted_colors": tinted_colors,
-                "sizes": sizes
+                "sizes": np.full(len(points), 200.0)  # Adjust size as needed
             })
 
+    @staticmethod
+    def cell_colors(state, parameters):
+        """
+        Compute the base and the tinted RGBA color of every cell straight from the state arrays, as
+        `Particle.get_base_color` and `Particle.get_color_tinted_by_attributes` do for a single cell.
+
+        Args:
+            state (WorldState): The cells to color.
+            parameters (Parameters): The compiled parameters, with the color and baseline tables.
+
+        Returns:
+            tuple: (base, tinted) arrays of shape (cells, 4), in C order of the cells.
+        """
+        cell_type = state.cell_type.reshape(-1)
+        pollution_level = state.pollution_level.reshape(-1)
+        temperature = state.temperature.reshape(-1)
+
+        # Cell types without a color are transparent white
+        base = parameters.base_colors[cell_type]
+        base[base[:, 3] == 0.0] = (1.0, 1.0, 1.0, 0.0)
+
+        # Pollution and temperature intensities relative to the baselines of each cell type
+        baseline_pollution = parameters.baseline_pollution_level[cell_type]
+        baseline_temperature = parameters.baseline_temperature[cell_type]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pollution_intensity = np.where(
+                baseline_pollution > 0, np.minimum(pollution_level / baseline_pollution, 1.0), 0.0)
+            temperature_intensity = np.where(
+                baseline_temperature != 0,
+                np.minimum(np.abs(temperature - baseline_temperature) / np.abs(baseline_temperature), 0.3), 0.0)
+        red, green, blue, alpha = base.T
+        pollution_intensity, temperature_intensity = pollution_intensity[:, None], temperature_intensity[:, None]
+
+        # General case: black tint for pollution and red tint for temperature, blended
+        black_tinted = base[:, :3] * (1.0 - pollution_intensity * 0.3)
+        red_tinted = np.column_stack((
+            np.minimum(1.0, red + temperature_intensity[:, 0] * 0.2),
+            green * (1.0 - temperature_intensity[:, 0] * 0.2),
+            blue * (1.0 - temperature_intensity[:, 0] * 0.2),
+        ))
+        tinted = np.empty_like(base)
+        tinted[:, :3] = (black_tinted + red_tinted) / 2.0
+        tinted[:, 3] = np.clip(alpha, 0.0, 1.0)
+
+        # Air (6): gray tint for pollution, red/blue tint for temperature, and more transparent when polluted
+        air = cell_type == 6
+        gray_tinted = base[air, :3] * (1.0 - pollution_intensity[air] * 0.5)
+        air_temperature = temperature_intensity[air, 0]
+        temperature_tinted = np.column_stack((
+            np.minimum(1.0, red[air] + air_temperature * 0.3),
+            green[air],
+            np.maximum(0.0, blue[air] - air_temperature * 0.3),
+        ))
+        tinted[air, :3] = (gray_tinted + temperature_tinted) / 2.0
+        tinted[air, 3] = np.maximum(0.2, np.minimum(1.0, alpha[air] * (1.0 - pollution_intensity[air, 0] * 0.5)))
+
+        # Vacuum (8) is never tinted
+        vacuum = cell_type == 8
+        tinted[vacuum] = base[vacuum]
+        return base, tinted
+
     def render_day(self, day):
         """
         Render the cached 3D visualization for a specific day with or without tinting.
@@ -441,7 +494,7 @@ class MatplotlibDisplay:
         colors = data["tinted_colors" if self.tint else "untinted_colors"]
         sizes = data["sizes"]
 
-        xs, ys, zs = zip(*points) if points else ([], [], [])
+        xs, ys, zs = points.T
         self.ax_3d.scatter(xs, ys, zs, c=colors, s=sizes)
 
         # Restore the saved viewing angles
@@ -486,6 +539,22 @@ class MatplotlibDisplay:
         else:
             logging.info(f"Data length mismatch in graph: {title}")
 
+    def render_cell_type_counts_graph(self, ax):
+        """Render the number of cells of every type over time."""
+        ax.cla()
+        ax.set_title("Cell Type Counts Over Time")
+        ax.set_xlabel("Day")
+        ax.set_ylabel("Number of Cells")
+
+        counts = self.simulation.cell_type_counts_over_time[:self.simulation.aggregated_days]
+        if len(counts) != len(self.days):
+            logging.info("Data length mismatch in graph: Cell Type Counts Over Time")
+            return
+
+        for cell_type, name in PARTICLE_MAPPING.items():
+            ax.plot(self.days, counts[:, cell_type], label=f"{cell_type}: {name}")
+        ax.legend(loc="upper left", bbox_to_anchor=(1.0, 1.0))
+
     def render_forests_graph(self, ax, color):
         """Render the forest count graph over time."""
         self.render_generic_graph(
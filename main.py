@@ -1,9 +1,11 @@
+import argparse
 import logging
 from sys import exit
 from config.Config import config_instance
 from config.presets import PRESET_CONFIGS, DEFAULT_PRESET, PARTICLE_MAPPING, KEY_LABELS
 from display.MatplotlibDisplay import MatplotlibDisplay
 from core.Simulation import Simulation
+from core.Engine import ENGINES
 
 # Configure logging
 logger = logging.getLogger()
@@ -126,11 +128,26 @@ def parse_input_value(input_value, default_value):
             return int(input_value)  # Convert to integer
         if isinstance(default_value, float):
             return float(input_value)  # Convert to float
+        if isinstance(default_value, str):
+            return input_value
     except ValueError:
         logging.info(f"Could not parse input value '{input_value}' for type {type(default_value).__name__}. Using default: {default_value}")
 
     return default_value
 
+def parse_arguments():
+    """
+    Parse the command line options.
+    """
+    parser = argparse.ArgumentParser(description="Cellular automaton climate simulation.")
+    parser.add_argument("--engine", choices=["auto", *ENGINES],
+                        help="Engine computing the daily updates (overrides the configuration).")
+    parser.add_argument("--threads", type=int,
+                        help="Threads of the 'threads' engine, 0 for one per CPU (overrides the configuration).")
+    parser.add_argument("--processes", type=int,
+                        help="Worker processes of the 'processes' engine, 0 for one per CPU (overrides the configuration).")
+    return parser.parse_args()
+
 def choose_preset():
     """
     Allow the user to choose a configuration preset from a list.
@@ -152,10 +169,17 @@ def choose_preset():
 
 if __name__ == "__main__":
     try:
+        arguments = parse_arguments()
         logging.info("\nCellular Automaton is Running\n")
 
         # Collect user inputs and update configuration
         config = collect_user_input()
+        if arguments.engine:
+            config_instance.update(custom_config={"engine": arguments.engine})
+        if arguments.threads is not None:
+            config_instance.update(custom_config={"threads": arguments.threads})
+        if arguments.processes is not None:
+            config_instance.update(custom_config={"processes": arguments.processes})
         config_instance.finalize()  # Finalize configuration to make it immutable
         config_instance.log_full_configuration()
 
@@ -171,7 +195,8 @@ if __name__ == "__main__":
         # Initialize and run simulation
         simulation = Simulation(grid_size=grid_size, initial_ratios=initial_ratios, days=days)
         logging.info("Starting simulation...")
-        simulation.precompute()
+        with simulation.engine:  # Stops the threads or processes of the engine before the display opens
+            simulation.precompute()
         logging.info("Simulation complete. Displaying results.")
 
         display = MatplotlibDisplay(simulation)
@@ -0,0 +1,25 @@
+import pytest
+from config.Config import config_instance
+from config.Parameters import Parameters
+from config.presets import PRESET_CONFIGS
+from core.DomainDecomposition import DomainDecomposition
+from core.Engine import DistributedEngine
+from core.GoldenTrace import run_harness
+
+GRID_SIZE = (5, 4, 3)
+PRESETS = [list(PRESET_CONFIGS)[0], list(PRESET_CONFIGS)[-1]]
+
+
+@pytest.mark.parametrize("processes", [2, 3, GRID_SIZE[0]])
+def test_split_covers_every_plane_once(processes):
+    with DomainDecomposition(GRID_SIZE, Parameters(config_instance.get()), processes) as domains:
+        assert len(domains) == processes
+        assert domains.domains[0][0] == 0 and domains.domains[-1][1] == GRID_SIZE[0]
+        assert all(stop == start for (_, stop), (start, _) in zip(domains.domains, domains.domains[1:]))
+
+
+@pytest.mark.parametrize("processes", [2, 3, GRID_SIZE[0]])
+def test_result_does_not_depend_on_process_count(processes):
+    results = run_harness([DistributedEngine(processes=processes)], presets=PRESETS, grid_size=GRID_SIZE, days=5)
+    for (_, preset), divergence in results.items():
+        assert divergence is None, f"{preset}: {divergence}"
@@ -0,0 +1,27 @@
+import numpy as np
+from core.Ensemble import run_ensemble
+from config.Config import config_instance
+
+
+def test_results_do_not_depend_on_workers_or_batch_size():
+    ratios = config_instance.get()["initial_ratios"]
+    results = {
+        (workers, batch_size): run_ensemble((5, 4, 3), ratios, 3, 5, seed=7, engine="numpy", workers=workers,
+                                            batch_size=batch_size, final_states=True)
+        for workers, batch_size in ((1, 1), (2, 1), (1, 2), (2, 3))
+    }
+    expected = results[(1, 1)]
+    assert len(expected) == 5
+    for result in results.values():
+        for name, values in expected.members.items():
+            np.testing.assert_array_equal(result.members[name], values)
+        for field, values in expected.final_states.items():
+            np.testing.assert_array_equal(result.final_states[field], values)
+
+
+def test_cell_type_counts_are_exact():
+    result = run_ensemble((5, 4, 3), config_instance.get()["initial_ratios"], 2, 3, seed=1, engine="numpy",
+                          workers=1)
+    counts = result.members["cell_type_counts_over_time"]
+    assert counts.dtype == np.int64
+    np.testing.assert_array_equal(counts.sum(axis=2), 5 * 4 * 3)
@@ -0,0 +1,31 @@
+import pytest
+from config.Config import config_instance
+from config.presets import PRESET_CONFIGS
+from core.Engine import ENGINES, Engine
+from core.GoldenTrace import run_harness
+
+
+class _FailingEngine(Engine):
+    """
+    An engine whose update always fails (not registered).
+    """
+
+    name = "failing"
+
+    def update(self, world):
+        raise RuntimeError("Update failed.")
+
+
+@pytest.mark.parametrize("engine", [name for name, cls in ENGINES.items() if cls.available()])
+def test_engine_follows_reference_traces(engine):
+    results = run_harness([engine], grid_size=(4, 4, 3), days=3, seed=0)
+    assert results
+    for (_, preset), divergence in results.items():
+        assert divergence is None, f"{preset}: {divergence}"
+
+
+def test_configuration_restored_after_failure():
+    original_config = dict(config_instance.get())
+    with pytest.raises(RuntimeError):
+        run_harness([_FailingEngine()], presets=list(PRESET_CONFIGS)[-1:], grid_size=(4, 4, 3), days=1)
+    assert dict(config_instance.get()) == original_config
@@ -0,0 +1,16 @@
+import numpy as np
+import pytest
+from config.Config import config_instance
+from core.Simulation import Simulation
+
+pytest.importorskip("tkinter")
+MatplotlibDisplay = pytest.importorskip("display.MatplotlibDisplay").MatplotlibDisplay
+
+
+def test_cell_colors_match_particles():
+    simulation = Simulation((6, 5, 4), config_instance.get()["initial_ratios"], 4, engine="numpy", seed=2)
+    for world in simulation.run(retain="none"):
+        base, tinted = MatplotlibDisplay.cell_colors(world.state, world.parameters)
+        cells = [world.state.particle(*position) for position in np.ndindex(*world.grid_size)]
+        np.testing.assert_array_equal(base, [cell.get_base_color() for cell in cells])
+        np.testing.assert_array_equal(tinted, [cell.get_color_tinted_by_attributes() for cell in cells])
@@ -0,0 +1,21 @@
+import numpy as np
+from core.NeighborTable import NeighborTable
+from core.Stencil import Stencil
+
+
+def test_index_matches_offsets():
+    table = NeighborTable((4, 3, 2))
+    assert table.index.shape == (4, 3, 2, 6) and table.index.dtype == np.int32
+    for cell in np.ndindex(*table.grid_size):
+        for n, offset in enumerate(Stencil.OFFSETS):
+            neighbor = tuple(c + o for c, o in zip(cell, offset))
+            inside = all(0 <= c < size for c, size in zip(neighbor, table.grid_size))
+            expected = np.ravel_multi_index(neighbor, table.grid_size) if inside else NeighborTable.SENTINEL
+            assert table.index[cell + (n,)] == expected
+
+
+def test_tables_shared_per_grid_size():
+    table = NeighborTable.get((5, 4, 3))
+    assert NeighborTable.get((5, 4, 3)) is table
+    assert NeighborTable.get((5, 4, 4)) is not table
+    assert not table.index.flags.writeable
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+from core.Particle import Particle
+from core.World import World
+
+
+def test_vacuum_is_one_immutable_instance():
+    vacuum = Particle.vacuum()
+    assert Particle.vacuum() is vacuum
+    assert (vacuum.cell_type, vacuum.temperature, vacuum.water_mass, vacuum.pollution_level) == (8, 0.0, 0.0, 0.0)
+    with pytest.raises(AttributeError):
+        vacuum.water_mass = 1.0
+
+    copy = vacuum.clone()
+    assert copy is not vacuum
+    copy.water_mass = 1.0
+    assert vacuum.water_mass == 0.0
+
+
+def test_empty_cells_share_the_vacuum():
+    grid = World(grid_size=(3, 2, 2))._populate_grid({})
+    assert all(cell is Particle.vacuum() for cell in grid.reshape(-1))
+
+
+def test_particles_have_no_instance_dict():
+    particle = Particle(4, 20.0, 0.5, 0.1, (1, 0, 0), (0, 0, 0))
+    assert not hasattr(particle, "__dict__")
+    with pytest.raises(AttributeError):
+        particle.extra = 1
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+from core.RandomStreams import RandomStreams
+from core.World import World
+from core.WorldState import WorldState
+from config.Config import config_instance
+
+
+@pytest.mark.parametrize("workers", [2, 4])
+def test_initial_grid_does_not_depend_on_workers(workers):
+    ratios = config_instance.get()["initial_ratios"]
+    serial = World(grid_size=(9, 6, 5), initial_ratios=ratios)
+    serial.initialize_grid(seed=5, workers=1)
+    parallel = World(grid_size=(9, 6, 5), initial_ratios=ratios)
+    parallel.initialize_grid(seed=5, workers=workers)
+    for field in WorldState.FIELDS:
+        np.testing.assert_array_equal(getattr(parallel.state, field), getattr(serial.state, field))
+
+
+def test_keyed_streams():
+    streams = RandomStreams(11)
+    first = streams.stream(RandomStreams.INITIALIZATION, 3).random(8)
+    np.testing.assert_array_equal(RandomStreams(streams.entropy).stream(RandomStreams.INITIALIZATION, 3).random(8),
+                                  first)
+    assert not np.array_equal(streams.stream(RandomStreams.INITIALIZATION, 4).random(8), first)
+    assert not np.array_equal(streams.child(RandomStreams.MEMBER, 3).stream(RandomStreams.INITIALIZATION, 3)
+                              .random(8), first)
+
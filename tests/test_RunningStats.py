@@ -0,0 +1,28 @@
+import numpy as np
+from core.RunningStats import RunningStats
+
+
+def test_scalar_series_matches_numpy():
+    values = np.random.default_rng(1).normal(1000.0, 25.0, size=200)
+    stats = RunningStats()
+    for count, value in enumerate(values, start=1):
+        stats.push(value)
+        assert stats.count == count
+        assert np.isclose(stats.mean, np.mean(values[:count]))
+        assert np.isclose(stats.std, np.std(values[:count]))
+
+
+def test_array_series_matches_numpy():
+    values = np.random.default_rng(2).integers(0, 500, size=(50, 9)).astype(np.float64)
+    stats = RunningStats()
+    for value in values:
+        stats.push(value)
+    np.testing.assert_allclose(stats.mean, values.mean(axis=0))
+    np.testing.assert_allclose(stats.std, values.std(axis=0))
+
+
+def test_fewer_than_two_values():
+    stats = RunningStats()
+    assert stats.std == 0
+    stats.push(np.array([3.0, 4.0]))
+    np.testing.assert_array_equal(stats.std, [0.0, 0.0])
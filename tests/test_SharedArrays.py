@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from core.RunResults import run_tasks
+from core.SharedArrays import SharedArrays
+
+SPECS = {"values": ((3, 4), np.float64), "counts": ((3,), np.int64)}
+
+
+def _write_row(descriptor, row):
+    with SharedArrays.attach(descriptor) as shared:
+        shared["values"][row] = row + 0.5
+        shared["counts"][row] = row
+
+
+def test_attached_arrays_share_memory():
+    with SharedArrays.create(SPECS) as owner:
+        assert not owner["values"].any() and owner["counts"].dtype == np.int64
+        owner["values"][0, 1] = 2.0
+        with SharedArrays.attach(owner.descriptor) as shared:
+            assert shared["values"][0, 1] == 2.0
+            shared["counts"][2] = 7
+        assert owner["counts"][2] == 7
+
+
+def test_workers_write_into_the_owner_arrays():
+    with SharedArrays.create(SPECS) as owner:
+        run_tasks(_write_row, [(owner.descriptor, row) for row in range(3)], workers=2)
+        values, counts = owner["values"], owner["counts"]
+    # Still mapped after the blocks are closed
+    assert values.tolist() == [[row + 0.5] * 4 for row in range(3)]
+    assert counts.tolist() == [0, 1, 2]
+
+
+def test_blocks_are_unlinked_by_the_owner():
+    owner = SharedArrays.create(SPECS)
+    descriptor = owner.descriptor
+    SharedArrays.attach(descriptor).close()  # Closing an attached copy keeps the blocks
+    SharedArrays.attach(descriptor).close()
+    owner.close()
+    with pytest.raises(FileNotFoundError):
+        SharedArrays.attach(descriptor)
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from config.Config import config_instance
+from core.Engine import ThreadedEngine
+from core.Simulation import Simulation
+from core.WorldState import WorldState
+
+GRID_SIZE, DAYS = (5, 4, 4), 7
+
+
+def _simulation(engine="numpy"):
+    return Simulation(GRID_SIZE, config_instance.get()["initial_ratios"], DAYS, engine=engine, seed=9)
+
+
+def _assert_same_state(actual, expected):
+    for field in WorldState.FIELDS:
+        np.testing.assert_array_equal(getattr(actual.state, field), getattr(expected.state, field))
+
+
+@pytest.mark.parametrize("retain, days", [
+    ("all", list(range(DAYS + 1))), ("none", []), (3, [0, 3, 6]), (1, list(range(DAYS + 1))),
+])
+def test_retention_policies(retain, days):
+    simulation = _simulation()
+    worlds = list(simulation.run(retain=retain))
+    assert [world.day_number for world in worlds] == list(range(DAYS + 1))
+    assert simulation.states_days == days
+    assert len(simulation.states) == len(days)
+    for entry, day in enumerate(simulation.states_days):
+        _assert_same_state(simulation.states[entry], worlds[day])
+    assert len(simulation.pollution_over_time) == DAYS + 1  # The aggregates cover every day whatever is kept
+
+
+@pytest.mark.parametrize("retain", ["some", 0, -2, 1.5, True])
+def test_invalid_retention_policy(retain):
+    with pytest.raises(ValueError):
+        next(_simulation().run(retain=retain))
+
+
+def test_run_again_starts_over_from_day_0():
+    simulation = _simulation()
+    simulation.precompute()
+    first = (list(simulation.states), list(simulation.pollution_over_time), simulation.cell_type_counts_over_time.copy())
+    list(simulation.run(retain="all"))
+    assert len(simulation.states) == DAYS + 1
+    assert simulation.pollution_over_time == first[1]
+    np.testing.assert_array_equal(simulation.cell_type_counts_over_time, first[2])
+    for world, expected in zip(simulation.states, first[0]):
+        _assert_same_state(world, expected)
+
+
+def test_only_engines_created_from_a_name_are_closed():
+    named = _simulation("threads")
+    list(named.run(retain="none"))
+    assert named.engine.slabs is None
+
+    with ThreadedEngine(threads=2) as engine:
+        passed = _simulation(engine)
+        list(passed.run(retain="none"))
+        assert engine.slabs is not None  # Still the caller's to close
+    assert engine.slabs is None
+
+
+def test_cell_type_counts_add_up_to_the_grid():
+    simulation = _simulation()
+    worlds = list(simulation.run(retain="none"))
+    counts = simulation.cell_type_counts_over_time
+    assert counts.shape == (DAYS + 1, 9) and counts.dtype == np.int64
+    np.testing.assert_array_equal(counts.sum(axis=1), np.prod(GRID_SIZE))
+    for day, world in enumerate(worlds):
+        np.testing.assert_array_equal(counts[day], np.bincount(world.state.cell_type.reshape(-1), minlength=9))
+    np.testing.assert_array_equal(simulation.forest_count_over_time, counts[:, 4])
+    np.testing.assert_array_equal(simulation.city_population_over_time, counts[:, 5])
+    np.testing.assert_allclose(simulation.cell_type_std_dev_over_time[-1], counts.std(axis=0), atol=1e-9)
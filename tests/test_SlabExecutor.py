@@ -0,0 +1,29 @@
+import pytest
+from config.presets import PRESET_CONFIGS
+from core.Engine import ThreadedEngine
+from core.GoldenTrace import run_harness
+from core.SlabExecutor import SlabExecutor
+
+GRID_SIZE = (5, 4, 3)
+PRESETS = [list(PRESET_CONFIGS)[0], list(PRESET_CONFIGS)[-1]]
+
+
+@pytest.mark.parametrize("threads", [2, 3, GRID_SIZE[0]])
+def test_split_covers_every_plane_once(threads):
+    slabs = SlabExecutor(GRID_SIZE, threads)
+    try:
+        assert len(slabs) == threads
+        assert slabs.slabs[0][0] == 0 and slabs.slabs[-1][1] == GRID_SIZE[0]
+        assert all(stop == start for (_, stop), (start, _) in zip(slabs.slabs, slabs.slabs[1:]))
+        for x in range(GRID_SIZE[0]):
+            start, stop = slabs.slabs[slabs.slab_of_x[x]]
+            assert start <= x < stop
+    finally:
+        slabs.shutdown()
+
+
+@pytest.mark.parametrize("threads", [2, 3, GRID_SIZE[0]])
+def test_result_does_not_depend_on_thread_count(threads):
+    results = run_harness([ThreadedEngine(threads=threads)], presets=PRESETS, grid_size=GRID_SIZE, days=5)
+    for (_, preset), divergence in results.items():
+        assert divergence is None, f"{preset}: {divergence}"
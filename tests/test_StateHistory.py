@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from core.Simulation import Simulation
+from core.StateHistory import StateHistory
+from core.WorldState import WorldState
+from config.Config import config_instance
+
+
+@pytest.fixture(scope="module")
+def worlds():
+    simulation = Simulation((6, 5, 4), config_instance.get()["initial_ratios"], 12, engine="numpy", seed=3)
+    return [world for world in simulation.run(retain="none")]
+
+
+@pytest.mark.parametrize("keyframe_interval", [1, 3, 5])
+def test_random_access_matches_full_states(worlds, keyframe_interval):
+    history = StateHistory(keyframe_interval)
+    for world in worlds:
+        history.append(world)
+    assert len(history) == len(worlds)
+
+    order = np.random.default_rng(0).permutation(len(worlds))
+    for day in [*order, *range(len(worlds)), *reversed(range(len(worlds)))]:
+        stored = history[day]
+        assert stored.day_number == worlds[day].day_number
+        for field in WorldState.FIELDS:
+            np.testing.assert_array_equal(getattr(stored.state, field), getattr(worlds[day].state, field))
+
+    assert history[-1].day_number == worlds[-1].day_number
+    assert [world.day_number for world in history[2:9:3]] == [2, 5, 8]
+    with pytest.raises(IndexError):
+        history[len(worlds)]
+
+
+def test_invalid_keyframe_interval():
+    with pytest.raises(ValueError):
+        StateHistory(0)
@@ -0,0 +1,15 @@
+from core.Sweep import run_sweep
+
+PARAMETER_GRID = {
+    "preset": ["Generic", "Low Air Pollution (Stable)"],
+    "city_pollution_generation_rate": [0.1, 0.3],
+    "grid_size": [(5, 4, 3), (4, 4, 3)],
+}
+
+
+def test_rows_do_not_depend_on_batch_size():
+    single = run_sweep(PARAMETER_GRID, days=3, workers=2, batch_size=1)
+    batched = run_sweep(PARAMETER_GRID, days=3, workers=2, batch_size=4)
+    assert single.columns == batched.columns
+    assert len(single) == 8 * 4
+    assert single.rows == batched.rows
@@ -0,0 +1,31 @@
+import numpy as np
+from config.Config import config_instance
+from core.World import World
+
+
+def test_moments_match_numpy():
+    rng = np.random.default_rng(4)
+    fields = [rng.normal(1e6, 3.0, (6, 5, 4)), rng.exponential(0.2, (6, 5, 4)), np.zeros((6, 5, 4))]
+    means, stds = World._moments(fields)
+    np.testing.assert_allclose(means, [field.mean() for field in fields], rtol=1e-12)
+    np.testing.assert_allclose(stds, [field.std() for field in fields], rtol=1e-9, atol=1e-12)
+
+
+def test_moments_of_constant_fields_are_exact():
+    means, stds = World._moments([np.full((4, 4, 3), 1e6 / 3), np.full((4, 4, 3), 0.1)])
+    np.testing.assert_array_equal(means, [1e6 / 3, 0.1])
+    np.testing.assert_array_equal(stds, [0.0, 0.0])
+
+
+def test_global_attributes_match_numpy():
+    world = World(grid_size=(7, 6, 5), initial_ratios=config_instance.get()["initial_ratios"])
+    world.initialize_grid(seed=8)
+    world.update_cells_on_grid_vectorized()
+    state = world.state
+    for name, field in (("temperature", state.temperature), ("pollution", state.pollution_level),
+                        ("water_mass", state.water_mass)):
+        assert np.isclose(getattr(world, f"avg_{name}"), field.mean(), rtol=1e-12)
+        assert np.isclose(getattr(world, f"std_dev_{name}"), field.std(), rtol=1e-9)
+    np.testing.assert_array_equal(world.cell_type_counts, np.bincount(state.cell_type.reshape(-1), minlength=9))
+    assert world.total_cities == np.count_nonzero(state.cell_type == 5)
+    assert world.total_forests == np.count_nonzero(state.cell_type == 4)
@@ -0,0 +1,31 @@
+import numpy as np
+from config.Parameters import Parameters
+from config.presets import PRESET_CONFIGS
+from core.World import World
+from core.WorldBatch import WorldBatch
+from core.WorldState import WorldState
+
+GRID_SIZE, DAYS = (6, 5, 4), 4
+
+
+def test_members_with_different_parameters_match_single_worlds():
+    configs = [dict(PRESET_CONFIGS[preset]) for preset in list(PRESET_CONFIGS)[:3]]
+    configs[0] = {**configs[0], "city_pollution_generation_rate": 0.9}
+    worlds = []
+    for seed, config in enumerate(configs):
+        world = World(grid_size=GRID_SIZE, initial_ratios=config["initial_ratios"])
+        world.parameters = Parameters(config)
+        world.initialize_grid(seed=seed)
+        worlds.append(world)
+    batch = WorldBatch(GRID_SIZE, [world.state for world in worlds], [world.parameters for world in worlds])
+
+    for _ in range(DAYS):
+        batch.step()
+        for world in worlds:
+            world.update_cells_on_grid_vectorized()
+        for member, world in enumerate(worlds):
+            for field in WorldState.FIELDS:
+                np.testing.assert_array_equal(batch.fields[field][member], getattr(world.state, field))
+            for aggregate in WorldBatch.OVER_TIME.values():
+                np.testing.assert_array_equal(batch.aggregates[aggregate][member], getattr(world, aggregate))
+    assert batch.day_number == DAYS
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from config.Config import config_instance
+from core.Particle import Particle
+from core.World import World
+from core.WorldState import WorldState
+
+
+@pytest.fixture
+def world():
+    world = World(grid_size=(4, 3, 3), initial_ratios=config_instance.get()["initial_ratios"])
+    world.initialize_grid(seed=1)
+    return world
+
+
+def test_share_copies_on_first_write(world):
+    original = world.state
+    expected = original.copy()
+    shared = original.share()
+    for field in WorldState.FIELDS:
+        assert getattr(shared, field) is getattr(original, field)
+        assert not getattr(original, field).flags.writeable
+
+    shared.writable("temperature")[...] += 1.0
+    shared.set_particle(0, 0, 0, Particle(5, 40.0, 0.2, 0.9, (1, 0, 0), (0, 0, 0)))
+    assert shared.temperature is not original.temperature
+    assert shared.cell_type[0, 0, 0] == 5
+    for field in WorldState.FIELDS:
+        np.testing.assert_array_equal(getattr(original, field), getattr(expected, field))
+    assert shared.pollution_level is not original.pollution_level
+    assert shared.direction is not original.direction
+
+
+def test_clone_is_isolated(world):
+    expected = world.state.copy()
+    clone = world.clone()
+    assert clone.state.water_mass is world.state.water_mass  # Nothing copied until a write
+
+    clone.state.writable("water_mass")[...] = 0.5
+    world.state.writable("cell_type")[...] = 6
+    np.testing.assert_array_equal(world.state.water_mass, expected.water_mass)
+    np.testing.assert_array_equal(clone.state.cell_type, expected.cell_type)
+    assert (clone.state.water_mass == 0.5).all()